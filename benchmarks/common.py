@@ -0,0 +1,45 @@
+"""Benchmarklar uchun umumiy o'lchash va hisobot yordamchilari."""
+import asyncio
+import statistics
+import time
+from typing import Awaitable, Callable, List, Sequence, Tuple
+
+
+def percentile(timings: Sequence[float], q: float) -> float:
+    """Tartiblangan ro'yxatdan q-persentil (0..1)"""
+    return timings[min(len(timings) - 1, int(len(timings) * q))]
+
+
+def report(name: str, timings: list, elapsed: float = None):
+    """p50/p99/o'rtacha kechikish; `elapsed` berilsa - o'tkazuvchanlik (so'rov/s)"""
+    if not timings:
+        print(f"{name:<28} o'lchov yo'q")
+        return
+
+    timings = sorted(timings)
+    line = (f"{name:<28} p50={percentile(timings, 0.5) * 1000:8.2f} ms  "
+            f"p99={percentile(timings, 0.99) * 1000:8.2f} ms  "
+            f"mean={statistics.mean(timings) * 1000:8.2f} ms")
+    if elapsed:
+        line += f"  {len(timings) / elapsed:9.1f} so'rov/s"
+    print(line)
+
+
+async def measure(calls: Sequence[Callable[[], Awaitable]],
+                  concurrency: int = 1) -> Tuple[List[float], float]:
+    """Chaqiruvlarni `concurrency` ta parallel oqimda bajarish.
+
+    Har bir chaqiruv kechikishi va umumiy vaqt (o'tkazuvchanlik uchun) qaytadi.
+    """
+    pending = iter(calls)
+    timings: List[float] = []
+
+    async def run():
+        for call in pending:
+            started = time.perf_counter()
+            await call()
+            timings.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(run() for _ in range(max(1, concurrency))))
+    return timings, time.perf_counter() - started
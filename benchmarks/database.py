@@ -0,0 +1,185 @@
+"""Database metodlari va handler yo'llari benchmarki sintetik ma'lumotlarda.
+
+    python -m benchmarks.database [--sizes 10000,100000,1000000] [--queries 200]
+
+Har bir hajm uchun baza tozalanib qayta to'ldiriladi (benchmarks.dataset),
+so'ng har bir holat ketma-ket (kechikish) va --concurrency parallel oqimda
+(o'tkazuvchanlik) o'lchanadi. Geo dvigatel GEO_ENGINE orqali tanlanadi.
+
+Diqqat: DATABASE_URL alohida benchmark bazasiga qarashi kerak.
+"""
+import argparse
+import asyncio
+import random
+from typing import Awaitable, Callable, List
+
+from src.config import DATABASE_URL, GEO_ENGINE, SEARCH_COUNT_CAP, VACANCIES_PER_PAGE
+from src.db import Database
+from src.handlers import format_notification_text
+from src.keyboard import vacancies_list_keyboard
+
+from .common import measure, report
+from .dataset import TITLES, prepare, random_point
+
+SEARCH_RADIUS_KM = 50
+SEARCH_SALARY = (2_000_000, 6_000_000)
+
+Case = Callable[[int], Awaitable]
+
+
+async def run_case(name: str, case: Case, queries: int, concurrency: int,
+                   offset: int = 0):
+    """Holatni ketma-ket, so'ng parallel bajarib natijani chiqarish.
+
+    `case(i)` - i-chi chaqiruv; parallel o'tish boshqa i'lar bilan ishlaydi.
+    """
+    timings, elapsed = await measure(
+        [lambda i=i: case(i) for i in range(offset, offset + queries)]
+    )
+    report(name, timings, elapsed)
+
+    if concurrency > 1:
+        start = offset + queries
+        timings, elapsed = await measure(
+            [lambda i=i: case(i) for i in range(start, start + queries)], concurrency
+        )
+        report(f"{name} x{concurrency}", timings, elapsed)
+
+
+async def bench_size(rows: int, queries: int, concurrency: int,
+                     subscription_ratio: float):
+    counts = await prepare(rows, subscription_ratio, reset_tables=True)
+    print(f"\n=== {rows} vakansiya, {counts['subscriptions']} obuna "
+          f"(GEO_ENGINE={GEO_ENGINE}) ===")
+
+    db = Database()
+    await db.create_pool()
+    try:
+        rng = random.Random(rows)
+        points = [random_point(rng)[1:] for _ in range(queries * 2)]
+        keywords = [rng.choice(TITLES).lower() for _ in range(queries * 2)]
+
+        async with db.pool.acquire() as conn:
+            active_ids = [row['id'] for row in await conn.fetch(
+                """SELECT id FROM vacancies WHERE is_active = TRUE AND is_approved = TRUE
+                   ORDER BY random() LIMIT $1""", queries * 2
+            )]
+            pending_ids = [row['id'] for row in await conn.fetch(
+                "SELECT id FROM vacancies WHERE is_approved = FALSE ORDER BY id LIMIT $1",
+                queries * 2
+            )]
+
+        def point(i):
+            return points[i % len(points)]
+
+        # DATABASE METODLARI
+
+        async def nearby(i):
+            await db.get_nearby_vacancies(*point(i), SEARCH_RADIUS_KM,
+                                          limit=VACANCIES_PER_PAGE)
+
+        async def nearby_filtered(i):
+            await db.get_nearby_vacancies(*point(i), SEARCH_RADIUS_KM, SEARCH_SALARY[0],
+                                          limit=VACANCIES_PER_PAGE,
+                                          keyword=keywords[i % len(keywords)],
+                                          salary_to=SEARCH_SALARY[1])
+
+        async def count(i):
+            await db.count_nearby_vacancies(*point(i), SEARCH_RADIUS_KM,
+                                            cap=SEARCH_COUNT_CAP)
+
+        first_pages = {}
+
+        async def first_page(i):
+            vacancies, _, _ = await db.get_nearby_page(i, *point(i), SEARCH_RADIUS_KM,
+                                                       limit=VACANCIES_PER_PAGE)
+            first_pages[i] = vacancies
+
+        async def next_page(i):
+            vacancies = first_pages.get(i)
+            if not vacancies:
+                return
+            last = vacancies[-1]
+            await db.get_nearby_page(
+                i, *point(i), SEARCH_RADIUS_KM,
+                after=(last['is_promoted'], float(last['distance']), last['id']),
+                limit=VACANCIES_PER_PAGE
+            )
+
+        async def get_vacancy(i):
+            await db.get_vacancy(active_ids[i % len(active_ids)])
+
+        async def subscribers(i):
+            await db.get_subscribers_for_vacancy(active_ids[i % len(active_ids)])
+
+        await run_case('get_nearby_vacancies', nearby, queries, concurrency)
+        await run_case('  + kalit so\'z va maosh', nearby_filtered, queries, concurrency)
+        await run_case('count_nearby_vacancies', count, queries, concurrency)
+        await run_case('get_nearby_page (1-sahifa)', first_page, queries, concurrency)
+        await run_case('get_nearby_page (keyingi)', next_page, queries, concurrency)
+        if active_ids:
+            await run_case('get_vacancy', get_vacancy, queries, concurrency)
+            await run_case('get_subscribers_for_vacancy', subscribers, queries,
+                           concurrency)
+
+        # HANDLER YO'LLARI
+
+        async def search_handler(i):
+            # show_nearby_vacancies: sahifa + (kerak bo'lsa) son + klaviatura
+            user_id = rows + i
+            vacancies, has_next, total = await db.get_nearby_page(
+                user_id, *point(i), SEARCH_RADIUS_KM, limit=VACANCIES_PER_PAGE
+            )
+            if total is None:
+                total = await db.count_nearby_vacancies(*point(i), SEARCH_RADIUS_KM,
+                                                        cap=SEARCH_COUNT_CAP)
+            total_pages = max(1, (total + VACANCIES_PER_PAGE - 1) // VACANCIES_PER_PAGE)
+            vacancies_list_keyboard(vacancies, 0, total_pages, total, has_next)
+
+        async def approve_handler(i):
+            # admin_approve_vacancy: tasdiqlash + obunachilar + outboxga tarqatish
+            vacancy_id = pending_ids[i]
+            await db.approve_vacancy(vacancy_id)
+            subscribers = await db.get_subscribers_for_vacancy(vacancy_id)
+            vacancy = await db.get_vacancy(vacancy_id)
+            if vacancy and subscribers:
+                await db.enqueue_broadcast(
+                    vacancy_id, format_notification_text(vacancy),
+                    [subscriber['telegram_id'] for subscriber in subscribers]
+                )
+
+        await run_case('handler: qidiruv', search_handler, queries, concurrency)
+        # Har bir tasdiqlash yangi vakansiya bilan - kutayotganlar ikkiga bo'linadi
+        approvals = len(pending_ids) // 2 if concurrency > 1 else len(pending_ids)
+        if approvals:
+            await run_case('handler: tasdiqlash', approve_handler, approvals,
+                           concurrency)
+    finally:
+        await db.close()
+
+
+async def run(sizes: List[int], queries: int, concurrency: int,
+              subscription_ratio: float):
+    for rows in sizes:
+        await bench_size(rows, queries, concurrency, subscription_ratio)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', default='10000,100000,1000000',
+                        help="vakansiyalar soni, vergul bilan")
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--concurrency', type=int, default=8,
+                        help="parallel oqimlar (DB_POOL_MAX_SIZE dan oshmasin)")
+    parser.add_argument('--subscriptions', type=float, default=0.1,
+                        help="obunalar soni / vakansiyalar soni")
+    args = parser.parse_args()
+
+    if not DATABASE_URL:
+        raise SystemExit("❌ DATABASE_URL berilmagan")
+    sizes = [int(size) for size in args.sizes.split(',')]
+    asyncio.run(run(sizes, args.queries, args.concurrency, args.subscriptions))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,229 @@
+"""Sintetik ma'lumotlar to'plami: foydalanuvchilar, shaharlar atrofidagi
+vakansiyalar va turli radiusli obunalar. Bazaga COPY orqali yoziladi.
+
+    python -m benchmarks.dataset --rows 100000 --reset
+
+Diqqat: --reset users, vacancies, subscriptions, payments va outbox
+jadvallarini tozalaydi - faqat alohida benchmark bazasida ishlating.
+"""
+import argparse
+import asyncio
+import random
+import time
+from typing import Dict, Iterator, List, Sequence
+
+from src.config import DATABASE_URL
+
+# cities_keyboard (src/keyboard.py) shaharlari: (nomi, lat, lon, ulushi)
+CITIES = [
+    ('tashkent', 41.2995, 69.2401, 0.45),
+    ('samarkand', 39.6270, 66.9750, 0.15),
+    ('andijan', 40.7821, 72.3442, 0.10),
+    ('namangan', 40.9983, 71.6726, 0.10),
+    ('fergana', 40.3842, 71.7843, 0.10),
+    ('bukhara', 39.7747, 64.4286, 0.10),
+]
+# Shahar markazidan tarqalish (gradus, ~9 km)
+CITY_SIGMA_DEG = 0.08
+
+TITLES = [
+    'Sotuvchi', 'Kassir', 'Haydovchi', 'Oshpaz', 'Ofitsiant', 'Dasturchi',
+    'Buxgalter', 'Menejer', "Qo'riqchi", 'Farrosh', 'Operator', 'Kuryer',
+    'Omborchi', 'Elektrik', 'Santexnik', "O'qituvchi", 'Hamshira', 'Barista',
+]
+DESCRIPTION_WORDS = [
+    'tajriba', 'jamoa', 'smenali', 'tushlik', 'transport', 'rasmiy', 'bonus',
+    'kompyuter', 'rus', 'ingliz', 'mijozlar', 'savdo', 'ombor', 'yetkazish',
+    'python', 'excel', 'haydovchilik', 'guvohnoma', 'oylik', 'premiya',
+]
+SALARIES = [None, 1_500_000, 2_500_000, 3_000_000, 4_000_000, 5_000_000, 8_000_000]
+SCHEDULES = ["To'liq kun", 'Yarim kun', 'Smenali', 'Masofaviy']
+EXPERIENCES = ['Talab etilmaydi', '1-3 yil', '3-6 yil', '6+ yil']
+# Obuna radiuslari (km) va ularning ulushi
+RADII = [(3, 0.25), (5, 0.3), (10, 0.25), (20, 0.12), (50, 0.08)]
+PROMOTIONS = ['top', 'urgent', 'highlight']
+
+# Benchmark foydalanuvchilari shu telegram_id dan boshlanadi
+TELEGRAM_ID_BASE = 9_000_000_000
+EMPLOYER_SHARE = 0.05
+PENDING_SHARE = 0.02
+PROMOTED_SHARE = 0.02
+COPY_BATCH = 50_000
+
+USER_COLUMNS = ['telegram_id', 'username', 'first_name', 'is_employer',
+                'latitude', 'longitude', 'location_name']
+VACANCY_COLUMNS = ['employer_id', 'title', 'description', 'salary_from', 'salary_to',
+                   'salary_type', 'work_schedule', 'experience_required', 'address',
+                   'latitude', 'longitude', 'phone', 'contact_name', 'is_active',
+                   'is_approved', 'is_promoted', 'promotion_type']
+SUBSCRIPTION_COLUMNS = ['user_id', 'latitude', 'longitude', 'radius_km',
+                        'salary_from', 'keywords']
+
+RESET_TABLES = ['notification_outbox', 'broadcasts', 'payments', 'subscriptions',
+                'vacancies', 'users']
+
+
+def random_point(rng: random.Random):
+    """Shaharlardan biri atrofidagi tasodifiy nuqta: (shahar, lat, lon)"""
+    name, latitude, longitude, _ = rng.choices(CITIES, weights=[c[3] for c in CITIES])[0]
+    return (name,
+            round(rng.gauss(latitude, CITY_SIGMA_DEG), 6),
+            round(rng.gauss(longitude, CITY_SIGMA_DEG), 6))
+
+
+def sizes(rows: int, subscription_ratio: float) -> Dict[str, int]:
+    """`rows` vakansiya uchun jadval hajmlari"""
+    users = max(100, rows // 2)
+    return {
+        'users': users,
+        'employers': max(10, int(users * EMPLOYER_SHARE)),
+        'vacancies': rows,
+        'subscriptions': min(users, int(rows * subscription_ratio)),
+    }
+
+
+def _batches(records: Iterator[tuple], size: int = COPY_BATCH) -> Iterator[List[tuple]]:
+    batch = []
+    for record in records:
+        batch.append(record)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def generate_users(count: int, employers: int, rng: random.Random) -> Iterator[tuple]:
+    for index in range(count):
+        city, latitude, longitude = random_point(rng)
+        yield (TELEGRAM_ID_BASE + index, f"bench_{index}", f"User {index}",
+               index < employers, latitude, longitude, city)
+
+
+def generate_vacancies(count: int, employer_ids: Sequence[int],
+                       rng: random.Random) -> Iterator[tuple]:
+    for index in range(count):
+        city, latitude, longitude = random_point(rng)
+        salary_from = rng.choice(SALARIES)
+        salary_to = (salary_from + rng.choice([0, 1_000_000, 2_000_000])
+                     if salary_from and rng.random() < 0.5 else None)
+        promoted = rng.random() < PROMOTED_SHARE
+        yield (
+            rng.choice(employer_ids),
+            f"{rng.choice(TITLES)} #{index}",
+            " ".join(rng.choices(DESCRIPTION_WORDS, k=12)),
+            salary_from, salary_to, 'monthly',
+            rng.choice(SCHEDULES), rng.choice(EXPERIENCES),
+            f"{city.title()}, {rng.randint(1, 200)}-uy",
+            latitude, longitude, '+998901234567', f"Kontakt {index}",
+            True, rng.random() >= PENDING_SHARE,
+            promoted, rng.choice(PROMOTIONS) if promoted else None,
+        )
+
+
+def generate_subscriptions(user_ids: Sequence[int],
+                           rng: random.Random) -> Iterator[tuple]:
+    radii, weights = zip(*RADII)
+    for user_id in user_ids:
+        _, latitude, longitude = random_point(rng)
+        keywords = rng.choice(TITLES).lower() if rng.random() < 0.3 else None
+        salary_from = rng.choice([None, None, 2_000_000, 4_000_000])
+        yield (user_id, latitude, longitude, rng.choices(radii, weights)[0],
+               salary_from, keywords)
+
+
+async def _copy(conn, table: str, columns: List[str], records: Iterator[tuple]) -> int:
+    total = 0
+    for batch in _batches(records):
+        await conn.copy_records_to_table(table, records=batch, columns=columns)
+        total += len(batch)
+    return total
+
+
+async def seed(conn, rows: int, subscription_ratio: float = 0.1,
+               seed_value: int = 42) -> Dict[str, int]:
+    """Bazani sintetik ma'lumotlar bilan to'ldirish (bitta tranzaksiyada).
+
+    Hisoblagich triggerlari so'rov darajasida - har bir COPY partiyasi
+    stat_counters ni bir marta yangilaydi.
+    """
+    rng = random.Random(seed_value)
+    counts = sizes(rows, subscription_ratio)
+
+    async with conn.transaction():
+        await _copy(conn, 'users', USER_COLUMNS,
+                    generate_users(counts['users'], counts['employers'], rng))
+        employer_ids = [
+            row['id'] for row in await conn.fetch(
+                "SELECT id FROM users WHERE telegram_id >= $1 AND is_employer = TRUE",
+                TELEGRAM_ID_BASE
+            )
+        ]
+        await _copy(conn, 'vacancies', VACANCY_COLUMNS,
+                    generate_vacancies(counts['vacancies'], employer_ids, rng))
+
+        seeker_ids = [
+            row['id'] for row in await conn.fetch(
+                """SELECT id FROM users WHERE telegram_id >= $1 AND is_employer = FALSE
+                   ORDER BY id LIMIT $2""",
+                TELEGRAM_ID_BASE, counts['subscriptions']
+            )
+        ]
+        counts['subscriptions'] = await _copy(conn, 'subscriptions', SUBSCRIPTION_COLUMNS,
+                                              generate_subscriptions(seeker_ids, rng))
+
+    # Planner statistikasi yangi hajmga mos bo'lishi uchun
+    await conn.execute("ANALYZE users, vacancies, subscriptions")
+    return counts
+
+
+async def reset(conn):
+    """Benchmark jadvallarini tozalash"""
+    await conn.execute(
+        "TRUNCATE %s RESTART IDENTITY CASCADE" % ", ".join(RESET_TABLES)
+    )
+    await conn.execute("SELECT recount_stat_counters()")
+
+
+async def prepare(rows: int, subscription_ratio: float = 0.1,
+                  reset_tables: bool = False) -> Dict[str, int]:
+    """Migratsiyalar, (ixtiyoriy) tozalash va to'ldirish"""
+    import asyncpg
+
+    from src.db import Database
+
+    # Sxema ilova bilan bir xil yo'l orqali yaratiladi
+    await Database().init_database()
+
+    conn = await asyncpg.connect(DATABASE_URL)
+    try:
+        if reset_tables:
+            await reset(conn)
+        elif await conn.fetchval("SELECT EXISTS (SELECT 1 FROM users)"):
+            raise SystemExit("❌ Baza bo'sh emas - benchmark bazasida --reset bilan ishlating")
+
+        started = time.perf_counter()
+        counts = await seed(conn, rows, subscription_ratio)
+        print(f"🌱 {counts} - {time.perf_counter() - started:.1f} s")
+        return counts
+    finally:
+        await conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=100_000,
+                        help="vakansiyalar soni")
+    parser.add_argument('--subscriptions', type=float, default=0.1,
+                        help="obunalar soni / vakansiyalar soni")
+    parser.add_argument('--reset', action='store_true',
+                        help="avval jadvallarni tozalash")
+    args = parser.parse_args()
+
+    if not DATABASE_URL:
+        raise SystemExit("❌ DATABASE_URL berilmagan")
+    asyncio.run(prepare(args.rows, args.subscriptions, args.reset))
+
+
+if __name__ == "__main__":
+    main()
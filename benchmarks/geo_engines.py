@@ -0,0 +1,117 @@
+"""Geo dvigatellar mikro-benchmarki: grid, numpy va SQL calculate_distance.
+
+    python -m benchmarks.geo_engines [--points 100000] [--queries 200]
+
+SQL yo'li DATABASE_URL berilgan bo'lsa o'lchanadi: nuqtalar massiv sifatida
+yuboriladi va calculate_distance + tartiblash Postgres ichida bajariladi.
+"""
+import argparse
+import asyncio
+import random
+import time
+
+from src.config import DATABASE_URL
+from src.geo_index import VacancyGridIndex
+from src.geo_numpy import NumpyVacancyIndex, np
+
+from .common import report
+
+# Toshkent atrofida
+CENTER = (41.311, 69.279)
+SPREAD_DEG = 0.5
+
+
+def make_points(count: int, seed: int = 42):
+    rng = random.Random(seed)
+    return [
+        {
+            'id': index,
+            'latitude': CENTER[0] + rng.uniform(-SPREAD_DEG, SPREAD_DEG),
+            'longitude': CENTER[1] + rng.uniform(-SPREAD_DEG, SPREAD_DEG),
+            'is_promoted': rng.random() < 0.02,
+            'salary_from': rng.choice([None, 1_000_000, 3_000_000, 5_000_000]),
+            'salary_to': None,
+        }
+        for index in range(1, count + 1)
+    ]
+
+
+def make_queries(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    return [
+        (CENTER[0] + rng.uniform(-0.3, 0.3), CENTER[1] + rng.uniform(-0.3, 0.3),
+         rng.choice([5, 10, 20, 50]))
+        for _ in range(count)
+    ]
+
+
+def bench_index(index, queries) -> list:
+    timings = []
+    for latitude, longitude, radius in queries:
+        started = time.perf_counter()
+        index.nearby(latitude, longitude, radius)
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+async def bench_sql(points, queries) -> list:
+    import asyncpg
+
+    conn = await asyncpg.connect(DATABASE_URL)
+    try:
+        # Jadvalsiz: nuqtalar unnest orqali - faqat calculate_distance va tartib o'lchanadi
+        await conn.execute(
+            """CREATE TEMP TABLE bench_points AS
+               SELECT * FROM unnest($1::int[], $2::numeric[], $3::numeric[], $4::bool[])
+                   AS t(id, latitude, longitude, is_promoted)""",
+            [p['id'] for p in points], [p['latitude'] for p in points],
+            [p['longitude'] for p in points], [p['is_promoted'] for p in points]
+        )
+        stmt = await conn.prepare(
+            """SELECT is_promoted, d.distance, id FROM bench_points
+               CROSS JOIN LATERAL (
+                   SELECT round(calculate_distance(latitude, longitude, $1, $2), 6) AS distance
+               ) d
+               WHERE d.distance <= $3
+               ORDER BY NOT is_promoted, d.distance, id"""
+        )
+
+        timings = []
+        for latitude, longitude, radius in queries:
+            started = time.perf_counter()
+            await stmt.fetch(latitude, longitude, radius)
+            timings.append(time.perf_counter() - started)
+        return timings
+    finally:
+        await conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--points', type=int, default=100_000)
+    parser.add_argument('--queries', type=int, default=200)
+    args = parser.parse_args()
+
+    points = make_points(args.points)
+    queries = make_queries(args.queries)
+    print(f"{args.points} nuqta, {args.queries} so'rov")
+
+    grid = VacancyGridIndex()
+    grid.load(points)
+    report('grid', bench_index(grid, queries))
+
+    if np is not None:
+        vectorized = NumpyVacancyIndex()
+        vectorized.load(points)
+        report('numpy', bench_index(vectorized, queries))
+    else:
+        print("numpy   o'rnatilmagan - o'tkazib yuborildi")
+
+    if DATABASE_URL:
+        report('sql', asyncio.run(bench_sql(points, queries)))
+    else:
+        print("sql     DATABASE_URL yo'q - o'tkazib yuborildi")
+
+
+if __name__ == "__main__":
+    main()
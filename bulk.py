@@ -0,0 +1,76 @@
+"""Vakansiyalarni ommaviy import/eksport qilish (COPY).
+
+    python bulk.py import vacancies.csv --employer 123456789 [--approve]
+    python bulk.py export vacancies.csv [--all]
+"""
+import argparse
+import asyncio
+import logging
+import sys
+
+from src.bulk import FORMATS, detect_format, export_vacancies, import_vacancies
+from src.db import db
+
+logging.basicConfig(
+    level=logging.INFO,
+    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+)
+logger = logging.getLogger(__name__)
+
+
+async def run_import(args) -> int:
+    fmt = args.format or detect_format(args.path)
+    if fmt is None:
+        logger.error("❌ Format aniqlanmadi, --format csv|json ni ko'rsating")
+        return 1
+
+    user = await db.get_or_create_user(args.employer)
+    await db.set_user_as_employer(args.employer)
+
+    with open(args.path, encoding='utf-8-sig', newline='') as stream:
+        result = await import_vacancies(db, user['id'], stream, fmt, approve=args.approve)
+
+    for error in result['errors']:
+        logger.warning("⚠️ %s", error)
+    logger.info("✅ Import qilindi: %d, xato: %d", result['imported'], result['failed'])
+    return 1 if result['aborted'] else 0
+
+
+async def run_export(args) -> int:
+    with open(args.path, 'wb') as output:
+        count = await export_vacancies(db, output, active_only=not args.all)
+    logger.info("✅ Eksport qilindi: %d ta vakansiya -> %s", count, args.path)
+    return 0
+
+
+async def main(args) -> int:
+    await db.create_pool()
+    try:
+        if args.command == 'import':
+            return await run_import(args)
+        return await run_export(args)
+    finally:
+        await db.close()
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Vakansiyalarni ommaviy import/eksport qilish")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    import_parser = commands.add_parser('import', help="CSV/JSON fayldan import")
+    import_parser.add_argument('path')
+    import_parser.add_argument('--employer', type=int, required=True,
+                               help="Ish beruvchining Telegram ID si")
+    import_parser.add_argument('--format', choices=FORMATS)
+    import_parser.add_argument('--approve', action='store_true',
+                               help="Moderatsiyasiz darhol tasdiqlash")
+
+    export_parser = commands.add_parser('export', help="CSV faylga eksport")
+    export_parser.add_argument('path')
+    export_parser.add_argument('--all', action='store_true',
+                               help="Faol bo'lmagan vakansiyalarni ham qo'shish")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(parse_args())))
@@ -1,15 +1,16 @@
 import asyncio
 import logging
-from aiogram import Bot, Dispatcher
-from aiogram.client.default import DefaultBotProperties
-from aiogram.enums import ParseMode
-from aiogram.fsm.storage.memory import MemoryStorage
+from functools import partial
 
-from src.config import BOT_TOKEN
+from src.app import create_bot, create_dispatcher
+from src.broadcaster import broadcaster
+from src.config import RUN_MODE
 from src.db import db
-from src.handlers import router
-from src.subscriptions_handlers import subscription_router
-from src.emplayer_handlers import employer_router
+from src.leader import leader
+from src.metrics import metrics_server
+from src.supervisor import run_supervisor
+from src.sweeper import promotion_sweeper
+from src.webhook import run_webhook
 
 # Logging sozlash
 logging.basicConfig(
@@ -19,42 +20,62 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 
+async def start_background_jobs(bot):
+    """Obunachilarga xabar tarqatish va muddati o'tgan reklamalarni o'chirish"""
+    await broadcaster.start(bot)
+    await promotion_sweeper.start()
+
+
+async def stop_background_jobs():
+    await promotion_sweeper.stop()
+    await broadcaster.stop()
+
+
 async def main():
     """Asosiy funksiya"""
     # Bot va dispatcher yaratish
-    bot = Bot(
-        token=BOT_TOKEN,
-        default=DefaultBotProperties(parse_mode=ParseMode.HTML)
-    )
-
-    dp = Dispatcher(storage=MemoryStorage())
-
-    # Routerlarni ro'yxatdan o'tkazish
-    dp.include_router(router)
-    dp.include_router(subscription_router)
-    dp.include_router(employer_router)
+    bot = create_bot()
+    dp = create_dispatcher()
 
     try:
         # Ma'lumotlar bazasini ishga tushirish
         await db.create_pool()
         logger.info("✅ Ma'lumotlar bazasi ulanishi o'rnatildi")
+        # Prometheus metrikalari
+        await metrics_server.start()
+
+        # Tarqatish navbati va reklama muddati nazorati - bir nechta instansiya
+        # ishlaganda ham faqat bittasida (Telegram limiti butun bot uchun)
+        await leader.start(partial(start_background_jobs, bot), stop_background_jobs)
 
         # Botni ishga tushirish
-        logger.info("🚀 Bot ishga tushmoqda...")
-        await dp.start_polling(bot)
+        logger.info("🚀 Bot ishga tushmoqda (%s)...", RUN_MODE)
+        if RUN_MODE == 'webhook':
+            await run_webhook(bot, dp)
+        else:
+            # Avval webhook rejimida ishlagan bo'lsa, getUpdates ishlashi uchun
+            await bot.delete_webhook()
+            await dp.start_polling(bot)
 
     except Exception as e:
         logger.error(f"❌ Xatolik yuz berdi: {e}")
 
     finally:
         # Resurslarni tozalash
+        await leader.stop()
+        await metrics_server.stop()
+        await dp.storage.close()
         await db.close()
         await bot.session.close()
         logger.info("🛑 Bot to'xtatildi")
 
 
 if __name__ == "__main__":
-    try:
-        asyncio.run(main())
-    except KeyboardInterrupt:
-        logger.info("⏹️ Bot qo'lda to'xtatildi")
\ No newline at end of file
+    if RUN_MODE == 'sharded':
+        # Bir nechta ishchi jarayon, updatelar foydalanuvchi id bo'yicha taqsimlanadi
+        run_supervisor()
+    else:
+        try:
+            asyncio.run(main())
+        except KeyboardInterrupt:
+            logger.info("⏹️ Bot qo'lda to'xtatildi")
@@ -0,0 +1,36 @@
+from aiogram import Bot, Dispatcher
+from aiogram.client.default import DefaultBotProperties
+from aiogram.enums import ParseMode
+from aiogram.fsm.storage.memory import MemoryStorage
+
+from .config import BOT_TOKEN, MAX_CONCURRENT_UPDATES, FSM_STORAGE
+from .db import db
+from .emplayer_handlers import employer_router
+from .handlers import router
+from .middlewares import ConcurrencyLimitMiddleware, HandlerMetricsMiddleware
+from .storage import PostgresStorage
+from .subscriptions_handlers import subscription_router
+
+
+def create_bot() -> Bot:
+    """Bot obyektini yaratish"""
+    return Bot(
+        token=BOT_TOKEN,
+        default=DefaultBotProperties(parse_mode=ParseMode.HTML)
+    )
+
+
+def create_dispatcher() -> Dispatcher:
+    """Dispatcher, FSM ombori, middleware va routerlarni sozlash"""
+    # FSM ombori: postgres - bir nechta jarayon va qayta ishga tushirish uchun
+    storage = PostgresStorage(db) if FSM_STORAGE == 'postgres' else MemoryStorage()
+    dp = Dispatcher(storage=storage)
+    dp.update.outer_middleware(ConcurrencyLimitMiddleware(MAX_CONCURRENT_UPDATES))
+
+    # Routerlarni ro'yxatdan o'tkazish
+    metrics_middleware = HandlerMetricsMiddleware()
+    for handlers_router in (router, subscription_router, employer_router):
+        handlers_router.message.middleware(metrics_middleware)
+        handlers_router.callback_query.middleware(metrics_middleware)
+        dp.include_router(handlers_router)
+    return dp
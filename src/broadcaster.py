@@ -0,0 +1,226 @@
+import asyncio
+import logging
+import time
+from typing import Dict, List, Optional
+
+from aiogram import Bot
+from aiogram.exceptions import (
+    TelegramAPIError, TelegramBadRequest, TelegramForbiddenError,
+    TelegramRetryAfter
+)
+
+from .cache import TTLCache
+from .config import (
+    NOTIFY_WORKERS, NOTIFY_GLOBAL_RATE, NOTIFY_PER_CHAT_INTERVAL,
+    NOTIFY_BATCH_SIZE, NOTIFY_MAX_ATTEMPTS, NOTIFY_LEASE_SECONDS,
+    NOTIFY_POLL_INTERVAL
+)
+from .db import Database, db
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimiter:
+    """Token bucket: sekundiga `rate` ta ruxsat, RetryAfter uchun pauza"""
+
+    def __init__(self, rate: float, burst: int = None):
+        self.rate = rate
+        self.capacity = burst or max(1, int(rate))
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = asyncio.Lock()
+
+    def pause(self, seconds: float):
+        """Barcha yuborishlarni `seconds` soniyaga to'xtatish"""
+        self._paused_until = max(self._paused_until, time.monotonic() + seconds)
+
+    async def acquire(self):
+        """Bitta yuborish uchun ruxsat kutish"""
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    await asyncio.sleep(self._paused_until - now)
+                    continue
+
+                self._tokens = min(self.capacity,
+                                   self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+class Broadcaster:
+    """Outbox jadvalidagi xabarlarni ishchilar puli orqali yuborish.
+
+    Telegram cheklovlari: umumiy tezlik (NOTIFY_GLOBAL_RATE xabar/soniya)
+    va bitta chatga NOTIFY_PER_CHAT_INTERVAL soniyada bittadan ko'p emas.
+    """
+
+    def __init__(self, database: Database, workers: int = NOTIFY_WORKERS,
+                 global_rate: float = NOTIFY_GLOBAL_RATE,
+                 per_chat_interval: float = NOTIFY_PER_CHAT_INTERVAL,
+                 batch_size: int = NOTIFY_BATCH_SIZE,
+                 max_attempts: int = NOTIFY_MAX_ATTEMPTS):
+        self.db = database
+        self.workers = workers
+        self.per_chat_interval = per_chat_interval
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.limiter = RateLimiter(global_rate)
+        self.bot: Optional[Bot] = None
+
+        self._texts = TTLCache(maxsize=256, ttl=3600)
+        self._chat_next_send: Dict[int, float] = {}
+        self._sent: List[int] = []
+        self._queue: Optional[asyncio.Queue] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._tasks: List[asyncio.Task] = []
+
+    async def start(self, bot: Bot):
+        """Navbatni o'qish va ishchilarni ishga tushirish"""
+        self.bot = bot
+        self._queue = asyncio.Queue(maxsize=self.batch_size)
+        self._wakeup = asyncio.Event()
+        self._tasks = [asyncio.create_task(self._feed())]
+        self._tasks += [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+        logger.info("📢 Broadcaster ishga tushdi (%d ishchi)", self.workers)
+
+    async def stop(self):
+        """Ishchilarni to'xtatish va yuborilganlarni saqlash"""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        await self._flush_sent()
+
+    async def enqueue(self, vacancy_id: Optional[int], text: str, chat_ids: List[int],
+                      requested_by: int = None) -> Optional[int]:
+        """Xabarni chatlarga tarqatish uchun navbatga qo'yish"""
+        if not chat_ids:
+            return None
+
+        broadcast_id = await self.db.enqueue_broadcast(vacancy_id, text, chat_ids,
+                                                       requested_by)
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return broadcast_id
+
+    async def _feed(self):
+        """Navbatdan xabarlarni band qilib, ishchilarga uzatish"""
+        while True:
+            try:
+                await self._flush_sent()
+                rows = await self.db.claim_notifications(self.batch_size,
+                                                         NOTIFY_LEASE_SECONDS)
+                for row in rows:
+                    await self._queue.put(row)
+
+                if not rows:
+                    await self._report_finished()
+                    try:
+                        await asyncio.wait_for(self._wakeup.wait(), NOTIFY_POLL_INTERVAL)
+                    except asyncio.TimeoutError:
+                        pass
+                    self._wakeup.clear()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("❌ Outbox navbatini o'qishda xatolik")
+                await asyncio.sleep(NOTIFY_POLL_INTERVAL)
+
+    async def _worker(self):
+        while True:
+            row = await self._queue.get()
+            try:
+                await self._deliver(row)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("❌ Xabarni yuborishda kutilmagan xatolik")
+            finally:
+                self._queue.task_done()
+
+    async def _wait_for_chat(self, chat_id: int):
+        """Bitta chatga yuborishlar orasidagi minimal intervalni kutish"""
+        now = time.monotonic()
+        next_send = self._chat_next_send.get(chat_id, 0.0)
+        self._chat_next_send[chat_id] = max(now, next_send) + self.per_chat_interval
+        if next_send > now:
+            await asyncio.sleep(next_send - now)
+
+        if len(self._chat_next_send) > 10000:
+            self._chat_next_send = {
+                key: value for key, value in self._chat_next_send.items() if value > now
+            }
+
+    async def _get_text(self, broadcast_id: int) -> Optional[str]:
+        text = self._texts.get(broadcast_id)
+        if text is None:
+            text = await self.db.get_broadcast_text(broadcast_id)
+            if text is not None:
+                self._texts.set(broadcast_id, text)
+        return text
+
+    async def _deliver(self, row: Dict):
+        """Bitta xabarni yuborish va natijasini outboxga yozish"""
+        text = await self._get_text(row['broadcast_id'])
+        if text is None:
+            await self.db.fail_notification(row['id'], "broadcast not found")
+            return
+
+        await self._wait_for_chat(row['chat_id'])
+        await self.limiter.acquire()
+
+        try:
+            await self.bot.send_message(row['chat_id'], text, parse_mode="HTML")
+        except TelegramRetryAfter as e:
+            # Telegram so'ragan vaqtgacha hamma ishchilar kutadi
+            self.limiter.pause(e.retry_after)
+            await self.db.retry_notification(row['id'], e.retry_after, str(e))
+        except (TelegramForbiddenError, TelegramBadRequest) as e:
+            # Bot bloklangan yoki chat topilmadi - qayta urinish foydasiz
+            await self.db.fail_notification(row['id'], str(e))
+        except TelegramAPIError as e:
+            if row['attempts'] >= self.max_attempts:
+                await self.db.fail_notification(row['id'], str(e))
+            else:
+                await self.db.retry_notification(row['id'],
+                                                 min(300, 2 ** row['attempts']), str(e))
+        else:
+            self._sent.append(row['id'])
+
+    async def _flush_sent(self):
+        if not self._sent:
+            return
+
+        sent, self._sent = self._sent, []
+        await self.db.mark_notifications_sent(sent)
+
+    async def _report_finished(self):
+        """Yakunlangan tarqatishlar natijasini adminga yuborish"""
+        for broadcast in await self.db.finish_broadcasts():
+            logger.info(
+                "📢 Tarqatish #%d yakunlandi: %d/%d yuborildi, %d xato",
+                broadcast['id'], broadcast['sent'], broadcast['total'], broadcast['failed']
+            )
+            if not broadcast['requested_by']:
+                continue
+
+            try:
+                await self.bot.send_message(
+                    broadcast['requested_by'],
+                    f"📢 <b>Tarqatish yakunlandi</b> (vakansiya #{broadcast['vacancy_id']})\n\n"
+                    f"✅ Yuborildi: {broadcast['sent']}\n"
+                    f"❌ Yuborilmadi: {broadcast['failed']}"
+                )
+            except TelegramAPIError as e:
+                logger.warning("Tarqatish natijasini yuborib bo'lmadi: %s", e)
+
+
+# Global broadcaster instance
+broadcaster = Broadcaster(db)
@@ -0,0 +1,209 @@
+import csv
+import json
+import logging
+from decimal import Decimal, InvalidOperation
+from typing import BinaryIO, Dict, Iterator, List, Optional, TextIO, Tuple
+
+from .config import BULK_IMPORT_BATCH_SIZE, BULK_IMPORT_MAX_ERRORS
+from .db import Database
+
+logger = logging.getLogger(__name__)
+
+# Import/eksport fayllaridagi ustunlar (vacancies jadvali nomlari bilan)
+VACANCY_COLUMNS = (
+    'title', 'description', 'salary_from', 'salary_to', 'salary_type',
+    'work_schedule', 'experience_required', 'address', 'latitude', 'longitude',
+    'phone', 'contact_name'
+)
+
+_REQUIRED = ('title', 'description', 'address', 'latitude', 'longitude', 'phone')
+# VARCHAR ustunlar uzunligi (001_initial.sql)
+_MAX_LENGTH = {
+    'title': 255, 'salary_type': 50, 'work_schedule': 100,
+    'experience_required': 100, 'phone': 20, 'contact_name': 255
+}
+_SALARY_TYPES = ('hourly', 'daily', 'monthly')
+# INTEGER ustunlar chegarasi - kattaroq qiymatda COPY butunlay bekor bo'ladi
+_MAX_INT = 2_147_483_647
+
+FORMATS = ('csv', 'json')
+
+
+class _ImportAborted(Exception):
+    """Fayl tuzilishi buzilgan - tranzaksiya bekor qilinadi"""
+
+
+def detect_format(file_name: Optional[str]) -> Optional[str]:
+    """Fayl nomidan formatni aniqlash (.csv, .json, .jsonl)"""
+    name = (file_name or '').lower()
+    if name.endswith('.csv'):
+        return 'csv'
+    if name.endswith(('.json', '.jsonl')):
+        return 'json'
+    return None
+
+
+def read_rows(stream: TextIO, fmt: str) -> Iterator[Tuple[int, Dict]]:
+    """Fayldan (qator raqami, yozuv) juftliklarini o'qish.
+
+    CSV - birinchi qator sarlavha. JSON - JSON Lines (har qatorda bitta
+    obyekt) yoki bitta massiv.
+    """
+    if fmt == 'csv':
+        reader = csv.DictReader(stream)
+        for row in reader:
+            yield reader.line_num, row
+        return
+
+    first = stream.read(1)
+    while first and first.isspace():
+        first = stream.read(1)
+
+    if first == '[':
+        for index, row in enumerate(json.loads(first + stream.read()), 1):
+            yield index, row
+        return
+
+    for line_num, line in enumerate(stream, 1):
+        if line_num == 1:
+            line = first + line
+        if line.strip():
+            yield line_num, json.loads(line)
+
+
+def _clean_text(row: Dict, column: str) -> Optional[str]:
+    value = row.get(column)
+    if value is None:
+        return None
+
+    value = str(value).strip()
+    if not value:
+        return None
+    if len(value) > _MAX_LENGTH.get(column, len(value)):
+        raise ValueError(f"{column}: {_MAX_LENGTH[column]} belgidan uzun")
+    return value
+
+
+def _clean_int(row: Dict, column: str) -> Optional[int]:
+    value = row.get(column)
+    if value is None or str(value).strip() == '':
+        return None
+
+    try:
+        value = int(str(value).replace(' ', ''))
+    except ValueError:
+        raise ValueError(f"{column}: butun son emas ({value!r})")
+    if value < 0:
+        raise ValueError(f"{column}: manfiy bo'lishi mumkin emas")
+    if value > _MAX_INT:
+        raise ValueError(f"{column}: {_MAX_INT} dan katta bo'lishi mumkin emas")
+    return value
+
+
+def _clean_coordinate(row: Dict, column: str, limit: int) -> Decimal:
+    try:
+        value = Decimal(str(row.get(column)).strip())
+    except InvalidOperation:
+        raise ValueError(f"{column}: son emas ({row.get(column)!r})")
+    if not value.is_finite() or abs(value) > limit:
+        raise ValueError(f"{column}: -{limit}..{limit} oralig'ida bo'lishi kerak")
+    return value
+
+
+def validate_vacancy(row: Dict) -> tuple:
+    """Yozuvni tekshirib, VACANCY_COLUMNS tartibidagi qiymatlarga aylantirish"""
+    if not isinstance(row, dict):
+        raise ValueError("yozuv obyekt emas")
+
+    for column in _REQUIRED:
+        if row.get(column) is None or str(row[column]).strip() == '':
+            raise ValueError(f"{column}: majburiy maydon")
+
+    salary_from = _clean_int(row, 'salary_from')
+    salary_to = _clean_int(row, 'salary_to')
+    if salary_from is not None and salary_to is not None and salary_from > salary_to:
+        raise ValueError("salary_from salary_to dan katta")
+
+    salary_type = _clean_text(row, 'salary_type') or 'monthly'
+    if salary_type not in _SALARY_TYPES:
+        raise ValueError(f"salary_type: {', '.join(_SALARY_TYPES)} dan biri bo'lishi kerak")
+
+    return (
+        _clean_text(row, 'title'),
+        _clean_text(row, 'description'),
+        salary_from,
+        salary_to,
+        salary_type,
+        _clean_text(row, 'work_schedule'),
+        _clean_text(row, 'experience_required'),
+        _clean_text(row, 'address'),
+        _clean_coordinate(row, 'latitude', 90),
+        _clean_coordinate(row, 'longitude', 180),
+        _clean_text(row, 'phone'),
+        _clean_text(row, 'contact_name'),
+    )
+
+
+def _valid_batches(rows: Iterator[Tuple[int, Dict]], result: Dict,
+                   batch_size: int) -> Iterator[List[tuple]]:
+    """Yaroqli yozuvlarni partiyalarga yig'ish, xatolarni `result` ga yozish"""
+    batch = []
+    try:
+        for line_num, row in rows:
+            try:
+                batch.append(validate_vacancy(row))
+            except ValueError as e:
+                result['failed'] += 1
+                if len(result['errors']) < BULK_IMPORT_MAX_ERRORS:
+                    result['errors'].append(f"{line_num}-qator: {e}")
+                continue
+
+            if len(batch) >= batch_size:
+                yield batch
+                batch = []
+    except (csv.Error, ValueError) as e:
+        # Fayl tuzilishi buzilgan (JSON/CSV sintaksisi) - qolgan qismi o'qilmaydi
+        result['errors'].append(f"Faylni o'qib bo'lmadi: {e}")
+        result['aborted'] = True
+        return
+
+    if batch:
+        yield batch
+
+
+async def import_vacancies(database: Database, employer_id: int, stream: TextIO,
+                           fmt: str = 'csv', approve: bool = False,
+                           batch_size: int = BULK_IMPORT_BATCH_SIZE) -> Dict:
+    """Vakansiyalarni CSV/JSON oqimidan COPY orqali import qilish.
+
+    Noto'g'ri yozuvlar o'tkazib yuboriladi va `errors` ga yoziladi;
+    fayl tuzilishi buzilgan bo'lsa hech narsa saqlanmaydi.
+    """
+    result = {'imported': 0, 'failed': 0, 'errors': [], 'aborted': False}
+    batches = _valid_batches(read_rows(stream, fmt), result, batch_size)
+
+    # Tranzaksiya ichida o'qiladi: buzilgan fayl - to'liq bekor qilish
+    def checked_batches():
+        yield from batches
+        if result['aborted']:
+            raise _ImportAborted()
+
+    try:
+        result['imported'] = await database.copy_vacancies(
+            employer_id, VACANCY_COLUMNS, checked_batches(), approved=approve
+        )
+    except _ImportAborted:
+        result['imported'] = 0
+
+    logger.info("📥 Import: %d ta vakansiya, %d ta xato (ish beruvchi #%d)",
+                result['imported'], result['failed'], employer_id)
+    return result
+
+
+async def export_vacancies(database: Database, output: BinaryIO,
+                           active_only: bool = True) -> int:
+    """Vakansiyalarni CSV ko'rinishida oqim bilan eksport qilish (COPY TO)"""
+    return await database.copy_vacancies_to(
+        output, ('id',) + VACANCY_COLUMNS + ('is_active', 'is_approved', 'created_at'),
+        active_only=active_only
+    )
@@ -0,0 +1,69 @@
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional
+
+
+class TTLCache:
+    """Hajmi cheklangan, TTL bo'yicha eskiradigan LRU kesh.
+
+    `on_evict(key, value)` yozuv keshdan chiqarilganda (eskirish, sig'im
+    to'lishi, pop yoki almashtirish) chaqiriladi.
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 60.0,
+                 on_evict: Optional[Callable[[Hashable, Any], None]] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.on_evict = on_evict
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _MISSING) is not _MISSING
+
+    def _evict(self, key: Hashable):
+        _, value = self._data.pop(key)
+        if self.on_evict is not None:
+            self.on_evict(key, value)
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Qiymatni olish (eskirgan bo'lsa - default)"""
+        item = self._data.get(key)
+        if item is None:
+            return default
+
+        expires_at, value = item
+        if expires_at < time.monotonic():
+            self._evict(key)
+            return default
+
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: float = None):
+        """Qiymatni saqlash"""
+        if key in self._data:
+            self._evict(key)
+
+        self._data[key] = (time.monotonic() + (self.ttl if ttl is None else ttl), value)
+        while len(self._data) > self.maxsize:
+            self._evict(next(iter(self._data)))
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        """Qiymatni keshdan olib tashlash"""
+        if key not in self._data:
+            return default
+
+        value = self._data[key][1]
+        self._evict(key)
+        return value
+
+    def clear(self):
+        """Keshni tozalash"""
+        for key in list(self._data):
+            self._evict(key)
+
+
+_MISSING = object()
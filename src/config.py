@@ -7,13 +7,55 @@ load_dotenv()
 BOT_TOKEN = os.getenv('BOT_TOKEN')
 ADMIN_IDS = list(map(int, os.getenv('ADMIN_IDS', '').split(',')))
 
+# Ishga tushirish rejimi: 'polling', 'webhook' yoki 'sharded' (bir nechta jarayon)
+RUN_MODE = os.getenv('RUN_MODE', 'polling')
+
+# Webhook sozlamalari
+WEBHOOK_BASE_URL = os.getenv('WEBHOOK_BASE_URL')  # https://bot.example.com
+WEBHOOK_PATH = os.getenv('WEBHOOK_PATH', '/webhook')
+WEBHOOK_SECRET = os.getenv('WEBHOOK_SECRET')
+WEBAPP_HOST = os.getenv('WEBAPP_HOST', '0.0.0.0')
+WEBAPP_PORT = int(os.getenv('WEBAPP_PORT', '8080'))
+
+# 'sharded' rejimida ishchi jarayonlar soni
+WORKER_PROCESSES = int(os.getenv('WORKER_PROCESSES', str(os.cpu_count() or 2)))
+WORKER_MAX_RESTARTS = 5  # To'xtab qolgan ishchini qayta ishga tushirishlar soni
+
+# Bir vaqtda qayta ishlanadigan updatelar soni
+MAX_CONCURRENT_UPDATES = int(os.getenv('MAX_CONCURRENT_UPDATES', '100'))
+
+# Prometheus metrikalari (GET /metrics), 0 - o'chirilgan.
+# 'sharded' rejimida ishchi #i METRICS_PORT + i portida
+METRICS_HOST = os.getenv('METRICS_HOST', '127.0.0.1')
+METRICS_PORT = int(os.getenv('METRICS_PORT', '9100'))
+
+# FSM holatlari ombori: 'memory' yoki 'postgres'.
+# 'postgres' buferi jarayon ichida: webhook instansiyalari bir-birining
+# holatini FSM_FLUSH_INTERVAL gacha kechikib ko'radi (foydalanuvchini bitta
+# instansiyaga yo'naltiring yoki 'sharded' rejimini ishlating)
+FSM_STORAGE = os.getenv('FSM_STORAGE', 'memory')
+FSM_FLUSH_INTERVAL = float(os.getenv('FSM_FLUSH_INTERVAL', '0.5'))  # Yozuvlarni birlashtirish oynasi (soniya)
+
 # Ma'lumotlar bazasi sozlamalari
 DATABASE_URL = os.getenv('DATABASE_URL')
+DB_POOL_MIN_SIZE = int(os.getenv('DB_POOL_MIN_SIZE', '2'))
+DB_POOL_MAX_SIZE = int(os.getenv('DB_POOL_MAX_SIZE', '10'))
+DB_MAX_QUERIES = int(os.getenv('DB_MAX_QUERIES', '50000'))  # Shundan keyin ulanish yangilanadi
+DB_MAX_INACTIVE_CONNECTION_LIFETIME = float(os.getenv('DB_MAX_INACTIVE_CONNECTION_LIFETIME', '300'))
+DB_STATEMENT_CACHE_SIZE = int(os.getenv('DB_STATEMENT_CACHE_SIZE', '200'))
+DB_SLOW_QUERY_MS = float(os.getenv('DB_SLOW_QUERY_MS', '200'))  # Sekin so'rov logi chegarasi (ms)
+CHANGE_LISTENER_MAX_BACKOFF = 60  # O'zgarishlar kanaliga qayta ulanishda eng uzoq kutish (soniya)
 
 # Geolokatsiya sozlamalari
 MAX_DISTANCE_KM = 50  # Maksimal masofani km da
 DEFAULT_CITY = "Toshkent"
 
+# Yaqin vakansiyalarni qidirish usuli:
+# 'sql' - Postgres calculate_distance, 'grid' - xotiradagi grid indeks,
+# 'numpy' - xotiradagi vektorlashtirilgan hisoblash (ixtiyoriy: pip install numpy)
+GEO_ENGINE = os.getenv('GEO_ENGINE', 'sql')
+GEO_GRID_CELL_DEG = float(os.getenv('GEO_GRID_CELL_DEG', '0.1'))
+
 # Pullik xizmatlar narxlari (so'm)
 PROMOTION_PRICES = {
     'top': 10000,  # Yuqoriga chiqarish
@@ -22,4 +64,50 @@ PROMOTION_PRICES = {
 }
 
 # Pagintatsiya
-VACANCIES_PER_PAGE = 5
\ No newline at end of file
+VACANCIES_PER_PAGE = 5
+MY_VACANCIES_PER_PAGE = 10  # "Mening vakansiyalarim" sahifasi
+SEARCH_COUNT_CAP = 1000  # Natijalar sonini hisoblashda yuqori chegara
+
+# Qidiruv natijalari keshi (sahifa almashtirish uchun)
+SEARCH_SNAPSHOT_LIMIT = SEARCH_COUNT_CAP  # Bitta snapshotdagi maksimal id soni
+SEARCH_SNAPSHOT_CACHE_SIZE = 2000  # Keshdagi snapshotlar soni
+SEARCH_SNAPSHOT_TTL = 300  # Soniyalarda
+
+# Vakansiyalar keshi (batafsil ko'rish)
+VACANCY_CACHE_SIZE = 5000
+VACANCY_CACHE_TTL = 600  # Soniyalarda
+
+# Tayyor vakansiya kartochkalari keshi ((id, updated_at) bo'yicha)
+VACANCY_CARD_CACHE_SIZE = 10000
+VACANCY_CARD_CACHE_TTL = 3600  # Soniyalarda
+
+# Parametrli klaviaturalar keshi (vakansiya id bo'yicha, lru_cache)
+KEYBOARD_CACHE_SIZE = 2048
+
+# Foydalanuvchilar keshi (telegram_id bo'yicha)
+USER_CACHE_SIZE = 20000
+USER_CACHE_TTL = 900  # Soniyalarda
+
+# Ish beruvchi statistikasi keshi (users.id bo'yicha)
+EMPLOYER_STATS_CACHE_SIZE = 2000
+EMPLOYER_STATS_CACHE_TTL = 300  # Soniyalarda
+
+# Fon vazifalari (tarqatish, reklama muddati) faqat qulfni olgan instansiyada
+LEADER_RETRY_INTERVAL = 15  # Qulfni olish/tekshirish oralig'i (soniya)
+
+# Muddati o'tgan reklamalarni o'chirish
+PROMOTION_SWEEP_INTERVAL = 60  # Soniyalarda
+PROMOTION_SWEEP_BATCH = 500  # Bir tranzaksiyada o'chiriladigan reklamalar
+
+# Vakansiyalarni ommaviy import qilish (COPY)
+BULK_IMPORT_BATCH_SIZE = 5000  # Bitta COPY chaqiruvidagi qatorlar
+BULK_IMPORT_MAX_ERRORS = 20  # Hisobotda ko'rsatiladigan xatolar soni
+
+# Obunachilarga xabar tarqatish (broadcaster)
+NOTIFY_WORKERS = int(os.getenv('NOTIFY_WORKERS', '8'))
+NOTIFY_GLOBAL_RATE = float(os.getenv('NOTIFY_GLOBAL_RATE', '25'))  # Xabar/soniya (Telegram: ~30)
+NOTIFY_PER_CHAT_INTERVAL = 1.0  # Bitta chatga xabarlar orasidagi minimal soniya
+NOTIFY_BATCH_SIZE = 200  # Navbatdan bir marta olinadigan qatorlar
+NOTIFY_MAX_ATTEMPTS = 5  # Vaqtinchalik xatoliklarda qayta urinishlar
+NOTIFY_LEASE_SECONDS = 300  # Band qilingan qator qayta navbatga qaytguncha
+NOTIFY_POLL_INTERVAL = 2.0  # Bo'sh navbatni tekshirish oralig'i (soniya)
\ No newline at end of file
@@ -1,73 +1,510 @@
 import asyncpg
 import asyncio
+import bisect
+import contextvars
+import logging
+import time
+import uuid
+from contextlib import asynccontextmanager
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Tuple
-from .config import DATABASE_URL
+from decimal import Decimal
+from pathlib import Path
+from typing import (
+    Any, AsyncIterator, Awaitable, BinaryIO, Callable, Dict, Iterable, List, Optional,
+    Sequence, Tuple
+)
+from .cache import TTLCache
+from .config import (
+    DATABASE_URL, DB_POOL_MIN_SIZE, DB_POOL_MAX_SIZE, DB_MAX_QUERIES,
+    DB_MAX_INACTIVE_CONNECTION_LIFETIME, DB_STATEMENT_CACHE_SIZE, DB_SLOW_QUERY_MS,
+    CHANGE_LISTENER_MAX_BACKOFF,
+    GEO_ENGINE, GEO_GRID_CELL_DEG, MAX_DISTANCE_KM,
+    SEARCH_SNAPSHOT_LIMIT, SEARCH_SNAPSHOT_CACHE_SIZE, SEARCH_SNAPSHOT_TTL,
+    VACANCY_CACHE_SIZE, VACANCY_CACHE_TTL, USER_CACHE_SIZE, USER_CACHE_TTL,
+    EMPLOYER_STATS_CACHE_SIZE, EMPLOYER_STATS_CACHE_TTL
+)
+from .geo_index import SubscriptionGridIndex, VacancyGridIndex, bounding_box
+from .geo_numpy import NumpySubscriptionIndex, NumpyVacancyIndex
+from .metrics import (
+    DB_POOL_IN_USE, DB_POOL_WAIT, DB_QUERY_ERRORS, DB_QUERY_LATENCY, DB_QUERY_ROWS
+)
+from .statements import STATEMENTS
+from .text_search import tokenize
+
+# Sxema migratsiyalari: NNN_nom.sql, versiya tartibida bajariladi
+MIGRATIONS_DIR = Path(__file__).resolve().parent / 'migrations'
+MIGRATIONS_LOCK_ID = 7301
+
+# Jarayonlar orasida kesh va indekslarni sinxronlash kanali (LISTEN/NOTIFY)
+CHANGES_CHANNEL = 'nearby_job_changes'
+# Bitta NOTIFY dagi id'lar soni (payload: instance:tur:1,2,3)
+CHANGES_IDS_PER_NOTIFY = 500
+
+logger = logging.getLogger(__name__)
+
+# Qidiruv kursori: (is_promoted, distance, id)
+Cursor = Tuple[bool, float, int]
+
+# stat_counters jadvalidagi hisoblagichlar (005_stat_counters.sql)
+STAT_COUNTERS = ('total_users', 'total_employers', 'total_vacancies',
+                 'active_vacancies', 'pending_vacancies')
+
+
+# Joriy so'rov nomi (metrikalar uchun) - Database.acquire() o'rnatadi.
+# None bo'lsa (asyncpg ichki so'rovlari, pool reset) o'lchanmaydi
+_query_name: contextvars.ContextVar[Optional[str]] = contextvars.ContextVar(
+    'query_name', default=None
+)
+
+
+def _redact(args: Sequence[Any]) -> str:
+    """Sekin so'rov logi uchun parametrlar: qiymatlar o'rniga faqat turlari"""
+    parts = []
+    for arg in args:
+        if arg is None:
+            parts.append('NULL')
+        elif isinstance(arg, (str, bytes, list, tuple)):
+            parts.append(f"{type(arg).__name__}[{len(arg)}]")
+        else:
+            parts.append(type(arg).__name__)
+    return '(' + ', '.join(parts) + ')'
+
+
+def _status_rows(status: Optional[str]) -> int:
+    """Buyruq holatidan qatorlar soni: 'UPDATE 3' -> 3"""
+    count = (status or '').rsplit(' ', 1)[-1]
+    return int(count) if count.isdigit() else 0
+
+
+def _record_rows(record: Any) -> int:
+    return 0 if record is None else 1
+
+
+async def _timed(name: Optional[str], args: Sequence[Any], call: Awaitable,
+                 count_rows: Callable[[Any], int]) -> Any:
+    """So'rovni o'lchash: vaqt, qatorlar soni, xatolik va sekin so'rov logi"""
+    if name is None:
+        return await call
+
+    started = time.perf_counter()
+    try:
+        result = await call
+    except Exception:
+        DB_QUERY_ERRORS.inc(name)
+        raise
+    finally:
+        elapsed = time.perf_counter() - started
+        DB_QUERY_LATENCY.observe(elapsed, name)
+
+    rows = count_rows(result)
+    DB_QUERY_ROWS.inc(name, amount=rows)
+    if elapsed * 1000 >= DB_SLOW_QUERY_MS:
+        logger.warning("🐢 Sekin so'rov %s: %.1f ms, %d qator, parametrlar %s",
+                       name, elapsed * 1000, rows, _redact(args))
+    return result
+
+
+def _cursor_key(item: Cursor) -> Tuple[bool, float, int]:
+    return not item[0], item[1], item[2]
+
+
+def _cursor_slice(entries: List[Cursor], after: Optional[Cursor],
+                  before: Optional[Cursor], limit: int) -> Tuple[int, int]:
+    """Tartiblangan ro'yxatdan kursor bo'yicha sahifa chegaralari [start, end)"""
+    if after:
+        start = bisect.bisect_right(entries, _cursor_key(after), key=_cursor_key)
+        return start, min(len(entries), start + limit)
+    if before:
+        end = bisect.bisect_left(entries, _cursor_key(before), key=_cursor_key)
+        return max(0, end - limit), end
+    return 0, min(len(entries), limit)
+
+
+class PreparedConnection(asyncpg.Connection):
+    """So'rovlari o'lchanadigan ulanish.
+
+    STATEMENTS reyestri so'rovlari nomi bo'yicha bajariladi va o'z nomi bilan
+    o'lchanadi; ular asyncpg'ning ulanishdagi statement keshi orqali bir marta
+    tayyorlanadi (DB_STATEMENT_CACHE_SIZE reyestr hajmidan katta bo'lishi kerak).
+    Qolgan so'rovlar joriy nom (Database.acquire) bilan o'lchanadi.
+    """
+
+    async def fetch_statement(self, name: str, *args) -> List[asyncpg.Record]:
+        """Reyestrdagi so'rov: barcha qatorlar"""
+        return await _timed(name, args,
+                            asyncpg.Connection.fetch(self, STATEMENTS[name], *args), len)
+
+    async def fetchrow_statement(self, name: str, *args) -> Optional[asyncpg.Record]:
+        """Reyestrdagi so'rov: bitta qator"""
+        return await _timed(name, args,
+                            asyncpg.Connection.fetchrow(self, STATEMENTS[name], *args),
+                            _record_rows)
+
+    async def fetchval_statement(self, name: str, *args) -> Any:
+        """Reyestrdagi so'rov: bitta qiymat"""
+        return await _timed(name, args,
+                            asyncpg.Connection.fetchval(self, STATEMENTS[name], *args),
+                            _record_rows)
+
+    async def fetch(self, query: str, *args, **kwargs) -> List[asyncpg.Record]:
+        return await _timed(_query_name.get(), args,
+                            super().fetch(query, *args, **kwargs), len)
+
+    async def fetchrow(self, query: str, *args, **kwargs) -> Optional[asyncpg.Record]:
+        return await _timed(_query_name.get(), args,
+                            super().fetchrow(query, *args, **kwargs), _record_rows)
+
+    async def fetchval(self, query: str, *args, **kwargs) -> Any:
+        return await _timed(_query_name.get(), args,
+                            super().fetchval(query, *args, **kwargs), _record_rows)
+
+    async def execute(self, query: str, *args, **kwargs) -> str:
+        return await _timed(_query_name.get(), args,
+                            super().execute(query, *args, **kwargs), _status_rows)
+
+    async def copy_records_to_table(self, table_name: str, **kwargs) -> str:
+        return await _timed(_query_name.get(), (),
+                            super().copy_records_to_table(table_name, **kwargs),
+                            _status_rows)
+
+    async def copy_from_query(self, query: str, *args, **kwargs) -> str:
+        return await _timed(_query_name.get(), args,
+                            super().copy_from_query(query, *args, **kwargs), _status_rows)
 
 
 class Database:
     def __init__(self):
         self.pool = None
+        self.instance_id = uuid.uuid4().hex[:12]
+        self._listener_conn = None
+        self._reconnect_task: Optional[asyncio.Task] = None
+        self._change_tasks = set()
+        self.vacancy_index = None
+        self.subscription_index = None
+        if GEO_ENGINE == 'grid':
+            self.vacancy_index = VacancyGridIndex(GEO_GRID_CELL_DEG)
+            self.subscription_index = SubscriptionGridIndex(GEO_GRID_CELL_DEG)
+        elif GEO_ENGINE == 'numpy':
+            self.vacancy_index = NumpyVacancyIndex()
+            self.subscription_index = NumpySubscriptionIndex()
+        # Foydalanuvchi qidiruvining tartiblangan natijalari (sahifalash uchun)
+        self.search_snapshots = TTLCache(SEARCH_SNAPSHOT_CACHE_SIZE, SEARCH_SNAPSHOT_TTL,
+                                         on_evict=self._forget_snapshot)
+        self._snapshots_by_vacancy: Dict[int, set] = {}
+        # get_vacancy natijalari (batafsil ko'rish va bog'lanish oynalari uchun)
+        self.vacancy_cache = TTLCache(VACANCY_CACHE_SIZE, VACANCY_CACHE_TTL)
+        # telegram_id -> users qatori
+        self.user_cache = TTLCache(USER_CACHE_SIZE, USER_CACHE_TTL)
+        # users.id -> ish beruvchi statistikasi
+        self.employer_stats_cache = TTLCache(EMPLOYER_STATS_CACHE_SIZE,
+                                             EMPLOYER_STATS_CACHE_TTL)
 
     async def create_pool(self):
         """Ma'lumotlar bazasi ulanish poolini yaratish"""
-        self.pool = await asyncpg.create_pool(DATABASE_URL)
+        # Migratsiyalar pooldan oldin - reyestr so'rovlaridagi jadvallar mavjud bo'lishi kerak
         await self.init_database()
+        self.pool = await asyncpg.create_pool(
+            DATABASE_URL,
+            min_size=DB_POOL_MIN_SIZE,
+            max_size=DB_POOL_MAX_SIZE,
+            max_queries=DB_MAX_QUERIES,
+            max_inactive_connection_lifetime=DB_MAX_INACTIVE_CONNECTION_LIFETIME,
+            statement_cache_size=DB_STATEMENT_CACHE_SIZE,
+            connection_class=PreparedConnection
+        )
+        await self.load_vacancy_index()
+        await self.load_subscription_index()
+        await self.start_change_listener()
 
-    async def init_database(self):
-        """Ma'lumotlar bazasini boshlang'ich holatga keltirish"""
+    @asynccontextmanager
+    async def acquire(self, name: str) -> AsyncIterator[PreparedConnection]:
+        """Pooldan ulanish olish: kutish vaqti va `name` nomli so'rov metrikalari"""
+        started = time.perf_counter()
         async with self.pool.acquire() as conn:
-            # SQL faylni o'qish va bajarish
-            with open('database.sql', 'r', encoding='utf-8') as f:
-                await conn.execute(f.read())
+            DB_POOL_WAIT.observe(time.perf_counter() - started, name)
+            DB_POOL_IN_USE.inc()
+            token = _query_name.set(name)
+            try:
+                yield conn
+            finally:
+                # Pool reset so'rovlari o'lchanmasligi uchun qaytarishdan oldin
+                _query_name.reset(token)
+                DB_POOL_IN_USE.dec()
+
+    async def init_database(self):
+        """Ma'lumotlar bazasini boshlang'ich holatga keltirish (migratsiyalar)"""
+        conn = await asyncpg.connect(DATABASE_URL)
+        try:
+            # Bir nechta jarayon bir vaqtda migratsiya qilmasligi uchun
+            await conn.execute("SELECT pg_advisory_lock($1)", MIGRATIONS_LOCK_ID)
+            try:
+                await conn.execute(
+                    """CREATE TABLE IF NOT EXISTS schema_migrations (
+                           version INTEGER PRIMARY KEY,
+                           name VARCHAR(255) NOT NULL,
+                           applied_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                       )"""
+                )
+                applied = {
+                    row['version']
+                    for row in await conn.fetch("SELECT version FROM schema_migrations")
+                }
+
+                for path in sorted(MIGRATIONS_DIR.glob('*.sql')):
+                    version = int(path.name.split('_', 1)[0])
+                    if version in applied:
+                        continue
+
+                    # SQL faylni o'qish va bajarish
+                    async with conn.transaction():
+                        await conn.execute(path.read_text(encoding='utf-8'))
+                        await conn.execute(
+                            "INSERT INTO schema_migrations (version, name) VALUES ($1, $2)",
+                            version, path.name
+                        )
+            finally:
+                await conn.execute("SELECT pg_advisory_unlock($1)", MIGRATIONS_LOCK_ID)
+        finally:
+            await conn.close()
+
+    async def load_vacancy_index(self):
+        """Faol vakansiyalarni xotiradagi indeksga yuklash"""
+        if self.vacancy_index is None:
+            return
+
+        async with self.acquire('load_vacancy_index') as conn:
+            rows = await conn.fetch(
+                """SELECT id, latitude, longitude, is_promoted, salary_from, salary_to
+                   FROM vacancies
+                   WHERE is_active = TRUE AND is_approved = TRUE"""
+            )
+        self.vacancy_index.load(dict(r) for r in rows)
+
+    async def load_subscription_index(self):
+        """Faol obunalarni xotiradagi indeksga yuklash"""
+        if self.subscription_index is None:
+            return
+
+        async with self.acquire('load_subscription_index') as conn:
+            rows = await conn.fetch(
+                """SELECT s.id, s.user_id, s.latitude, s.longitude, s.radius_km,
+                          s.salary_from, s.keywords, u.telegram_id
+                   FROM subscriptions s
+                   JOIN users u ON s.user_id = u.id
+                   WHERE s.is_active = TRUE"""
+            )
+        self.subscription_index.load(dict(r) for r in rows)
+
+    # JARAYONLAR ORASIDA SINXRONLASH
+
+    async def start_change_listener(self):
+        """Boshqa jarayonlardagi o'zgarishlarni tinglash (NOTIFY)"""
+        conn = await asyncpg.connect(DATABASE_URL)
+        try:
+            await conn.add_listener(CHANGES_CHANNEL, self._on_change)
+        except BaseException:
+            await conn.close()
+            raise
+        conn.add_termination_listener(self._on_listener_terminated)
+        self._listener_conn = conn
+
+    def _on_listener_terminated(self, connection):
+        # close() da _listener_conn avval None qilinadi - qayta ulanish kerak emas
+        if connection is not self._listener_conn:
+            return
+
+        logger.error("❌ O'zgarishlar kanali ulanishi uzildi, qayta ulanilmoqda")
+        self._listener_conn = None
+        self._reconnect_task = asyncio.get_running_loop().create_task(
+            self._reconnect_change_listener()
+        )
+
+    async def _reconnect_change_listener(self):
+        """Kanalga qayta ulanish (kutish oshib boradi) va hammasini qayta yuklash.
+
+        Uzilish paytidagi xabarlar yo'qolgan: TTL siz indekslar va keshlar
+        qayta ulanishdan keyin to'liq yangilanadi (LISTEN dan keyin - yuklash
+        paytidagi o'zgarishlar ham yetib keladi).
+        """
+        delay = 1.0
+        while True:
+            try:
+                if self._listener_conn is None:
+                    await self.start_change_listener()
+                await self.resync()
+                logger.info("✅ O'zgarishlar kanaliga qayta ulanildi")
+                return
+            except Exception:
+                logger.exception("❌ O'zgarishlar kanaliga qayta ulanishda xatolik")
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, CHANGE_LISTENER_MAX_BACKOFF)
+
+    async def resync(self):
+        """Mahalliy keshlarni tozalash va indekslarni bazadan qayta yuklash"""
+        self.search_snapshots.clear()
+        self.vacancy_cache.clear()
+        self.user_cache.clear()
+        self.employer_stats_cache.clear()
+        await self.load_vacancy_index()
+        await self.load_subscription_index()
+
+    async def _publish_change(self, kind: str, object_id: int):
+        """Vakansiya, obuna yoki foydalanuvchi o'zgarganini boshqa jarayonlarga xabar qilish"""
+        await self._publish_changes(kind, [object_id])
+
+    async def _publish_changes(self, kind: str, object_ids: Sequence[int]):
+        """Bir nechta o'zgarishni bitta ulanishda, id'larni birlashtirib xabar qilish"""
+        if not object_ids:
+            return
+
+        async with self.acquire('publish_change') as conn:
+            # NOTIFY matni 8000 baytdan oshmasligi kerak
+            for start in range(0, len(object_ids), CHANGES_IDS_PER_NOTIFY):
+                ids = object_ids[start:start + CHANGES_IDS_PER_NOTIFY]
+                await conn.execute(
+                    "SELECT pg_notify($1, $2)",
+                    CHANGES_CHANNEL,
+                    f"{self.instance_id}:{kind}:{','.join(map(str, ids))}"
+                )
+
+    def _on_change(self, connection, pid, channel, payload):
+        sender, kind, object_ids = payload.split(':')
+        if sender == self.instance_id:
+            return
+
+        task = asyncio.get_running_loop().create_task(
+            self._apply_changes(kind, [int(object_id) for object_id in object_ids.split(',')])
+        )
+        self._change_tasks.add(task)
+        task.add_done_callback(self._change_tasks.discard)
+
+    async def _apply_changes(self, kind: str, object_ids: List[int]):
+        for object_id in object_ids:
+            await self._apply_change(kind, object_id)
+
+    async def _apply_change(self, kind: str, object_id: int):
+        """Boshqa jarayondagi o'zgarishni mahalliy kesh va indekslarga qo'llash"""
+        try:
+            if kind == 'vacancy':
+                self.invalidate_vacancy(object_id)
+                await self._refresh_indexed_vacancy(object_id)
+            elif kind == 'vacancy_index':
+                await self.load_vacancy_index()
+            elif kind == 'user':
+                self.user_cache.pop(object_id)
+            elif kind == 'employer':
+                self.employer_stats_cache.pop(object_id)
+            elif kind == 'subscription_user':
+                await self._refresh_indexed_subscriptions(object_id)
+        except Exception:
+            logger.exception("❌ O'zgarishni qo'llashda xatolik: %s:%s", kind, object_id)
+
+    async def _refresh_indexed_vacancy(self, vacancy_id: int):
+        if self.vacancy_index is None:
+            return
+
+        async with self.acquire('refresh_indexed_vacancy') as conn:
+            vacancy = await conn.fetchrow(
+                """SELECT id, latitude, longitude, is_promoted, salary_from, salary_to
+                   FROM vacancies
+                   WHERE id = $1 AND is_active = TRUE AND is_approved = TRUE""",
+                vacancy_id
+            )
+
+        if vacancy:
+            self.vacancy_index.add(
+                vacancy['id'], vacancy['latitude'], vacancy['longitude'],
+                vacancy['is_promoted'], vacancy['salary_from'], vacancy['salary_to']
+            )
+        else:
+            self.vacancy_index.remove(vacancy_id)
+
+    async def _refresh_indexed_subscriptions(self, user_id: int):
+        if self.subscription_index is None:
+            return
+
+        async with self.acquire('refresh_indexed_subscriptions') as conn:
+            rows = await conn.fetch(
+                """SELECT s.id, s.user_id, s.latitude, s.longitude, s.radius_km,
+                          s.salary_from, s.keywords, u.telegram_id
+                   FROM subscriptions s
+                   JOIN users u ON s.user_id = u.id
+                   WHERE s.user_id = $1 AND s.is_active = TRUE""",
+                user_id
+            )
+
+        self.subscription_index.remove_user(user_id)
+        for row in rows:
+            self.subscription_index.add(dict(row))
 
     # FOYDALANUVCHILAR BILAN ISHLASH
 
     async def get_or_create_user(self, telegram_id: int, username: str = None,
                                  first_name: str = None) -> Dict:
-        """Foydalanuvchini olish yoki yaratish"""
-        async with self.pool.acquire() as conn:
-            user = await conn.fetchrow(
-                "SELECT * FROM users WHERE telegram_id = $1", telegram_id
+        """Foydalanuvchini olish yoki yaratish (keshdan yoki bitta so'rov bilan)"""
+        user = self.user_cache.get(telegram_id)
+        if user is not None:
+            return dict(user)
+
+        async with self.acquire('get_or_create_user') as conn:
+            user = await conn.fetchrow_statement(
+                'upsert_user',
+                telegram_id, username, first_name
             )
 
             if not user:
-                user = await conn.fetchrow(
-                    """INSERT INTO users (telegram_id, username, first_name) 
-                       VALUES ($1, $2, $3) RETURNING *""",
-                    telegram_id, username, first_name
-                )
+                # Parallel tranzaksiya shu paytda qo'shgan bo'lsa
+                user = await conn.fetchrow_statement('get_user', telegram_id)
 
-            return dict(user)
+        return self._cache_user(user)
+
+    def _cache_user(self, user) -> Optional[Dict]:
+        """Foydalanuvchi qatorini keshga yozish"""
+        if not user:
+            return None
+
+        user = dict(user)
+        self.user_cache.set(user['telegram_id'], user)
+        return dict(user)
 
     async def update_user_location(self, telegram_id: int, latitude: float,
                                    longitude: float, location_name: str = None):
         """Foydalanuvchi lokatsiyasini yangilash"""
-        async with self.pool.acquire() as conn:
-            await conn.execute(
+        async with self.acquire('update_user_location') as conn:
+            user = await conn.fetchrow(
                 """UPDATE users SET latitude = $1, longitude = $2, 
                    location_name = $3, updated_at = CURRENT_TIMESTAMP 
-                   WHERE telegram_id = $4""",
+                   WHERE telegram_id = $4 RETURNING *""",
                 latitude, longitude, location_name, telegram_id
             )
+        self._cache_user(user)
+        await self._publish_change('user', telegram_id)
 
     async def update_user_phone(self, telegram_id: int, phone: str):
         """Foydalanuvchi telefon raqamini yangilash"""
-        async with self.pool.acquire() as conn:
-            await conn.execute(
+        async with self.acquire('update_user_phone') as conn:
+            user = await conn.fetchrow(
                 """UPDATE users SET phone = $1, updated_at = CURRENT_TIMESTAMP 
-                   WHERE telegram_id = $2""",
+                   WHERE telegram_id = $2 RETURNING *""",
                 phone, telegram_id
             )
+        self._cache_user(user)
+        await self._publish_change('user', telegram_id)
 
     async def set_user_as_employer(self, telegram_id: int):
         """Foydalanuvchini ish beruvchi qilib belgilash"""
-        async with self.pool.acquire() as conn:
-            await conn.execute(
+        cached = self.user_cache.get(telegram_id)
+        if cached is not None and cached.get('is_employer'):
+            return
+
+        async with self.acquire('set_user_as_employer') as conn:
+            user = await conn.fetchrow(
                 """UPDATE users SET is_employer = TRUE, updated_at = CURRENT_TIMESTAMP 
-                   WHERE telegram_id = $1""",
+                   WHERE telegram_id = $1 RETURNING *""",
                 telegram_id
             )
+        self._cache_user(user)
+        await self._publish_change('user', telegram_id)
 
     # VAKANSIYALAR BILAN ISHLASH
 
@@ -78,7 +515,7 @@ class Database:
                              latitude: float = None, longitude: float = None,
                              phone: str = None, contact_name: str = None) -> int:
         """Vakansiya yaratish"""
-        async with self.pool.acquire() as conn:
+        async with self.acquire('create_vacancy') as conn:
             vacancy_id = await conn.fetchval(
                 """INSERT INTO vacancies 
                    (employer_id, title, description, salary_from, salary_to, 
@@ -90,50 +527,281 @@ class Database:
                 salary_type, work_schedule, experience_required, address,
                 latitude, longitude, phone, contact_name
             )
-            return vacancy_id
+
+        await self._employer_changed(employer_id)
+        return vacancy_id
+
+    async def copy_vacancies(self, employer_id: int, columns: Sequence[str],
+                             batches: Iterable[List[tuple]], approved: bool = False) -> int:
+        """Vakansiyalarni COPY orqali ommaviy qo'shish (bitta tranzaksiyada).
+
+        `batches` - `columns` tartibidagi qiymatlar partiyalari.
+        """
+        total = 0
+        async with self.acquire('copy_vacancies') as conn:
+            async with conn.transaction():
+                for batch in batches:
+                    await conn.copy_records_to_table(
+                        'vacancies',
+                        records=[(employer_id, approved) + record for record in batch],
+                        columns=['employer_id', 'is_approved', *columns]
+                    )
+                    total += len(batch)
+
+        if approved and total:
+            # Yangi id'lar COPY dan qaytmaydi - indeks to'liq qayta quriladi
+            await self.load_vacancy_index()
+            await self._publish_change('vacancy_index', 0)
+        await self._employer_changed(employer_id)
+        return total
+
+    async def copy_vacancies_to(self, output: BinaryIO, columns: Sequence[str],
+                                active_only: bool = True) -> int:
+        """Vakansiyalarni CSV ko'rinishida `output` ga oqim bilan yozish (COPY TO)"""
+        query = "SELECT %s FROM vacancies" % ", ".join(columns)
+        if active_only:
+            query += " WHERE is_active = TRUE AND is_approved = TRUE"
+        query += " ORDER BY id"
+
+        async with self.acquire('copy_vacancies_to') as conn:
+            status = await conn.copy_from_query(query, output=output,
+                                                format='csv', header=True)
+        return int(status.split()[-1])
 
     async def get_vacancy(self, vacancy_id: int) -> Optional[Dict]:
-        """Vakansiyani ID bo'yicha olish"""
-        async with self.pool.acquire() as conn:
-            vacancy = await conn.fetchrow(
-                """SELECT v.*, u.first_name as employer_name, u.username as employer_username
-                   FROM vacancies v 
-                   JOIN users u ON v.employer_id = u.id 
-                   WHERE v.id = $1""",
-                vacancy_id
-            )
-            return dict(vacancy) if vacancy else None
+        """Vakansiyani ID bo'yicha olish (keshdan yoki bazadan)"""
+        vacancy = self.vacancy_cache.get(vacancy_id)
+        if vacancy is not None:
+            return dict(vacancy)
+
+        async with self.acquire('get_vacancy') as conn:
+            vacancy = await conn.fetchrow_statement('get_vacancy', vacancy_id)
+
+        if not vacancy:
+            return None
+
+        vacancy = dict(vacancy)
+        self.vacancy_cache.set(vacancy_id, vacancy)
+        return dict(vacancy)
+
+    def invalidate_vacancy(self, vacancy_id: int):
+        """Vakansiya o'zgarganda keshlardan olib tashlash"""
+        self.vacancy_cache.pop(vacancy_id)
+        self.invalidate_search_snapshots(vacancy_id)
+
+    async def _employer_changed(self, employer_id: Optional[int]):
+        """Ish beruvchi vakansiyalari yoki to'lovlari o'zgarganda statistikasini eskirtirish"""
+        if employer_id is None:
+            return
+
+        self.employer_stats_cache.pop(employer_id)
+        await self._publish_change('employer', employer_id)
+
+    async def get_employer_statistics(self, employer_id: int) -> Dict:
+        """Ish beruvchi statistikasi (bitta so'rov, keshlanadi)"""
+        stats = self.employer_stats_cache.get(employer_id)
+        if stats is None:
+            async with self.acquire('get_employer_statistics') as conn:
+                row = await conn.fetchrow_statement('employer_stats', employer_id)
+            stats = dict(row)
+            self.employer_stats_cache.set(employer_id, stats)
+        return dict(stats)
+
+    @staticmethod
+    def _nearby_params(latitude: float, longitude: float, radius_km: int,
+                       salary_from: Optional[int], keyword: Optional[str],
+                       salary_to: Optional[int]) -> List:
+        """Radius qidiruvi so'rovlarining $1..$10 parametrlari"""
+        min_lat, max_lat, min_lon, max_lon = bounding_box(latitude, longitude, radius_km)
+        return [latitude, longitude, radius_km, min_lat, max_lat, min_lon, max_lon,
+                salary_from or None, keyword or None, salary_to]
+
+    async def _keyword_candidates(self, keyword: Optional[str]) -> Optional[set]:
+        """Grid indeks uchun kalit so'zlarga mos vakansiya id'lari (GIN indeks orqali)"""
+        if not keyword:
+            return None
+
+        async with self.acquire('keyword_candidates') as conn:
+            rows = await conn.fetch_statement('vacancy_ids_matching', keyword)
+        return {row['id'] for row in rows}
 
     async def get_nearby_vacancies(self, latitude: float, longitude: float,
                                    radius_km: int = 50, salary_from: int = None,
-                                   offset: int = 0, limit: int = 5) -> List[Dict]:
-        """Yaqin atrofdagi vakansiyalarni olish"""
-        async with self.pool.acquire() as conn:
-            query = """
-                SELECT v.*, u.first_name as employer_name, u.username as employer_username,
-                       calculate_distance(v.latitude, v.longitude, $1, $2) as distance
-                FROM vacancies v 
-                JOIN users u ON v.employer_id = u.id 
-                WHERE v.is_active = TRUE AND v.is_approved = TRUE
-                AND calculate_distance(v.latitude, v.longitude, $1, $2) <= $3
-            """
-            params = [latitude, longitude, radius_km]
-
-            if salary_from:
-                query += " AND (v.salary_from >= $4 OR v.salary_to >= $4)"
-                params.append(salary_from)
-
-            query += " ORDER BY v.is_promoted DESC, distance ASC OFFSET $%d LIMIT $%d" % (
-                len(params) + 1, len(params) + 2
-            )
-            params.extend([offset, limit])
-
-            vacancies = await conn.fetch(query, *params)
-            return [dict(v) for v in vacancies]
+                                   after: Cursor = None, before: Cursor = None,
+                                   limit: int = 5, keyword: str = None,
+                                   salary_to: int = None) -> List[Dict]:
+        """Yaqin atrofdagi vakansiyalarni olish.
+
+        Tartib: (is_promoted DESC, distance, id). `after` yoki `before`
+        kursori (is_promoted, distance, id) bo'yicha sahifalanadi.
+        `keyword` - sarlavha va tavsif bo'yicha matnli qidiruv,
+        `salary_from`..`salary_to` - maosh oralig'i.
+        """
+        if self.vacancy_index is not None:
+            return await self._get_nearby_vacancies_indexed(
+                latitude, longitude, radius_km, salary_from, after, before, limit,
+                keyword, salary_to
+            )
+
+        params = self._nearby_params(latitude, longitude, radius_km, salary_from,
+                                     keyword, salary_to)
+        cursor = before or after
+        if cursor:
+            params.extend([cursor[0], Decimal(str(cursor[1])), cursor[2]])
+        else:
+            params.extend([None, None, None])
+        params.append(limit)
+
+        async with self.acquire('get_nearby_vacancies') as conn:
+            rows = await conn.fetch_statement(
+                'nearby_before' if before else 'nearby_after', *params
+            )
+            vacancies = [dict(v) for v in rows]
+
+        if before:
+            vacancies.reverse()
+        return vacancies
+
+    async def count_nearby_vacancies(self, latitude: float, longitude: float,
+                                     radius_km: int = 50, salary_from: int = None,
+                                     cap: int = 1000, keyword: str = None,
+                                     salary_to: int = None) -> int:
+        """Yaqin vakansiyalar soni (`cap` bilan cheklangan)"""
+        if self.vacancy_index is not None:
+            return min(cap, len(self.vacancy_index.nearby(
+                latitude, longitude, radius_km, salary_from,
+                only=await self._keyword_candidates(keyword), salary_to=salary_to
+            )))
+
+        params = self._nearby_params(latitude, longitude, radius_km, salary_from,
+                                     keyword, salary_to)
+        async with self.acquire('count_nearby_vacancies') as conn:
+            return await conn.fetchval_statement('nearby_count', *params, cap)
+
+    async def _get_nearby_vacancies_indexed(self, latitude: float, longitude: float,
+                                            radius_km: int, salary_from: Optional[int],
+                                            after: Optional[Cursor], before: Optional[Cursor],
+                                            limit: int, keyword: str = None,
+                                            salary_to: int = None) -> List[Dict]:
+        """Xotiradagi indeks orqali yaqin vakansiyalarni olish"""
+        candidates = self.vacancy_index.nearby(
+            latitude, longitude, radius_km, salary_from,
+            only=await self._keyword_candidates(keyword), salary_to=salary_to
+        )
+        start, end = _cursor_slice(candidates, after, before, limit)
+        return await self._fetch_vacancy_page(candidates[start:end])
+
+    async def _fetch_vacancy_page(self, entries: List[Cursor]) -> List[Dict]:
+        """Tartiblangan (is_promoted, distance, id) ro'yxati bo'yicha qatorlarni olish"""
+        if not entries:
+            return []
+
+        async with self.acquire('fetch_vacancy_page') as conn:
+            rows = await conn.fetch_statement(
+                'vacancies_by_ids',
+                [vacancy_id for _, _, vacancy_id in entries]
+            )
+
+        by_id = {row['id']: dict(row) for row in rows}
+        vacancies = []
+        for _, distance, vacancy_id in entries:
+            vacancy = by_id.get(vacancy_id)
+            if vacancy:
+                vacancy['distance'] = distance
+                vacancies.append(vacancy)
+        return vacancies
+
+    # QIDIRUV NATIJALARI KESHI
+
+    @staticmethod
+    def _snapshot_key(user_id: int, latitude: float, longitude: float,
+                      radius_km: int, salary_from: Optional[int],
+                      keyword: Optional[str], salary_to: Optional[int]) -> tuple:
+        return (user_id, round(float(latitude), 3), round(float(longitude), 3),
+                radius_km, salary_from or 0, salary_to, keyword or '')
+
+    def _forget_snapshot(self, key: tuple, entries: List[Cursor]):
+        """Keshdan chiqqan snapshotni teskari indeksdan o'chirish"""
+        for _, _, vacancy_id in entries:
+            keys = self._snapshots_by_vacancy.get(vacancy_id)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._snapshots_by_vacancy[vacancy_id]
+
+    def invalidate_search_snapshots(self, vacancy_id: int):
+        """Vakansiya holati o'zgarganda uni o'z ichiga olgan snapshotlarni o'chirish"""
+        for key in list(self._snapshots_by_vacancy.get(vacancy_id, ())):
+            self.search_snapshots.pop(key)
+
+    async def _build_search_snapshot(self, latitude: float, longitude: float,
+                                     radius_km: int, salary_from: Optional[int],
+                                     keyword: Optional[str],
+                                     salary_to: Optional[int]) -> List[Cursor]:
+        """Qidiruvning tartiblangan (is_promoted, distance, id) ro'yxati"""
+        if self.vacancy_index is not None:
+            return self.vacancy_index.nearby(
+                latitude, longitude, radius_km, salary_from,
+                only=await self._keyword_candidates(keyword), salary_to=salary_to
+            )[:SEARCH_SNAPSHOT_LIMIT]
+
+        params = self._nearby_params(latitude, longitude, radius_km, salary_from,
+                                     keyword, salary_to)
+        async with self.acquire('build_search_snapshot') as conn:
+            rows = await conn.fetch_statement(
+                'nearby_snapshot',
+                *params, SEARCH_SNAPSHOT_LIMIT
+            )
+        return [(row['is_promoted'], float(row['distance']), row['id']) for row in rows]
+
+    async def get_nearby_page(self, user_id: int, latitude: float, longitude: float,
+                              radius_km: int = 50, salary_from: int = None,
+                              after: Cursor = None, before: Cursor = None,
+                              limit: int = 5, keyword: str = None,
+                              salary_to: int = None) -> Tuple[List[Dict], bool, Optional[int]]:
+        """Qidiruv sahifasi: (vakansiyalar, keyingi sahifa bormi, jami soni).
+
+        Yangi qidiruvda (kursorsiz) tartiblangan id ro'yxati keshlanadi,
+        sahifa almashtirishda faqat shu ro'yxat kesiladi. Kesh bo'lmasa
+        keyset so'rovga qaytiladi va jami soni None bo'ladi.
+        """
+        key = self._snapshot_key(user_id, latitude, longitude, radius_km,
+                                 salary_from, keyword, salary_to)
+
+        if after or before:
+            snapshot = self.search_snapshots.get(key)
+        else:
+            snapshot = await self._build_search_snapshot(latitude, longitude, radius_km,
+                                                         salary_from, keyword, salary_to)
+            self.search_snapshots.set(key, snapshot)
+            for _, _, vacancy_id in snapshot:
+                self._snapshots_by_vacancy.setdefault(vacancy_id, set()).add(key)
+
+        if snapshot is not None:
+            start, end = _cursor_slice(snapshot, after, before, limit)
+            # Snapshot chegarasidan keyingi sahifalar keyset orqali olinadi
+            if start < end or len(snapshot) < SEARCH_SNAPSHOT_LIMIT:
+                vacancies = await self._fetch_vacancy_page(snapshot[start:end])
+                has_next = end < len(snapshot) or len(snapshot) >= SEARCH_SNAPSHOT_LIMIT
+                return vacancies, has_next, len(snapshot)
+
+        if before:
+            vacancies = await self.get_nearby_vacancies(
+                latitude, longitude, radius_km, salary_from, before=before, limit=limit,
+                keyword=keyword, salary_to=salary_to
+            )
+            return vacancies, True, None
+
+        # Bitta ortiqcha qator - keyingi sahifa borligini tekshirish uchun
+        vacancies = await self.get_nearby_vacancies(
+            latitude, longitude, radius_km, salary_from, after=after, limit=limit + 1,
+            keyword=keyword, salary_to=salary_to
+        )
+        return vacancies[:limit], len(vacancies) > limit, None
 
     async def get_pending_vacancies(self) -> List[Dict]:
         """Tasdiqlashni kutayotgan vakansiyalar"""
-        async with self.pool.acquire() as conn:
+        async with self.acquire('get_pending_vacancies') as conn:
             vacancies = await conn.fetch(
                 """SELECT v.*, u.first_name as employer_name, u.username as employer_username
                    FROM vacancies v 
@@ -145,56 +813,170 @@ class Database:
 
     async def approve_vacancy(self, vacancy_id: int):
         """Vakansiyani tasdiqlash"""
-        async with self.pool.acquire() as conn:
-            await conn.execute(
-                "UPDATE vacancies SET is_approved = TRUE WHERE id = $1",
+        async with self.acquire('approve_vacancy') as conn:
+            vacancy = await conn.fetchrow(
+                """UPDATE vacancies SET is_approved = TRUE WHERE id = $1
+                   RETURNING id, employer_id, latitude, longitude, is_active,
+                             is_promoted, salary_from, salary_to""",
                 vacancy_id
             )
 
+        if self.vacancy_index is not None and vacancy and vacancy['is_active']:
+            self.vacancy_index.add(
+                vacancy['id'], vacancy['latitude'], vacancy['longitude'],
+                vacancy['is_promoted'], vacancy['salary_from'], vacancy['salary_to']
+            )
+        self.invalidate_vacancy(vacancy_id)
+        await self._publish_change('vacancy', vacancy_id)
+        if vacancy:
+            await self._employer_changed(vacancy['employer_id'])
+
     async def reject_vacancy(self, vacancy_id: int):
         """Vakansiyani rad etish"""
-        async with self.pool.acquire() as conn:
-            await conn.execute(
-                "UPDATE vacancies SET is_active = FALSE WHERE id = $1",
+        await self.deactivate_vacancy(vacancy_id)
+
+    async def deactivate_vacancy(self, vacancy_id: int):
+        """Vakansiyani faol emas holatga o'tkazish"""
+        async with self.acquire('deactivate_vacancy') as conn:
+            employer_id = await conn.fetchval(
+                "UPDATE vacancies SET is_active = FALSE WHERE id = $1 RETURNING employer_id",
                 vacancy_id
             )
 
+        if self.vacancy_index is not None:
+            self.vacancy_index.remove(vacancy_id)
+        self.invalidate_vacancy(vacancy_id)
+        await self._publish_change('vacancy', vacancy_id)
+        await self._employer_changed(employer_id)
+
     async def promote_vacancy(self, vacancy_id: int, promotion_type: str,
                               duration_days: int = 7):
         """Vakansiyani reklama qilish"""
-        async with self.pool.acquire() as conn:
+        async with self.acquire('promote_vacancy') as conn:
             expires_at = datetime.now() + timedelta(days=duration_days)
-            await conn.execute(
+            employer_id = await conn.fetchval(
                 """UPDATE vacancies 
                    SET is_promoted = TRUE, promotion_type = $1, 
                        promotion_expires_at = $2 
-                   WHERE id = $3""",
+                   WHERE id = $3
+                   RETURNING employer_id""",
                 promotion_type, expires_at, vacancy_id
             )
 
+        if self.vacancy_index is not None:
+            self.vacancy_index.set_promoted(vacancy_id, True)
+        self.invalidate_vacancy(vacancy_id)
+        await self._publish_change('vacancy', vacancy_id)
+        await self._employer_changed(employer_id)
+
+    async def get_employer_vacancies(self, employer_id: int,
+                                     after: Tuple[datetime, int] = None,
+                                     before: Tuple[datetime, int] = None,
+                                     limit: int = 10) -> Tuple[List[Dict], bool]:
+        """Ish beruvchi vakansiyalari sahifasi (yangilari birinchi).
+
+        `after`/`before` - (created_at, id) kursori. Qaytaradi: (vakansiyalar,
+        shu yo'nalishda yana sahifa bormi).
+        """
+        cursor = before or after or (None, None)
+        async with self.acquire('get_employer_vacancies') as conn:
+            rows = await conn.fetch_statement(
+                'employer_vacancies_before' if before else 'employer_vacancies_after',
+                employer_id, cursor[0], cursor[1], limit + 1
+            )
+
+        vacancies = [dict(row) for row in rows[:limit]]
+        if before:
+            vacancies.reverse()
+        return vacancies, len(rows) > limit
+
+    async def expire_promotions(self, limit: int = 500) -> int:
+        """Muddati o'tgan reklamalarni o'chirish (bir partiya), soni qaytariladi"""
+        async with self.acquire('expire_promotions') as conn:
+            rows = await conn.fetch(
+                """UPDATE vacancies SET is_promoted = FALSE
+                   WHERE id IN (
+                       SELECT id FROM vacancies
+                       WHERE is_promoted = TRUE AND promotion_expires_at <= $1
+                       ORDER BY promotion_expires_at
+                       LIMIT $2
+                       FOR UPDATE SKIP LOCKED
+                   )
+                   RETURNING id, employer_id""",
+                datetime.now(), limit
+            )
+
+        for row in rows:
+            if self.vacancy_index is not None:
+                self.vacancy_index.set_promoted(row['id'], False)
+            self.invalidate_vacancy(row['id'])
+
+        # Butun partiya uchun bitta xabar (har bir qator uchun emas)
+        await self._publish_changes('vacancy', [row['id'] for row in rows])
+        employer_ids = sorted({row['employer_id'] for row in rows
+                               if row['employer_id'] is not None})
+        for employer_id in employer_ids:
+            self.employer_stats_cache.pop(employer_id)
+        await self._publish_changes('employer', employer_ids)
+        return len(rows)
+
+    async def create_payment(self, user_id: int, vacancy_id: int, amount: int,
+                             service_type: str, status: str = 'completed') -> int:
+        """To'lov yozuvini yaratish"""
+        async with self.acquire('create_payment') as conn:
+            payment_id = await conn.fetchval(
+                """INSERT INTO payments 
+                   (user_id, vacancy_id, amount, service_type, status)
+                   VALUES ($1, $2, $3, $4, $5)
+                   RETURNING id""",
+                user_id, vacancy_id, amount, service_type, status
+            )
+
+        await self._employer_changed(user_id)
+        return payment_id
+
     # OBUNALAR BILAN ISHLASH
 
     async def create_subscription(self, user_id: int, latitude: float,
                                   longitude: float, radius_km: int = 10,
                                   salary_from: int = None, keywords: str = None):
         """Obuna yaratish"""
-        async with self.pool.acquire() as conn:
+        async with self.acquire('create_subscription') as conn:
             # Eski obunani o'chirish
             await conn.execute(
                 "DELETE FROM subscriptions WHERE user_id = $1", user_id
             )
 
             # Yangi obuna yaratish
-            await conn.execute(
+            subscription = await conn.fetchrow(
                 """INSERT INTO subscriptions 
                    (user_id, latitude, longitude, radius_km, salary_from, keywords)
-                   VALUES ($1, $2, $3, $4, $5, $6)""",
+                   VALUES ($1, $2, $3, $4, $5, $6)
+                   RETURNING id, user_id, latitude, longitude, radius_km, salary_from,
+                             keywords,
+                             (SELECT telegram_id FROM users WHERE id = $1) AS telegram_id""",
                 user_id, latitude, longitude, radius_km, salary_from, keywords
             )
 
+        if self.subscription_index is not None:
+            self.subscription_index.remove_user(user_id)
+            self.subscription_index.add(dict(subscription))
+        await self._publish_change('subscription_user', user_id)
+
+    async def delete_subscription(self, user_id: int):
+        """Foydalanuvchi obunasini o'chirish"""
+        async with self.acquire('delete_subscription') as conn:
+            await conn.execute(
+                "DELETE FROM subscriptions WHERE user_id = $1", user_id
+            )
+
+        if self.subscription_index is not None:
+            self.subscription_index.remove_user(user_id)
+        await self._publish_change('subscription_user', user_id)
+
     async def get_user_subscription(self, user_id: int) -> Optional[Dict]:
         """Foydalanuvchi obunasini olish"""
-        async with self.pool.acquire() as conn:
+        async with self.acquire('get_user_subscription') as conn:
             subscription = await conn.fetchrow(
                 "SELECT * FROM subscriptions WHERE user_id = $1 AND is_active = TRUE",
                 user_id
@@ -203,50 +985,173 @@ class Database:
 
     async def get_subscribers_for_vacancy(self, vacancy_id: int) -> List[Dict]:
         """Vakansiya uchun obunachlarni topish"""
-        async with self.pool.acquire() as conn:
-            vacancy = await self.get_vacancy(vacancy_id)
-            if not vacancy:
-                return []
+        vacancy = await self.get_vacancy(vacancy_id)
+        if not vacancy:
+            return []
 
-            subscribers = await conn.fetch(
-                """SELECT s.*, u.telegram_id 
-                   FROM subscriptions s
-                   JOIN users u ON s.user_id = u.id
-                   WHERE s.is_active = TRUE 
-                   AND calculate_distance(s.latitude, s.longitude, $1, $2) <= s.radius_km
-                   AND (s.salary_from IS NULL OR $3 >= s.salary_from)""",
+        if self.subscription_index is not None:
+            return self.subscription_index.match(
+                vacancy['latitude'], vacancy['longitude'], vacancy['salary_max'],
+                tokenize(f"{vacancy['title']} {vacancy['description']}")
+            )
+
+        # Obuna radiusi MAX_DISTANCE_KM dan oshmaydi - shu bo'yicha to'rtburchak
+        min_lat, max_lat, min_lon, max_lon = bounding_box(
+            float(vacancy['latitude']), float(vacancy['longitude']), MAX_DISTANCE_KM
+        )
+
+        async with self.acquire('get_subscribers_for_vacancy') as conn:
+            subscribers = await conn.fetch_statement(
+                'subscribers_for_vacancy',
                 vacancy['latitude'], vacancy['longitude'],
-                vacancy['salary_from'] or 0
+                vacancy['salary_max'],
+                min_lat, max_lat, min_lon, max_lon,
+                vacancy['title'], vacancy['description']
             )
             return [dict(s) for s in subscribers]
 
-    # STATISTIKA
+    # XABARNOMALAR NAVBATI
 
-    async def get_statistics(self) -> Dict:
-        """Statistikani olish"""
-        async with self.pool.acquire() as conn:
-            total_users = await conn.fetchval("SELECT COUNT(*) FROM users")
-            total_employers = await conn.fetchval(
-                "SELECT COUNT(*) FROM users WHERE is_employer = TRUE"
+    async def enqueue_broadcast(self, vacancy_id: Optional[int], text: str,
+                                chat_ids: List[int], requested_by: int = None) -> int:
+        """Tarqatishni navbatga qo'yish (har bir chat uchun outbox qatori)"""
+        async with self.acquire('enqueue_broadcast') as conn:
+            async with conn.transaction():
+                broadcast_id = await conn.fetchval(
+                    """INSERT INTO broadcasts (vacancy_id, text, requested_by, total)
+                       VALUES ($1, $2, $3, $4) RETURNING id""",
+                    vacancy_id, text, requested_by, len(chat_ids)
+                )
+                await conn.copy_records_to_table(
+                    'notification_outbox',
+                    records=[(broadcast_id, chat_id) for chat_id in chat_ids],
+                    columns=['broadcast_id', 'chat_id']
+                )
+            return broadcast_id
+
+    async def claim_notifications(self, limit: int, lease_seconds: float) -> List[Dict]:
+        """Yuborish vaqti kelgan xabarlarni band qilish.
+
+        Band qilingan qator lease muddati o'tguncha boshqa jarayonlarga
+        ko'rinmaydi; jarayon to'xtab qolsa, qator yana navbatga qaytadi.
+        """
+        async with self.acquire('claim_notifications') as conn:
+            rows = await conn.fetch(
+                """UPDATE notification_outbox o
+                   SET status = 'sending', attempts = o.attempts + 1,
+                       next_attempt_at = CURRENT_TIMESTAMP + make_interval(secs => $2)
+                   WHERE o.id IN (
+                       SELECT id FROM notification_outbox
+                       WHERE status IN ('pending', 'sending')
+                       AND next_attempt_at <= CURRENT_TIMESTAMP
+                       ORDER BY next_attempt_at
+                       LIMIT $1
+                       FOR UPDATE SKIP LOCKED
+                   )
+                   RETURNING o.id, o.broadcast_id, o.chat_id, o.attempts""",
+                limit, float(lease_seconds)
+            )
+            return [dict(r) for r in rows]
+
+    async def get_broadcast_text(self, broadcast_id: int) -> Optional[str]:
+        """Tarqatish matnini olish"""
+        async with self.acquire('get_broadcast_text') as conn:
+            return await conn.fetchval(
+                "SELECT text FROM broadcasts WHERE id = $1", broadcast_id
+            )
+
+    async def mark_notifications_sent(self, notification_ids: List[int]):
+        """Yuborilgan xabarlarni belgilash"""
+        async with self.acquire('mark_notifications_sent') as conn:
+            await conn.execute(
+                """UPDATE notification_outbox
+                   SET status = 'sent', sent_at = CURRENT_TIMESTAMP, last_error = NULL
+                   WHERE id = ANY($1::bigint[])""",
+                notification_ids
             )
-            total_vacancies = await conn.fetchval("SELECT COUNT(*) FROM vacancies")
-            active_vacancies = await conn.fetchval(
-                "SELECT COUNT(*) FROM vacancies WHERE is_active = TRUE AND is_approved = TRUE"
+
+    async def retry_notification(self, notification_id: int, delay_seconds: float,
+                                 error: str):
+        """Xabarni keyinroq qayta yuborish uchun navbatga qaytarish"""
+        async with self.acquire('retry_notification') as conn:
+            await conn.execute(
+                """UPDATE notification_outbox
+                   SET status = 'pending', last_error = $3,
+                       next_attempt_at = CURRENT_TIMESTAMP + make_interval(secs => $2)
+                   WHERE id = $1""",
+                notification_id, float(delay_seconds), error
             )
-            pending_vacancies = await conn.fetchval(
-                "SELECT COUNT(*) FROM vacancies WHERE is_approved = FALSE"
+
+    async def fail_notification(self, notification_id: int, error: str):
+        """Xabarni yuborib bo'lmadi deb belgilash"""
+        async with self.acquire('fail_notification') as conn:
+            await conn.execute(
+                """UPDATE notification_outbox SET status = 'failed', last_error = $2
+                   WHERE id = $1""",
+                notification_id, error
             )
 
-            return {
-                'total_users': total_users,
-                'total_employers': total_employers,
-                'total_vacancies': total_vacancies,
-                'active_vacancies': active_vacancies,
-                'pending_vacancies': pending_vacancies
-            }
+    async def finish_broadcasts(self) -> List[Dict]:
+        """Navbatda qatori qolmagan tarqatishlarni yakunlash va natijalarini qaytarish"""
+        async with self.acquire('finish_broadcasts') as conn:
+            rows = await conn.fetch(
+                """UPDATE broadcasts b
+                   SET finished_at = CURRENT_TIMESTAMP,
+                       sent = c.sent, failed = c.failed
+                   FROM (
+                       SELECT o.broadcast_id,
+                              COUNT(*) FILTER (WHERE o.status = 'sent') AS sent,
+                              COUNT(*) FILTER (WHERE o.status = 'failed') AS failed,
+                              COUNT(*) FILTER (WHERE o.status IN ('pending', 'sending')) AS left
+                       FROM notification_outbox o
+                       JOIN broadcasts ub ON ub.id = o.broadcast_id
+                       WHERE ub.finished_at IS NULL
+                       GROUP BY o.broadcast_id
+                   ) c
+                   WHERE b.id = c.broadcast_id AND c.left = 0
+                   RETURNING b.id, b.vacancy_id, b.requested_by, b.total, b.sent, b.failed"""
+            )
+            return [dict(r) for r in rows]
+
+    async def get_delivery_statistics(self) -> Dict:
+        """Xabarnomalar yetkazilishi statistikasi (yakunlangan tarqatishlar + navbat)"""
+        async with self.acquire('get_delivery_statistics') as conn:
+            row = await conn.fetchrow(
+                """SELECT COALESCE(SUM(sent), 0) AS sent,
+                          COALESCE(SUM(failed), 0) AS failed,
+                          (SELECT COUNT(*) FROM notification_outbox
+                           WHERE status IN ('pending', 'sending')) AS queued
+                   FROM broadcasts
+                   WHERE finished_at IS NOT NULL"""
+            )
+            return dict(row)
+
+    # STATISTIKA
+
+    async def get_statistics(self) -> Dict:
+        """Statistikani olish (triggerlar yuritadigan hisoblagichlardan)"""
+        async with self.acquire('get_statistics') as conn:
+            rows = await conn.fetch_statement('stat_counters')
+
+        stats = dict.fromkeys(STAT_COUNTERS, 0)
+        stats.update({row['name']: row['value'] for row in rows})
+        return stats
+
+    async def recount_statistics(self) -> Dict:
+        """Hisoblagichlarni jadvallardan to'liq qayta hisoblash"""
+        async with self.acquire('recount_statistics') as conn:
+            await conn.execute("SELECT recount_stat_counters()")
+        return await self.get_statistics()
 
     async def close(self):
         """Ma'lumotlar bazasi ulanishini yopish"""
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+            await asyncio.gather(self._reconnect_task, return_exceptions=True)
+            self._reconnect_task = None
+        if self._listener_conn:
+            conn, self._listener_conn = self._listener_conn, None
+            await conn.close()
         if self.pool:
             await self.pool.close()
 
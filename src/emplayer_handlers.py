@@ -4,36 +4,16 @@ from aiogram.fsm.context import FSMContext
 
 from src.db import db
 from src.keyboard import *
-from src.config import PROMOTION_PRICES
+from src.config import MY_VACANCIES_PER_PAGE, PROMOTION_PRICES
 
 employer_router = Router()
 
 
-@employer_router.message(F.text == "📋 Mening vakansiyalarim")
-async def my_vacancies(message: Message):
-    """Ish beruvchi vakansiyalarini ko'rsatish"""
-    user = await db.get_or_create_user(message.from_user.id)
-
-    async with db.pool.acquire() as conn:
-        vacancies = await conn.fetch(
-            """SELECT * FROM vacancies 
-               WHERE employer_id = $1 
-               ORDER BY created_at DESC""",
-            user['id']
-        )
-
-    if not vacancies:
-        await message.answer(
-            "📋 Sizda hali vakansiyalar yo'q.\n\n"
-            "Yangi vakansiya yaratish uchun "
-            "'➕ Yangi vakansiya' tugmasini bosing.",
-            reply_markup=employer_menu_keyboard()
-        )
-        return
+def format_my_vacancies_text(vacancies: list, total: int) -> str:
+    """Ish beruvchi vakansiyalari sahifasi matni"""
+    text = f"📋 <b>Sizning vakansiyalaringiz ({total} ta)</b>\n\n"
 
-    text = f"📋 <b>Sizning vakansiyalaringiz ({len(vacancies)} ta)</b>\n\n"
-
-    for i, vacancy in enumerate(vacancies[:10], 1):
+    for vacancy in vacancies:
         status = "✅" if vacancy['is_approved'] else "⏳"
         if not vacancy['is_active']:
             status = "❌"
@@ -52,8 +32,73 @@ async def my_vacancies(message: Message):
         "⏳ - Moderatsiyada\n"
         "❌ - Faol emas"
     )
+    return text
 
-    await message.answer(text, reply_markup=employer_menu_keyboard())
+
+@employer_router.message(F.text == "📋 Mening vakansiyalarim")
+async def my_vacancies(message: Message):
+    """Ish beruvchi vakansiyalarini ko'rsatish"""
+    user = await db.get_or_create_user(message.from_user.id)
+    vacancies, has_next = await db.get_employer_vacancies(
+        user['id'], limit=MY_VACANCIES_PER_PAGE
+    )
+
+    if not vacancies:
+        await message.answer(
+            "📋 Sizda hali vakansiyalar yo'q.\n\n"
+            "Yangi vakansiya yaratish uchun "
+            "'➕ Yangi vakansiya' tugmasini bosing.",
+            reply_markup=employer_menu_keyboard()
+        )
+        return
+
+    stats = await db.get_employer_statistics(user['id'])
+    total = stats['total_vacancies']
+    total_pages = max(1, -(-total // MY_VACANCIES_PER_PAGE))
+
+    await message.answer(
+        format_my_vacancies_text(vacancies, total),
+        reply_markup=my_vacancies_keyboard(vacancies, 0, total_pages,
+                                           has_prev=False, has_next=has_next)
+    )
+
+
+@employer_router.callback_query(F.data.startswith("my_vacancies:"))
+async def my_vacancies_page(callback: CallbackQuery):
+    """Ish beruvchi vakansiyalari sahifasini almashtirish"""
+    _, page, direction, created_us, vacancy_id = callback.data.split(":")
+    page = int(page)
+    cursor = parse_employer_cursor(created_us, vacancy_id)
+
+    user = await db.get_or_create_user(callback.from_user.id)
+    if direction == 'p':
+        vacancies, has_prev = await db.get_employer_vacancies(
+            user['id'], before=cursor, limit=MY_VACANCIES_PER_PAGE
+        )
+        has_next = True
+    else:
+        vacancies, has_next = await db.get_employer_vacancies(
+            user['id'], after=cursor, limit=MY_VACANCIES_PER_PAGE
+        )
+        has_prev = True
+
+    if not vacancies:
+        await callback.answer("📋 Boshqa vakansiyalar yo'q")
+        return
+
+    if not has_prev:
+        # Yangiroq vakansiya yo'q - bu birinchi sahifa
+        page = 0
+    stats = await db.get_employer_statistics(user['id'])
+    total = stats['total_vacancies']
+    total_pages = max(page + 1, -(-total // MY_VACANCIES_PER_PAGE))
+
+    await callback.message.edit_text(
+        format_my_vacancies_text(vacancies, total),
+        reply_markup=my_vacancies_keyboard(vacancies, page, total_pages,
+                                           has_prev=has_prev, has_next=has_next)
+    )
+    await callback.answer()
 
 
 @employer_router.callback_query(F.data.startswith("promote:"))
@@ -106,13 +151,7 @@ async def confirm_payment(callback: CallbackQuery):
     user = await db.get_or_create_user(callback.from_user.id)
     price = PROMOTION_PRICES.get(promotion_type, 0)
 
-    async with db.pool.acquire() as conn:
-        await conn.execute(
-            """INSERT INTO payments 
-               (user_id, vacancy_id, amount, service_type, status)
-               VALUES ($1, $2, $3, $4, 'completed')""",
-            user['id'], vacancy_id, price, promotion_type
-        )
+    await db.create_payment(user['id'], vacancy_id, price, promotion_type)
 
     await callback.message.edit_text(
         "✅ <b>Tolov muvaffaqiyatli amalga oshirildi!</b>\n\n"
@@ -138,45 +177,15 @@ async def employer_statistics(message: Message):
     """Ish beruvchi statistikasi"""
     user = await db.get_or_create_user(message.from_user.id)
 
-    async with db.pool.acquire() as conn:
-        # Vakansiyalar statistikasi
-        total_vacancies = await conn.fetchval(
-            "SELECT COUNT(*) FROM vacancies WHERE employer_id = $1",
-            user['id']
-        )
-
-        active_vacancies = await conn.fetchval(
-            """SELECT COUNT(*) FROM vacancies 
-               WHERE employer_id = $1 AND is_active = TRUE AND is_approved = TRUE""",
-            user['id']
-        )
-
-        pending_vacancies = await conn.fetchval(
-            """SELECT COUNT(*) FROM vacancies 
-               WHERE employer_id = $1 AND is_approved = FALSE""",
-            user['id']
-        )
-
-        promoted_vacancies = await conn.fetchval(
-            """SELECT COUNT(*) FROM vacancies 
-               WHERE employer_id = $1 AND is_promoted = TRUE""",
-            user['id']
-        )
-
-        # To'lovlar statistikasi
-        total_spent = await conn.fetchval(
-            """SELECT COALESCE(SUM(amount), 0) FROM payments 
-               WHERE user_id = $1 AND status = 'completed'""",
-            user['id']
-        ) or 0
+    stats = await db.get_employer_statistics(user['id'])
 
     text = (
         "📊 <b>Sizning statistikangiz</b>\n\n"
-        f"📋 Jami vakansiyalar: {total_vacancies}\n"
-        f"✅ Faol vakansiyalar: {active_vacancies}\n"
-        f"⏳ Moderatsiyada: {pending_vacancies}\n"
-        f"⭐ Reklama qilingan: {promoted_vacancies}\n\n"
-        f"💰 Jami sarflangan: {total_spent:,} som\n"
+        f"📋 Jami vakansiyalar: {stats['total_vacancies']}\n"
+        f"✅ Faol vakansiyalar: {stats['active_vacancies']}\n"
+        f"⏳ Moderatsiyada: {stats['pending_vacancies']}\n"
+        f"⭐ Reklama qilingan: {stats['promoted_vacancies']}\n\n"
+        f"💰 Jami sarflangan: {stats['total_spent']:,} som\n"
     )
 
     await message.answer(text, reply_markup=employer_menu_keyboard())
@@ -219,11 +228,7 @@ async def delete_vacancy_confirmed(callback: CallbackQuery):
     """Vakansiyani o'chirish tasdiqlandi"""
     vacancy_id = int(callback.data.split(":")[-1])
 
-    async with db.pool.acquire() as conn:
-        await conn.execute(
-            "UPDATE vacancies SET is_active = FALSE WHERE id = $1",
-            vacancy_id
-        )
+    await db.deactivate_vacancy(vacancy_id)
 
     await callback.message.edit_text(
         "✅ Vakansiya muvaffaqiyatli ochirildi!"
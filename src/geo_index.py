@@ -0,0 +1,244 @@
+import math
+from typing import AbstractSet, Dict, Iterable, List, Optional, Set, Tuple
+
+from .text_search import tokenize
+
+EARTH_RADIUS_KM = 6371.0
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180
+
+
+def haversine(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Ikki nuqta orasidagi masofa (km)"""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    d_phi = phi2 - phi1
+    d_lambda = math.radians(lon2 - lon1)
+    a = (math.sin(d_phi / 2) ** 2 +
+         math.cos(phi1) * math.cos(phi2) * math.sin(d_lambda / 2) ** 2)
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(a)))
+
+
+def salary_bounds(salary_from: Optional[int],
+                  salary_to: Optional[int]) -> Tuple[Optional[int], Optional[int]]:
+    """Vakansiya maoshining (eng past, eng yuqori) qiymati (noma'lum - None)"""
+    known = [salary for salary in (salary_from, salary_to) if salary is not None]
+    if not known:
+        return None, None
+    return min(known), max(known)
+
+
+def bounding_box(latitude: float, longitude: float,
+                 radius_km: float) -> Tuple[float, float, float, float]:
+    """Radius doirasini o'rab turuvchi to'rtburchak (min_lat, max_lat, min_lon, max_lon)"""
+    latitude, longitude = float(latitude), float(longitude)
+    d_lat = radius_km / KM_PER_DEGREE
+    min_lat = max(-90.0, latitude - d_lat)
+    max_lat = min(90.0, latitude + d_lat)
+
+    # Qutbga yaqin joyda uzunlik bo'yicha cheklab bo'lmaydi
+    cos_lat = math.cos(math.radians(max(abs(min_lat), abs(max_lat))))
+    if cos_lat < 1e-6:
+        return min_lat, max_lat, -180.0, 180.0
+
+    d_lon = radius_km / (KM_PER_DEGREE * cos_lat)
+    return min_lat, max_lat, longitude - d_lon, longitude + d_lon
+
+
+class VacancyGridIndex:
+    """Faol vakansiyalar uchun xotiradagi grid indeks.
+
+    Har bir vakansiya o'z katagiga (cell_size gradus) yoziladi, radius
+    so'rovi faqat doirani qoplaydigan kataklarni ko'rib chiqadi.
+    """
+
+    def __init__(self, cell_size: float = 0.1):
+        self.cell_size = cell_size
+        self._cells: Dict[Tuple[int, int], Set[int]] = {}
+        # id -> (latitude, longitude, is_promoted, salary_min, salary_max)
+        self._items: Dict[int, Tuple[float, float, bool, Optional[int], Optional[int]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def __contains__(self, vacancy_id: int) -> bool:
+        return vacancy_id in self._items
+
+    def _cell(self, latitude: float, longitude: float) -> Tuple[int, int]:
+        return (math.floor(latitude / self.cell_size),
+                math.floor(longitude / self.cell_size))
+
+    def load(self, rows: Iterable[Dict]):
+        """Indeksni vakansiyalar ro'yxatidan qayta qurish"""
+        self._cells.clear()
+        self._items.clear()
+        for row in rows:
+            self.add(row['id'], row['latitude'], row['longitude'],
+                     row.get('is_promoted') or False,
+                     row.get('salary_from'), row.get('salary_to'))
+
+    def add(self, vacancy_id: int, latitude: float, longitude: float,
+            is_promoted: bool = False, salary_from: int = None,
+            salary_to: int = None):
+        """Vakansiyani indeksga qo'shish yoki yangilash"""
+        self.remove(vacancy_id)
+        latitude, longitude = float(latitude), float(longitude)
+        self._items[vacancy_id] = (latitude, longitude, bool(is_promoted),
+                                   *salary_bounds(salary_from, salary_to))
+        self._cells.setdefault(self._cell(latitude, longitude), set()).add(vacancy_id)
+
+    def remove(self, vacancy_id: int):
+        """Vakansiyani indeksdan olib tashlash"""
+        item = self._items.pop(vacancy_id, None)
+        if item is None:
+            return
+
+        cell = self._cell(item[0], item[1])
+        bucket = self._cells.get(cell)
+        if bucket is not None:
+            bucket.discard(vacancy_id)
+            if not bucket:
+                del self._cells[cell]
+
+    def set_promoted(self, vacancy_id: int, is_promoted: bool = True):
+        """Reklama holatini yangilash"""
+        item = self._items.get(vacancy_id)
+        if item is not None:
+            self._items[vacancy_id] = (item[0], item[1], bool(is_promoted),
+                                       item[3], item[4])
+
+    def nearby(self, latitude: float, longitude: float, radius_km: float,
+               salary_from: int = None,
+               only: AbstractSet[int] = None,
+               salary_to: int = None) -> List[Tuple[bool, float, int]]:
+        """Radius ichidagi vakansiyalar: (is_promoted, distance, id),
+        reklama qilinganlar birinchi, keyin masofa bo'yicha tartiblangan.
+        `only` berilsa - faqat shu id'lar (masalan, matnli qidiruv natijasi).
+        Maosh oralig'i [salary_from, salary_to] vakansiya oralig'i bilan kesishishi kerak"""
+        latitude, longitude = float(latitude), float(longitude)
+        min_lat, max_lat, min_lon, max_lon = bounding_box(latitude, longitude, radius_km)
+        min_cell = self._cell(min_lat, min_lon)
+        max_cell = self._cell(max_lat, max_lon)
+
+        results = []
+        for cell_lat in range(min_cell[0], max_cell[0] + 1):
+            for cell_lon in range(min_cell[1], max_cell[1] + 1):
+                bucket = self._cells.get((cell_lat, cell_lon))
+                if not bucket:
+                    continue
+
+                if only is not None:
+                    bucket = bucket & only
+                for vacancy_id in bucket:
+                    lat, lon, is_promoted, v_salary_min, v_salary_max = self._items[vacancy_id]
+                    if salary_from and (v_salary_max or 0) < salary_from:
+                        continue
+                    if salary_to is not None and (v_salary_min is None or
+                                                  v_salary_min > salary_to):
+                        continue
+
+                    # SQL bilan bir xil aniqlik - kursor solishtirish uchun
+                    distance = round(haversine(latitude, longitude, lat, lon), 6)
+                    if distance <= radius_km:
+                        results.append((is_promoted, distance, vacancy_id))
+
+        results.sort(key=lambda r: (not r[0], r[1], r[2]))
+        return results
+
+
+class SubscriptionGridIndex:
+    """Obuna doiralari uchun xotiradagi grid indeks.
+
+    Har bir obuna o'z doirasi qoplaydigan barcha kataklarga yoziladi,
+    shuning uchun "bu nuqtani qaysi obunalar qamraydi" so'rovi faqat
+    bitta katakni ko'rib chiqadi.
+    """
+
+    def __init__(self, cell_size: float = 0.1):
+        self.cell_size = cell_size
+        self._cells: Dict[Tuple[int, int], Set[int]] = {}
+        self._items: Dict[int, Dict] = {}
+        self._by_user: Dict[int, Set[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def _cell(self, latitude: float, longitude: float) -> Tuple[int, int]:
+        return (math.floor(latitude / self.cell_size),
+                math.floor(longitude / self.cell_size))
+
+    def _covered_cells(self, item: Dict) -> Iterable[Tuple[int, int]]:
+        min_lat, max_lat, min_lon, max_lon = bounding_box(
+            item['latitude'], item['longitude'], item['radius_km']
+        )
+        min_cell = self._cell(min_lat, min_lon)
+        max_cell = self._cell(max_lat, max_lon)
+        for cell_lat in range(min_cell[0], max_cell[0] + 1):
+            for cell_lon in range(min_cell[1], max_cell[1] + 1):
+                yield cell_lat, cell_lon
+
+    def load(self, rows: Iterable[Dict]):
+        """Indeksni obunalar ro'yxatidan qayta qurish"""
+        self._cells.clear()
+        self._items.clear()
+        self._by_user.clear()
+        for row in rows:
+            self.add(row)
+
+    def add(self, subscription: Dict):
+        """Obunani indeksga qo'shish (id, user_id, latitude, longitude,
+        radius_km, salary_from, keywords, telegram_id)"""
+        item = dict(subscription)
+        item['latitude'] = float(item['latitude'])
+        item['longitude'] = float(item['longitude'])
+        item['keyword_tokens'] = tokenize(item.get('keywords'))
+
+        self.remove(item['id'])
+        self._items[item['id']] = item
+        self._by_user.setdefault(item['user_id'], set()).add(item['id'])
+        for cell in self._covered_cells(item):
+            self._cells.setdefault(cell, set()).add(item['id'])
+
+    def remove(self, subscription_id: int):
+        """Obunani indeksdan olib tashlash"""
+        item = self._items.pop(subscription_id, None)
+        if item is None:
+            return
+
+        user_subscriptions = self._by_user.get(item['user_id'])
+        if user_subscriptions is not None:
+            user_subscriptions.discard(subscription_id)
+            if not user_subscriptions:
+                del self._by_user[item['user_id']]
+
+        for cell in self._covered_cells(item):
+            bucket = self._cells.get(cell)
+            if bucket is not None:
+                bucket.discard(subscription_id)
+                if not bucket:
+                    del self._cells[cell]
+
+    def remove_user(self, user_id: int):
+        """Foydalanuvchining barcha obunalarini olib tashlash"""
+        for subscription_id in list(self._by_user.get(user_id, ())):
+            self.remove(subscription_id)
+
+    def match(self, latitude: float, longitude: float, salary: int = 0,
+              tokens: AbstractSet[str] = frozenset()) -> List[Dict]:
+        """Nuqtani qamraydigan, maosh va kalit so'z talabiga mos obunalar.
+
+        Kalit so'zli obuna vakansiya so'zlaridan (`tokens`) kamida bittasi
+        bilan mos kelishi kerak.
+        """
+        latitude, longitude = float(latitude), float(longitude)
+        bucket = self._cells.get(self._cell(latitude, longitude), ())
+
+        matches = []
+        for subscription_id in bucket:
+            item = self._items[subscription_id]
+            if item.get('salary_from') and salary < item['salary_from']:
+                continue
+            if item['keyword_tokens'] and item['keyword_tokens'].isdisjoint(tokens):
+                continue
+            if haversine(latitude, longitude,
+                         item['latitude'], item['longitude']) <= item['radius_km']:
+                matches.append(item)
+        return matches
@@ -0,0 +1,263 @@
+from typing import AbstractSet, Dict, Iterable, List, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # GEO_ENGINE='numpy' bo'lmasa numpy shart emas
+    np = None
+
+from .geo_index import EARTH_RADIUS_KM, KM_PER_DEGREE, salary_bounds
+from .text_search import tokenize
+
+# salary_bounds() dagi None o'rniga (SQL dagi salary_max/salary_min bilan bir xil)
+_NO_SALARY_MAX = 0
+_NO_SALARY_MIN = 2 ** 31 - 1
+
+
+def _require_numpy():
+    if np is None:
+        raise RuntimeError("GEO_ENGINE='numpy' uchun numpy o'rnatilishi kerak: pip install numpy")
+
+
+def haversine_many(latitude: float, longitude: float,
+                   lat_rad: "np.ndarray", lon_rad: "np.ndarray",
+                   cos_lat: "np.ndarray") -> "np.ndarray":
+    """Bitta nuqtadan ko'p nuqtagacha masofalar (km), bitta vektor amalida"""
+    phi = np.radians(latitude)
+    d_phi = lat_rad - phi
+    d_lambda = lon_rad - np.radians(longitude)
+    a = np.sin(d_phi / 2) ** 2 + np.cos(phi) * cos_lat * np.sin(d_lambda / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.minimum(a, 1.0)))
+
+
+class _Columns:
+    """O'sadigan ustunli massivlar: id -> qator, o'chirishda oxirgi qator o'rniga ko'chadi"""
+
+    def __init__(self, dtypes: Dict[str, str]):
+        _require_numpy()
+        self.dtypes = dtypes
+        self.size = 0
+        self.slots: Dict[int, int] = {}
+        self.ids = np.empty(0, dtype=np.int64)
+        self.arrays = {name: np.empty(0, dtype=dtype) for name, dtype in dtypes.items()}
+
+    def clear(self):
+        self.__init__(self.dtypes)
+
+    def _grow(self):
+        capacity = max(64, 2 * len(self.ids))
+        self.ids = np.resize(self.ids, capacity)
+        for name, array in self.arrays.items():
+            self.arrays[name] = np.resize(array, capacity)
+
+    def put(self, object_id: int, **values):
+        slot = self.slots.get(object_id)
+        if slot is None:
+            if self.size == len(self.ids):
+                self._grow()
+            slot = self.slots[object_id] = self.size
+            self.size += 1
+
+        self.ids[slot] = object_id
+        for name, value in values.items():
+            self.arrays[name][slot] = value
+
+    def delete(self, object_id: int) -> bool:
+        slot = self.slots.pop(object_id, None)
+        if slot is None:
+            return False
+
+        last = self.size - 1
+        if slot != last:
+            moved_id = int(self.ids[last])
+            self.ids[slot] = moved_id
+            for array in self.arrays.values():
+                array[slot] = array[last]
+            self.slots[moved_id] = slot
+        self.size = last
+        return True
+
+    def view(self, name: str) -> "np.ndarray":
+        return self.arrays[name][:self.size]
+
+
+class NumpyVacancyIndex:
+    """Faol vakansiyalar koordinatalari uzluksiz NumPy massivlarida.
+
+    VacancyGridIndex bilan bir xil interfeys: radius, maosh va id filtri,
+    masofa va (reklama, masofa, id) tartibi butun nomzodlar to'plami
+    uchun bitta vektorlashtirilgan o'tishda hisoblanadi.
+    """
+
+    def __init__(self):
+        self._columns = _Columns({
+            'lat': 'f8', 'lon': 'f8', 'lat_rad': 'f8', 'lon_rad': 'f8',
+            'cos_lat': 'f8', 'promoted': '?', 'salary_min': 'i8', 'salary_max': 'i8'
+        })
+
+    def __len__(self) -> int:
+        return self._columns.size
+
+    def __contains__(self, vacancy_id: int) -> bool:
+        return vacancy_id in self._columns.slots
+
+    def load(self, rows: Iterable[Dict]):
+        """Indeksni vakansiyalar ro'yxatidan qayta qurish"""
+        self._columns.clear()
+        for row in rows:
+            self.add(row['id'], row['latitude'], row['longitude'],
+                     row.get('is_promoted') or False,
+                     row.get('salary_from'), row.get('salary_to'))
+
+    def add(self, vacancy_id: int, latitude: float, longitude: float,
+            is_promoted: bool = False, salary_from: int = None,
+            salary_to: int = None):
+        """Vakansiyani indeksga qo'shish yoki yangilash"""
+        latitude, longitude = float(latitude), float(longitude)
+        salary_min, salary_max = salary_bounds(salary_from, salary_to)
+        self._columns.put(
+            vacancy_id, lat=latitude, lon=longitude,
+            lat_rad=np.radians(latitude), lon_rad=np.radians(longitude),
+            cos_lat=np.cos(np.radians(latitude)), promoted=bool(is_promoted),
+            salary_min=_NO_SALARY_MIN if salary_min is None else salary_min,
+            salary_max=_NO_SALARY_MAX if salary_max is None else salary_max
+        )
+
+    def remove(self, vacancy_id: int):
+        """Vakansiyani indeksdan olib tashlash"""
+        self._columns.delete(vacancy_id)
+
+    def set_promoted(self, vacancy_id: int, is_promoted: bool = True):
+        """Reklama holatini yangilash"""
+        slot = self._columns.slots.get(vacancy_id)
+        if slot is not None:
+            self._columns.arrays['promoted'][slot] = bool(is_promoted)
+
+    def nearby(self, latitude: float, longitude: float, radius_km: float,
+               salary_from: int = None,
+               only: AbstractSet[int] = None,
+               salary_to: int = None) -> List[Tuple[bool, float, int]]:
+        """Radius ichidagi vakansiyalar: (is_promoted, distance, id),
+        reklama qilinganlar birinchi, keyin masofa bo'yicha tartiblangan"""
+        columns = self._columns
+        if not columns.size:
+            return []
+
+        latitude, longitude = float(latitude), float(longitude)
+        lat = columns.view('lat')
+        # Kenglik bo'yicha arzon oldindan filtr, keyin aniq masofa
+        mask = np.abs(lat - latitude) <= radius_km / KM_PER_DEGREE
+        if salary_from:
+            mask &= columns.view('salary_max') >= salary_from
+        if salary_to is not None:
+            mask &= columns.view('salary_min') <= salary_to
+        if only is not None:
+            mask &= np.isin(columns.ids[:columns.size],
+                            np.fromiter(only, dtype=np.int64, count=len(only)))
+
+        candidates = np.flatnonzero(mask)
+        if not len(candidates):
+            return []
+
+        # SQL bilan bir xil aniqlik - kursor solishtirish uchun
+        distances = np.round(haversine_many(
+            latitude, longitude,
+            columns.view('lat_rad')[candidates], columns.view('lon_rad')[candidates],
+            columns.view('cos_lat')[candidates]
+        ), 6)
+        inside = distances <= radius_km
+        candidates, distances = candidates[inside], distances[inside]
+
+        ids = columns.ids[candidates]
+        promoted = columns.view('promoted')[candidates]
+        # lexsort: oxirgi kalit asosiy - avval reklama, keyin masofa, keyin id
+        order = np.lexsort((ids, distances, ~promoted))
+        return list(zip(promoted[order].tolist(), distances[order].tolist(),
+                        ids[order].tolist()))
+
+
+class NumpySubscriptionIndex:
+    """Obuna markazlari NumPy massivlarida: "bu nuqtani qaysi obunalar
+    qamraydi" so'rovi barcha obunalar uchun bitta vektor o'tishida"""
+
+    def __init__(self):
+        self._columns = _Columns({
+            'lat': 'f8', 'lat_rad': 'f8', 'lon_rad': 'f8', 'cos_lat': 'f8',
+            'radius': 'f8', 'salary_from': 'i8'
+        })
+        self._items: Dict[int, Dict] = {}
+        self._by_user: Dict[int, set] = {}
+
+    def __len__(self) -> int:
+        return self._columns.size
+
+    def load(self, rows: Iterable[Dict]):
+        """Indeksni obunalar ro'yxatidan qayta qurish"""
+        self._columns.clear()
+        self._items.clear()
+        self._by_user.clear()
+        for row in rows:
+            self.add(row)
+
+    def add(self, subscription: Dict):
+        """Obunani indeksga qo'shish (id, user_id, latitude, longitude,
+        radius_km, salary_from, keywords, telegram_id)"""
+        item = dict(subscription)
+        item['latitude'] = float(item['latitude'])
+        item['longitude'] = float(item['longitude'])
+        item['keyword_tokens'] = tokenize(item.get('keywords'))
+
+        self.remove(item['id'])
+        self._items[item['id']] = item
+        self._by_user.setdefault(item['user_id'], set()).add(item['id'])
+        self._columns.put(
+            item['id'], lat=item['latitude'],
+            lat_rad=np.radians(item['latitude']), lon_rad=np.radians(item['longitude']),
+            cos_lat=np.cos(np.radians(item['latitude'])),
+            radius=item['radius_km'], salary_from=item.get('salary_from') or 0
+        )
+
+    def remove(self, subscription_id: int):
+        """Obunani indeksdan olib tashlash"""
+        item = self._items.pop(subscription_id, None)
+        if item is None:
+            return
+
+        user_subscriptions = self._by_user.get(item['user_id'])
+        if user_subscriptions is not None:
+            user_subscriptions.discard(subscription_id)
+            if not user_subscriptions:
+                del self._by_user[item['user_id']]
+        self._columns.delete(subscription_id)
+
+    def remove_user(self, user_id: int):
+        """Foydalanuvchining barcha obunalarini olib tashlash"""
+        for subscription_id in list(self._by_user.get(user_id, ())):
+            self.remove(subscription_id)
+
+    def match(self, latitude: float, longitude: float, salary: int = 0,
+              tokens: AbstractSet[str] = frozenset()) -> List[Dict]:
+        """Nuqtani qamraydigan, maosh va kalit so'z talabiga mos obunalar"""
+        columns = self._columns
+        if not columns.size:
+            return []
+
+        latitude, longitude = float(latitude), float(longitude)
+        radius = columns.view('radius')
+        mask = np.abs(columns.view('lat') - latitude) <= radius / KM_PER_DEGREE
+        mask &= columns.view('salary_from') <= (salary or 0)
+
+        candidates = np.flatnonzero(mask)
+        distances = haversine_many(
+            latitude, longitude,
+            columns.view('lat_rad')[candidates], columns.view('lon_rad')[candidates],
+            columns.view('cos_lat')[candidates]
+        )
+        candidates = candidates[distances <= radius[candidates]]
+
+        matches = []
+        for subscription_id in columns.ids[candidates].tolist():
+            item = self._items[subscription_id]
+            if item['keyword_tokens'] and item['keyword_tokens'].isdisjoint(tokens):
+                continue
+            matches.append(item)
+        return matches
@@ -1,14 +1,23 @@
 from aiogram import Router, F
-from aiogram.types import Message, CallbackQuery, Location, Contact
+from aiogram.types import Message, CallbackQuery, Location, Contact, BufferedInputFile
 from aiogram.filters import Command, StateFilter
 from aiogram.fsm.context import FSMContext
 from aiogram.fsm.state import State, StatesGroup
 from aiogram.exceptions import TelegramBadRequest
+import html
+import io
 import re
 
+from src.broadcaster import broadcaster
+from src.cache import TTLCache
+from src.bulk import detect_format, export_vacancies, import_vacancies
 from src.db import db
 from src.keyboard import *
-from src.config import ADMIN_IDS, VACANCIES_PER_PAGE, PROMOTION_PRICES
+from src.config import (
+    ADMIN_IDS, VACANCIES_PER_PAGE, PROMOTION_PRICES, SEARCH_COUNT_CAP,
+    VACANCY_CARD_CACHE_SIZE, VACANCY_CARD_CACHE_TTL
+)
+from src.text_search import normalize_query
 
 router = Router()
 
@@ -30,6 +39,7 @@ class SearchFilters(StatesGroup):
     location = State()
     salary_from = State()
     radius = State()
+    keyword = State()
 
 
 class SubscriptionForm(StatesGroup):
@@ -39,30 +49,56 @@ class SubscriptionForm(StatesGroup):
 
 
 # HELPER FUNCTIONS
-def format_vacancy_text(vacancy: dict) -> str:
-    """Vakansiya matnini formatlash"""
-    text = f"<b>{vacancy['title']}</b>\n\n"
-    text += f"📝 <b>Tavsif:</b>\n{vacancy['description']}\n\n"
+
+# Tayyor matnlar: (tur, id, updated_at, ish beruvchi nomi) -> HTML.
+# Vakansiya o'zgarsa updated_at, ish beruvchi nomi o'zgarsa (users jadvali)
+# kalit o'zgaradi - eski versiya keshda ishlatilmay eskiradi
+vacancy_cards = TTLCache(VACANCY_CARD_CACHE_SIZE, VACANCY_CARD_CACHE_TTL)
+
+
+def _card_key(kind: str, vacancy: dict) -> tuple:
+    return kind, vacancy['id'], vacancy.get('updated_at'), vacancy.get('employer_name')
+
+
+def _render_vacancy_card(vacancy: dict) -> str:
+    """Kartochkaning o'quvchiga bog'liq bo'lmagan qismi (masofasiz)"""
+    lines = [
+        f"<b>{vacancy['title']}</b>",
+        "",
+        f"📝 <b>Tavsif:</b>\n{vacancy['description']}",
+        "",
+    ]
 
     if vacancy.get('salary_from') or vacancy.get('salary_to'):
         if vacancy.get('salary_from') and vacancy.get('salary_to'):
-            text += f"💰 <b>Maosh:</b> {vacancy['salary_from']:,} - {vacancy['salary_to']:,} so'm\n"
+            lines.append(f"💰 <b>Maosh:</b> {vacancy['salary_from']:,} - {vacancy['salary_to']:,} so'm")
         elif vacancy.get('salary_from'):
-            text += f"💰 <b>Maosh:</b> {vacancy['salary_from']:,} so'm dan\n"
+            lines.append(f"💰 <b>Maosh:</b> {vacancy['salary_from']:,} so'm dan")
         else:
-            text += f"💰 <b>Maosh:</b> {vacancy['salary_to']:,} so'm gacha\n"
+            lines.append(f"💰 <b>Maosh:</b> {vacancy['salary_to']:,} so'm gacha")
 
     if vacancy.get('work_schedule'):
-        text += f"📅 <b>Ish jadvali:</b> {vacancy['work_schedule']}\n"
+        lines.append(f"📅 <b>Ish jadvali:</b> {vacancy['work_schedule']}")
 
     if vacancy.get('experience_required'):
-        text += f"🎯 <b>Tajriba:</b> {vacancy['experience_required']}\n"
+        lines.append(f"🎯 <b>Tajriba:</b> {vacancy['experience_required']}")
 
-    text += f"📍 <b>Manzil:</b> {vacancy['address']}\n"
-    text += f"👤 <b>Ish beruvchi:</b> {vacancy.get('employer_name', 'Nomalum')}\n"
+    lines.append(f"📍 <b>Manzil:</b> {vacancy['address']}")
+    lines.append(f"👤 <b>Ish beruvchi:</b> {vacancy.get('employer_name', 'Nomalum')}")
 
     if vacancy.get('contact_name'):
-        text += f"📞 <b>Bog'lanish:</b> {vacancy['contact_name']}\n"
+        lines.append(f"📞 <b>Bog'lanish:</b> {vacancy['contact_name']}")
+
+    return "\n".join(lines) + "\n"
+
+
+def format_vacancy_text(vacancy: dict) -> str:
+    """Vakansiya matnini formatlash (kartochka keshdan, masofa oxirida qo'shiladi)"""
+    key = _card_key('card', vacancy)
+    text = vacancy_cards.get(key)
+    if text is None:
+        text = _render_vacancy_card(vacancy)
+        vacancy_cards.set(key, text)
 
     if vacancy.get('distance'):
         text += f"📏 <b>Masofa:</b> {vacancy['distance']:.1f} km\n"
@@ -70,6 +106,41 @@ def format_vacancy_text(vacancy: dict) -> str:
     return text
 
 
+def format_notification_text(vacancy: dict) -> str:
+    """Obunachilarga yuboriladigan xabar matni (vakansiya versiyasiga bir marta)"""
+    key = _card_key('notification', vacancy)
+    text = vacancy_cards.get(key)
+    if text is None:
+        text = (
+            f"🔔 <b>Yangi vakansiya!</b>\n\n"
+            f"📝 {vacancy['title']}\n"
+            f"📍 {vacancy['address']}\n"
+            f"💰 {vacancy.get('salary_from') or 'N/A'} so'm\n\n"
+            f"Ko'rish uchun: /start"
+        )
+        vacancy_cards.set(key, text)
+    return text
+
+
+def search_filters(data: dict) -> dict:
+    """FSM ma'lumotlaridagi qidiruv filtrlari (show_nearby_vacancies argumentlari)"""
+    salary_range = data.get('search_salary') or (None, None)
+    return {
+        'keyword': data.get('search_keyword'),
+        'salary_from': salary_range[0],
+        'salary_to': salary_range[1],
+    }
+
+
+def format_salary_range(salary_from: int = None, salary_to: int = None) -> str:
+    """Maosh filtri matni"""
+    if salary_from and salary_to:
+        return f"{salary_from:,} - {salary_to:,} so'm"
+    if salary_from:
+        return f"{salary_from:,} so'm dan"
+    return f"{salary_to:,} so'm gacha"
+
+
 def format_salary(salary_str: str) -> int:
     """Maosh stringini raqamga aylantirish"""
     if not salary_str:
@@ -113,7 +184,10 @@ async def search_jobs(message: Message, state: FSMContext):
 
     if user.get('latitude') and user.get('longitude'):
         # Foydalanuvchi lokatsiyasi mavjud
-        await show_nearby_vacancies(message, user['latitude'], user['longitude'])
+        data = await state.get_data()
+        await show_nearby_vacancies(message, user['latitude'], user['longitude'],
+                                    user_id=message.from_user.id,
+                                    **search_filters(data))
     else:
         # Lokatsiya so'rash
         await message.answer(
@@ -133,8 +207,12 @@ async def handle_search_location(message: Message, state: FSMContext):
         location.longitude
     )
 
-    await show_nearby_vacancies(message, location.latitude, location.longitude)
-    await state.clear()
+    data = await state.get_data()
+    await show_nearby_vacancies(message, location.latitude, location.longitude,
+                                user_id=message.from_user.id,
+                                **search_filters(data))
+    # Holat tugaydi, qidiruv filtrlari saqlanadi
+    await state.set_state(None)
 
 
 @router.message(F.text == "🏙️ Shahar tanlash")
@@ -160,23 +238,42 @@ async def handle_city_selection(callback: CallbackQuery, state: FSMContext):
     )
 
     await callback.message.edit_text(f"Tanlangan shahar: {city_name}")
-    await show_nearby_vacancies(callback.message, latitude, longitude)
-    await state.clear()
+    data = await state.get_data()
+    await show_nearby_vacancies(callback.message, latitude, longitude,
+                                user_id=callback.from_user.id,
+                                **search_filters(data))
+    await state.set_state(None)
 
 
 async def show_nearby_vacancies(message: Message, latitude: float, longitude: float,
-                                page: int = 0, salary_from: int = None):
-    """Yaqin vakansiyalarni ko'rsatish"""
-    offset = page * VACANCIES_PER_PAGE
-    vacancies = await db.get_nearby_vacancies(
+                                page: int = 0, salary_from: int = None,
+                                cursor: tuple = None, direction: str = 'n',
+                                total: int = None, user_id: int = None,
+                                keyword: str = None, salary_to: int = None):
+    """Yaqin vakansiyalarni ko'rsatish (keyset sahifalash)"""
+    vacancies, has_next, found = await db.get_nearby_page(
+        user_id or message.chat.id,
         latitude, longitude,
         radius_km=50,
         salary_from=salary_from,
-        offset=offset,
-        limit=VACANCIES_PER_PAGE
+        after=cursor if direction == 'n' else None,
+        before=cursor if direction == 'p' else None,
+        limit=VACANCIES_PER_PAGE,
+        keyword=keyword,
+        salary_to=salary_to
     )
+    if found is not None:
+        total = found
 
     if not vacancies:
+        if keyword or salary_from or salary_to:
+            await message.answer(
+                "❌ Tanlangan filtrlar bo'yicha yaqin vakansiya topilmadi.\n\n"
+                "Filtrlarni o'zgartiring yoki tozalang.",
+                reply_markup=filters_keyboard()
+            )
+            return
+
         await message.answer(
             "❌ Sizga yaqin hech qanday vakansiya topilmadi.\n\n"
             "Qidiruv radiusini kengaytiring yoki boshqa shaharni tanlang.",
@@ -184,23 +281,171 @@ async def show_nearby_vacancies(message: Message, latitude: float, longitude: fl
         )
         return
 
-    total_vacancies = len(vacancies) + offset
-    total_pages = (total_vacancies + VACANCIES_PER_PAGE - 1) // VACANCIES_PER_PAGE
+    # Snapshot keshi bo'lmasa - cheklangan COUNT (keyin callback ichida yuradi)
+    if total is None:
+        total = await db.count_nearby_vacancies(
+            latitude, longitude,
+            radius_km=50,
+            salary_from=salary_from,
+            cap=SEARCH_COUNT_CAP,
+            keyword=keyword,
+            salary_to=salary_to
+        )
+
+    total_pages = max(page + 1, (total + VACANCIES_PER_PAGE - 1) // VACANCIES_PER_PAGE)
+    total_text = f"{total}+" if total >= SEARCH_COUNT_CAP else str(total)
 
     text = f"🔍 <b>Sizga yaqin vakansiyalar</b>\n"
-    text += f"📍 Topildi: {len(vacancies)} ta\n"
+    if keyword:
+        text += f"🔎 Kalit so'z: {keyword}\n"
+    if salary_from or salary_to:
+        text += f"💰 Maosh: {format_salary_range(salary_from, salary_to)}\n"
+    text += f"📍 Topildi: {total_text} ta\n"
     text += f"📄 Sahifa: {page + 1}/{total_pages}\n\n"
 
+    keyboard = vacancies_list_keyboard(vacancies, page, total_pages, total, has_next)
     try:
-        await message.edit_text(
-            text,
-            reply_markup=vacancies_list_keyboard(vacancies, page, total_pages)
-        )
+        await message.edit_text(text, reply_markup=keyboard)
     except TelegramBadRequest:
+        await message.answer(text, reply_markup=keyboard)
+
+
+@router.callback_query(F.data.startswith("page:"))
+async def handle_page(callback: CallbackQuery, state: FSMContext):
+    """Qidiruv natijalari sahifasini almashtirish"""
+    parts = callback.data.split(":")
+    if len(parts) != 7:
+        # Eski formatdagi tugma (page:N) - kursor yo'q, qidiruv boshidan
+        await repeat_search(callback, state)
+        await callback.answer()
+        return
+
+    _, page, total, direction, is_promoted, distance, vacancy_id = parts
+    cursor = (is_promoted == '1', float(distance), int(vacancy_id))
+
+    user = await db.get_or_create_user(callback.from_user.id)
+    if not (user.get('latitude') and user.get('longitude')):
+        await callback.answer("📍 Avval lokatsiyangizni yuboring")
+        return
+
+    data = await state.get_data()
+    await show_nearby_vacancies(
+        callback.message, user['latitude'], user['longitude'],
+        page=int(page), cursor=cursor, direction=direction, total=int(total),
+        user_id=callback.from_user.id, **search_filters(data)
+    )
+    await callback.answer()
+
+
+@router.callback_query(F.data == "current_page")
+async def handle_current_page(callback: CallbackQuery):
+    """Joriy sahifa tugmasi"""
+    await callback.answer()
+
+
+# QIDIRUV FILTRLARI
+
+async def repeat_search(callback: CallbackQuery, state: FSMContext):
+    """Saqlangan filtrlar bilan qidiruvni birinchi sahifadan ko'rsatish"""
+    user = await db.get_or_create_user(callback.from_user.id)
+    if not (user.get('latitude') and user.get('longitude')):
+        await callback.message.answer(
+            "Sizga yaqin ishlarni topish uchun lokatsiyangizni yuboring:",
+            reply_markup=request_location_keyboard()
+        )
+        await state.set_state(SearchFilters.location)
+        return
+
+    data = await state.get_data()
+    await show_nearby_vacancies(callback.message, user['latitude'], user['longitude'],
+                                user_id=callback.from_user.id,
+                                **search_filters(data))
+
+
+@router.callback_query(F.data == "filters")
+async def show_filters(callback: CallbackQuery, state: FSMContext):
+    """Qidiruv filtrlari menyusi"""
+    filters = search_filters(await state.get_data())
+    text = "🔧 <b>Qidiruv filtrlari</b>\n\n"
+    if filters['keyword']:
+        text += f"🔎 Kalit so'z: {filters['keyword']}\n"
+    if filters['salary_from'] or filters['salary_to']:
+        text += f"💰 Maosh: {format_salary_range(filters['salary_from'], filters['salary_to'])}\n"
+    if not any(filters.values()):
+        text += "Filtrlar tanlanmagan\n"
+
+    await callback.message.edit_text(text, reply_markup=filters_keyboard())
+    await callback.answer()
+
+
+@router.callback_query(F.data == "filter_keyword")
+async def filter_keyword(callback: CallbackQuery, state: FSMContext):
+    """Kalit so'z filtrini so'rash"""
+    await callback.message.edit_text(
+        "🔎 Qidiruv uchun kalit so'zlarni yozing\n"
+        "(masalan: <i>sotuvchi</i>, <i>haydovchi</i>, <i>python</i>):"
+    )
+    await state.set_state(SearchFilters.keyword)
+    await callback.answer()
+
+
+@router.message(SearchFilters.keyword, F.text)
+async def handle_filter_keyword(message: Message, state: FSMContext):
+    """Kalit so'z filtrini saqlash va qidirish"""
+    keyword = normalize_query(message.text)
+    if not keyword:
+        await message.answer("❌ Kalit so'z harf yoki raqamlardan iborat bo'lishi kerak")
+        return
+
+    await state.update_data(search_keyword=keyword)
+    await state.set_state(None)
+
+    user = await db.get_or_create_user(message.from_user.id)
+    if not (user.get('latitude') and user.get('longitude')):
         await message.answer(
-            text,
-            reply_markup=vacancies_list_keyboard(vacancies, page, total_pages)
+            "Sizga yaqin ishlarni topish uchun lokatsiyangizni yuboring:",
+            reply_markup=request_location_keyboard()
         )
+        await state.set_state(SearchFilters.location)
+        return
+
+    await show_nearby_vacancies(message, user['latitude'], user['longitude'],
+                                user_id=message.from_user.id,
+                                **search_filters(await state.get_data()))
+
+
+@router.callback_query(F.data == "filter_salary")
+async def filter_salary(callback: CallbackQuery):
+    """Maosh filtrini tanlash"""
+    await callback.message.edit_text(
+        "💰 Maosh oralig'ini tanlang:",
+        reply_markup=salary_filter_keyboard()
+    )
+    await callback.answer()
+
+
+@router.callback_query(F.data.startswith("salary:"))
+async def handle_filter_salary(callback: CallbackQuery, state: FSMContext):
+    """Maosh filtrini saqlash va qidirish"""
+    _, salary_from, salary_to = callback.data.split(":")
+    await state.update_data(search_salary=[int(salary_from) or None, int(salary_to)])
+    await callback.answer()
+    await repeat_search(callback, state)
+
+
+@router.callback_query(F.data == "clear_filters")
+async def clear_filters(callback: CallbackQuery, state: FSMContext):
+    """Qidiruv filtrlarini tozalash"""
+    await state.update_data(search_keyword=None, search_salary=None)
+    await callback.answer("🗑️ Filtrlar tozalandi")
+    await repeat_search(callback, state)
+
+
+@router.callback_query(F.data == "back_to_search")
+async def back_to_search(callback: CallbackQuery, state: FSMContext):
+    """Qidiruv natijalariga qaytish"""
+    await callback.answer()
+    await repeat_search(callback, state)
 
 
 @router.callback_query(F.data.startswith("view_vacancy:"))
@@ -500,27 +745,21 @@ async def admin_approve_vacancy(callback: CallbackQuery):
     vacancy_id = int(callback.data.split(":")[1])
     await db.approve_vacancy(vacancy_id)
 
-    # Obunachilarga xabar yuborish
+    # Obunachilarga xabar yuborish - navbatga qo'yiladi, broadcaster yuboradi
     subscribers = await db.get_subscribers_for_vacancy(vacancy_id)
     vacancy = await db.get_vacancy(vacancy_id)
 
-    for subscriber in subscribers:
-        try:
-            await callback.bot.send_message(
-                subscriber['telegram_id'],
-                f"🔔 <b>Yangi vakansiya!</b>\n\n"
-                f"📝 {vacancy['title']}\n"
-                f"📍 {vacancy['address']}\n"
-                f"💰 {vacancy.get('salary_from', 'N/A')} so'm\n\n"
-                f"Ko'rish uchun: /start",
-                parse_mode="HTML"
-            )
-        except:
-            pass
+    if vacancy and subscribers:
+        await broadcaster.enqueue(
+            vacancy_id,
+            format_notification_text(vacancy),
+            [subscriber['telegram_id'] for subscriber in subscribers],
+            requested_by=callback.from_user.id
+        )
 
     await callback.message.edit_text(
         f"✅ Vakansiya tasdiqlandi!\n"
-        f"📢 {len(subscribers)} ta obunachiga xabar yuborildi."
+        f"📢 {len(subscribers)} ta obunachiga xabar navbatga qo'yildi."
     )
 
 
@@ -544,6 +783,7 @@ async def show_statistics(message: Message):
         return
 
     stats = await db.get_statistics()
+    delivery = await db.get_delivery_statistics()
 
     text = (
         "📊 <b>Bot statistikasi</b>\n\n"
@@ -551,12 +791,78 @@ async def show_statistics(message: Message):
         f"💼 Ish beruvchilar: {stats['total_employers']}\n"
         f"📋 Jami vakansiyalar: {stats['total_vacancies']}\n"
         f"✅ Faol vakansiyalar: {stats['active_vacancies']}\n"
-        f"⏳ Kutilayotgan: {stats['pending_vacancies']}\n"
+        f"⏳ Kutilayotgan: {stats['pending_vacancies']}\n\n"
+        f"📢 Yuborilgan xabarlar: {delivery['sent']}\n"
+        f"❌ Yuborilmagan: {delivery['failed']}\n"
+        f"🕒 Navbatda: {delivery['queued']}\n"
     )
 
     await message.answer(text)
 
 
+@router.message(Command("recount"))
+async def recount_statistics(message: Message):
+    """Statistika hisoblagichlarini qayta hisoblash (admin)"""
+    if message.from_user.id not in ADMIN_IDS:
+        return
+
+    stats = await db.recount_statistics()
+    await message.answer(
+        "🔄 <b>Statistika qayta hisoblandi</b>\n\n"
+        f"👥 Jami foydalanuvchilar: {stats['total_users']}\n"
+        f"💼 Ish beruvchilar: {stats['total_employers']}\n"
+        f"📋 Jami vakansiyalar: {stats['total_vacancies']}\n"
+        f"✅ Faol vakansiyalar: {stats['active_vacancies']}\n"
+        f"⏳ Kutilayotgan: {stats['pending_vacancies']}"
+    )
+
+
+@router.message(F.document, F.from_user.id.in_(ADMIN_IDS))
+async def admin_import_vacancies(message: Message):
+    """Vakansiyalarni CSV/JSON fayldan import qilish (admin).
+
+    Izohda ish beruvchining Telegram ID si ko'rsatilishi mumkin,
+    aks holda vakansiyalar adminning o'ziga yoziladi.
+    """
+    fmt = detect_format(message.document.file_name)
+    if fmt is None:
+        await message.answer("❌ Faqat .csv, .json yoki .jsonl fayllar qabul qilinadi")
+        return
+
+    employer_telegram_id = int(message.caption) if (message.caption or '').strip().isdigit() \
+        else message.from_user.id
+    user = await db.get_or_create_user(employer_telegram_id)
+    await db.set_user_as_employer(employer_telegram_id)
+
+    buffer = await message.bot.download(message.document)
+    stream = io.TextIOWrapper(buffer, encoding='utf-8-sig', newline='')
+    result = await import_vacancies(db, user['id'], stream, fmt, approve=True)
+
+    text = (
+        "📥 <b>Import yakunlandi</b>\n\n"
+        f"✅ Qo'shildi: {result['imported']}\n"
+        f"❌ Xato: {result['failed']}\n"
+    )
+    if result['errors']:
+        text += "\n" + "\n".join(html.escape(error) for error in result['errors'])
+
+    await message.answer(text)
+
+
+@router.message(Command("export"))
+async def admin_export_vacancies(message: Message):
+    """Faol vakansiyalarni CSV faylga eksport qilish (admin)"""
+    if message.from_user.id not in ADMIN_IDS:
+        return
+
+    output = io.BytesIO()
+    count = await export_vacancies(db, output)
+    await message.answer_document(
+        BufferedInputFile(output.getvalue(), filename="vacancies.csv"),
+        caption=f"📤 {count} ta faol vakansiya"
+    )
+
+
 # ORQAGA QAYTISH HANDERLARI
 
 @router.message(F.text == "◀️ Orqaga")
@@ -3,10 +3,32 @@ from aiogram.types import (
     InlineKeyboardButton
 )
 from aiogram.utils.keyboard import ReplyKeyboardBuilder, InlineKeyboardBuilder
+import datetime as _datetime
+from functools import lru_cache, wraps
+
+from .config import KEYBOARD_CACHE_SIZE
+
+# Kursor yordamchilari (`from src.keyboard import *` ga kirmaydi)
+_EPOCH = _datetime.datetime(1970, 1, 1)
+_MICROSECOND = _datetime.timedelta(microseconds=1)
+
+
+def prebuilt(builder):
+    """Statik klaviatura: import paytida bir marta quriladi.
+
+    Har chaqiruvda bitta umumiy markup qaytadi - uni o'zgartirmang.
+    """
+    markup = builder()
+
+    @wraps(builder)
+    def keyboard():
+        return markup
+    return keyboard
 
 
 # ASOSIY MENYULAR
 
+@prebuilt
 def main_menu_keyboard():
     """Asosiy menyu klaviaturasi"""
     kb = ReplyKeyboardBuilder()
@@ -18,6 +40,7 @@ def main_menu_keyboard():
     return kb.as_markup(resize_keyboard=True)
 
 
+@prebuilt
 def request_location_keyboard():
     """Lokatsiya so'rash klaviaturasi"""
     kb = ReplyKeyboardBuilder()
@@ -28,6 +51,7 @@ def request_location_keyboard():
     return kb.as_markup(resize_keyboard=True)
 
 
+@prebuilt
 def back_keyboard():
     """Orqaga qaytish klaviaturasi"""
     kb = ReplyKeyboardBuilder()
@@ -35,6 +59,7 @@ def back_keyboard():
     return kb.as_markup(resize_keyboard=True)
 
 
+@prebuilt
 def request_phone_keyboard():
     """Telefon raqami so'rash klaviaturasi"""
     kb = ReplyKeyboardBuilder()
@@ -46,6 +71,7 @@ def request_phone_keyboard():
 
 # INLINE KLAVIATURALAR
 
+@lru_cache(maxsize=KEYBOARD_CACHE_SIZE)
 def vacancy_actions_keyboard(vacancy_id: int, phone: str = None):
     """Vakansiya uchun amallar klaviaturasi"""
     kb = InlineKeyboardBuilder()
@@ -73,8 +99,29 @@ def vacancy_actions_keyboard(vacancy_id: int, phone: str = None):
     return kb.as_markup()
 
 
-def vacancies_list_keyboard(vacancies: list, page: int = 0, total_pages: int = 1):
-    """Vakansiyalar ro'yxati klaviaturasi"""
+def vacancy_cursor(vacancy: dict) -> str:
+    """Vakansiyadan sahifalash kursori: is_promoted:distance:id"""
+    return f"{int(bool(vacancy.get('is_promoted')))}:{float(vacancy['distance']):.6f}:{vacancy['id']}"
+
+
+def employer_cursor(vacancy: dict) -> str:
+    """Ish beruvchi ro'yxati kursori: created_at (mikrosoniya) va id"""
+    created_us = (vacancy['created_at'] - _EPOCH) // _MICROSECOND
+    return f"{created_us}:{vacancy['id']}"
+
+
+def parse_employer_cursor(created_us: str, vacancy_id: str) -> tuple:
+    """employer_cursor teskarisi: (created_at, id)"""
+    return _EPOCH + int(created_us) * _MICROSECOND, int(vacancy_id)
+
+
+def vacancies_list_keyboard(vacancies: list, page: int = 0, total_pages: int = 1,
+                            total: int = 0, has_next: bool = None):
+    """Vakansiyalar ro'yxati klaviaturasi.
+
+    Sahifalash tugmalari keyset kursorini saqlaydi:
+    page:<sahifa>:<jami>:<n|p>:<is_promoted>:<distance>:<id>
+    """
     kb = InlineKeyboardBuilder()
 
     # Vakansiyalar
@@ -84,33 +131,38 @@ def vacancies_list_keyboard(vacancies: list, page: int = 0, total_pages: int = 1
             callback_data=f"view_vacancy:{vacancy['id']}"
         ))
 
+    if has_next is None:
+        has_next = page < total_pages - 1
+
     # Sahifalash
     nav_buttons = []
-    if page > 0:
+    if page > 0 and vacancies:
         nav_buttons.append(InlineKeyboardButton(
-            text="⬅️", callback_data=f"page:{page - 1}"
+            text="⬅️",
+            callback_data=f"page:{page - 1}:{total}:p:{vacancy_cursor(vacancies[0])}"
         ))
 
     nav_buttons.append(InlineKeyboardButton(
         text=f"{page + 1}/{total_pages}", callback_data="current_page"
     ))
 
-    if page < total_pages - 1:
+    if has_next and vacancies:
         nav_buttons.append(InlineKeyboardButton(
-            text="➡️", callback_data=f"page:{page + 1}"
+            text="➡️",
+            callback_data=f"page:{page + 1}:{total}:n:{vacancy_cursor(vacancies[-1])}"
         ))
 
-    if nav_buttons:
-        kb.row(*nav_buttons)
+    kb.row(*nav_buttons)
 
     # Filtrlar va orqaga
     kb.add(InlineKeyboardButton(text="🔧 Filtrlar", callback_data="filters"))
     kb.add(InlineKeyboardButton(text="◀️ Orqaga", callback_data="back_to_main"))
 
-    kb.adjust(1, len(nav_buttons), 2)
+    kb.adjust(*([1] * len(vacancies)), len(nav_buttons), 2)
     return kb.as_markup()
 
 
+@prebuilt
 def filters_keyboard():
     """Filtrlar klaviaturasi"""
     kb = InlineKeyboardBuilder()
@@ -119,14 +171,16 @@ def filters_keyboard():
     kb.add(InlineKeyboardButton(text="📅 Ish jadvali", callback_data="filter_schedule"))
     kb.add(InlineKeyboardButton(text="🎯 Tajriba", callback_data="filter_experience"))
     kb.add(InlineKeyboardButton(text="📍 Masofani o'zgartirish", callback_data="filter_distance"))
+    kb.add(InlineKeyboardButton(text="🔎 Kalit so'z", callback_data="filter_keyword"))
 
     kb.add(InlineKeyboardButton(text="🗑️ Filtrlarni tozalash", callback_data="clear_filters"))
     kb.add(InlineKeyboardButton(text="◀️ Orqaga", callback_data="back_to_search"))
 
-    kb.adjust(2, 2, 1, 1)
+    kb.adjust(2, 2, 1, 1, 1)
     return kb.as_markup()
 
 
+@prebuilt
 def salary_filter_keyboard():
     """Maosh filtri klaviaturasi"""
     kb = InlineKeyboardBuilder()
@@ -146,6 +200,7 @@ def salary_filter_keyboard():
     return kb.as_markup()
 
 
+@prebuilt
 def work_schedule_keyboard():
     """Ish jadvali klaviaturasi"""
     kb = InlineKeyboardBuilder()
@@ -165,6 +220,7 @@ def work_schedule_keyboard():
     return kb.as_markup()
 
 
+@prebuilt
 def cities_keyboard():
     """Shaharlar klaviaturasi"""
     kb = InlineKeyboardBuilder()
@@ -188,6 +244,7 @@ def cities_keyboard():
 
 # ISH BERUVCHI KLAVIATURALARI
 
+@prebuilt
 def employer_menu_keyboard():
     """Ish beruvchi menyu klaviaturasi"""
     kb = ReplyKeyboardBuilder()
@@ -199,6 +256,30 @@ def employer_menu_keyboard():
     return kb.as_markup(resize_keyboard=True)
 
 
+def my_vacancies_keyboard(vacancies: list, page: int = 0, total_pages: int = 1,
+                          has_prev: bool = False, has_next: bool = False):
+    """Ish beruvchi vakansiyalari sahifalash klaviaturasi"""
+    kb = InlineKeyboardBuilder()
+    if has_prev and vacancies:
+        kb.add(InlineKeyboardButton(
+            text="⬅️",
+            callback_data=f"my_vacancies:{page - 1}:p:{employer_cursor(vacancies[0])}"
+        ))
+
+    kb.add(InlineKeyboardButton(
+        text=f"{page + 1}/{total_pages}", callback_data="current_page"
+    ))
+
+    if has_next and vacancies:
+        kb.add(InlineKeyboardButton(
+            text="➡️",
+            callback_data=f"my_vacancies:{page + 1}:n:{employer_cursor(vacancies[-1])}"
+        ))
+
+    return kb.as_markup()
+
+
+@prebuilt
 def vacancy_form_keyboard():
     """Vakansiya shakli klaviaturasi"""
     kb = ReplyKeyboardBuilder()
@@ -206,6 +287,7 @@ def vacancy_form_keyboard():
     return kb.as_markup(resize_keyboard=True)
 
 
+@lru_cache(maxsize=KEYBOARD_CACHE_SIZE)
 def promotion_keyboard(vacancy_id: int):
     """Reklama klaviaturasi"""
     kb = InlineKeyboardBuilder()
@@ -233,6 +315,7 @@ def promotion_keyboard(vacancy_id: int):
 
 # ADMIN KLAVIATURALARI
 
+@prebuilt
 def admin_menu_keyboard():
     """Admin menyu klaviaturasi"""
     kb = ReplyKeyboardBuilder()
@@ -245,6 +328,7 @@ def admin_menu_keyboard():
     return kb.as_markup(resize_keyboard=True)
 
 
+@lru_cache(maxsize=KEYBOARD_CACHE_SIZE)
 def admin_vacancy_actions(vacancy_id: int):
     """Admin vakansiya amallari"""
     kb = InlineKeyboardBuilder()
@@ -266,6 +350,7 @@ def admin_vacancy_actions(vacancy_id: int):
     return kb.as_markup()
 
 
+@lru_cache(maxsize=KEYBOARD_CACHE_SIZE)
 def confirm_keyboard(action: str, item_id: int):
     """Tasdiqlash klaviaturasi"""
     kb = InlineKeyboardBuilder()
@@ -285,6 +370,7 @@ def confirm_keyboard(action: str, item_id: int):
 
 # OBUNA KLAVIATURALARI
 
+@prebuilt
 def subscription_keyboard():
     """Obuna klaviaturasi"""
     kb = InlineKeyboardBuilder()
@@ -298,6 +384,7 @@ def subscription_keyboard():
     return kb.as_markup()
 
 
+@prebuilt
 def subscription_radius_keyboard():
     """Obuna radiusi klaviaturasi"""
     kb = InlineKeyboardBuilder()
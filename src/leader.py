@@ -0,0 +1,95 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable, Optional
+
+import asyncpg
+
+from .config import DATABASE_URL, LEADER_RETRY_INTERVAL
+
+logger = logging.getLogger(__name__)
+
+# Fon vazifalari (tarqatish, reklama muddati) qulfi - MIGRATIONS_LOCK_ID dan farqli
+LEADER_LOCK_ID = 7302
+
+
+class LeaderElection:
+    """Bir nechta instansiyadan faqat bittasida fon vazifalarini ishga tushirish.
+
+    Qulf (pg_try_advisory_lock) alohida ulanishda ushlab turiladi: instansiya
+    to'xtasa yoki ulanish uzilsa qulf bo'shaydi va keyingi urinishda boshqa
+    instansiya uni oladi.
+    """
+
+    def __init__(self, lock_id: int = LEADER_LOCK_ID,
+                 interval: float = LEADER_RETRY_INTERVAL):
+        self.lock_id = lock_id
+        self.interval = interval
+        self.is_leader = False
+        self._conn: Optional[asyncpg.Connection] = None
+        self._task: Optional[asyncio.Task] = None
+        self._on_elected: Optional[Callable[[], Awaitable]] = None
+        self._on_lost: Optional[Callable[[], Awaitable]] = None
+
+    async def start(self, on_elected: Callable[[], Awaitable],
+                    on_lost: Callable[[], Awaitable]):
+        """Qulf uchun kurashni boshlash: olinganda `on_elected`, yo'qotilganda `on_lost`"""
+        self._on_elected = on_elected
+        self._on_lost = on_lost
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """Fon vazifalarini to'xtatish va qulfni bo'shatish"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self._demote()
+        await self._close()
+
+    async def _demote(self):
+        if not self.is_leader:
+            return
+
+        self.is_leader = False
+        logger.info("👑 Fon vazifalari qulfi bo'shatildi")
+        await self._on_lost()
+
+    async def _close(self):
+        if self._conn is None:
+            return
+
+        conn, self._conn = self._conn, None
+        try:
+            await conn.close()
+        except Exception:
+            conn.terminate()
+
+    async def _run(self):
+        while True:
+            try:
+                if self._conn is None or self._conn.is_closed():
+                    # Ulanish uzilgan - qulf ham bo'shagan
+                    await self._demote()
+                    self._conn = await asyncpg.connect(DATABASE_URL)
+
+                if not self.is_leader:
+                    if await self._conn.fetchval("SELECT pg_try_advisory_lock($1)",
+                                                 self.lock_id):
+                        self.is_leader = True
+                        logger.info("👑 Fon vazifalari shu instansiyada ishlaydi")
+                        await self._on_elected()
+                else:
+                    # Ulanish tirikligini tekshirish
+                    await self._conn.fetchval("SELECT 1")
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("❌ Fon vazifalari qulfini tekshirishda xatolik")
+                await self._demote()
+                await self._close()
+
+            await asyncio.sleep(self.interval)
+
+
+# Global leader election instance
+leader = LeaderElection()
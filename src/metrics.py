@@ -0,0 +1,227 @@
+import bisect
+import logging
+import math
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from aiohttp import web
+
+from .config import METRICS_HOST, METRICS_PORT
+
+logger = logging.getLogger(__name__)
+
+# Kechikish gistogrammasi chegaralari (soniya)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Prometheus matn formati
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+Labels = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_labels(names: Sequence[str], values: Labels, extra: str = '') -> str:
+    pairs = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return '{%s}' % ','.join(pairs) if pairs else ''
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return '+Inf'
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = ''
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+
+    def _key(self, labels: Sequence) -> Labels:
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name}: {self.labelnames} yorliqlari kerak")
+        return tuple(str(label) for label in labels)
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}",
+                 f"# TYPE {self.name} {self.kind}"]
+        lines += self.samples()
+        return '\n'.join(lines)
+
+
+class Counter(_Metric):
+    """Faqat o'suvchi hisoblagich"""
+    kind = 'counter'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Labels, float] = {}
+
+    def inc(self, *labels, amount: float = 1.0):
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def samples(self) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+                for key, value in sorted(self._values.items())]
+
+
+class Gauge(_Metric):
+    """Joriy qiymat (masalan, bajarilayotgan so'rovlar soni)"""
+    kind = 'gauge'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._values: Dict[Labels, float] = {}
+
+    def inc(self, *labels, amount: float = 1.0):
+        key = self._key(labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, *labels, amount: float = 1.0):
+        self.inc(*labels, amount=-amount)
+
+    def set(self, value: float, *labels):
+        self._values[self._key(labels)] = value
+
+    def samples(self) -> List[str]:
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+                for key, value in sorted(self._values.items())]
+
+
+class Histogram(_Metric):
+    """Qiymatlar taqsimoti: kumulyativ bucketlar, yig'indi va soni"""
+    kind = 'histogram'
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+        # yorliqlar -> ([bucket sonlari], yig'indi)
+        self._values: Dict[Labels, Tuple[List[int], float]] = {}
+
+    def observe(self, value: float, *labels):
+        key = self._key(labels)
+        counts, total = self._values.get(key) or ([0] * len(self.buckets), 0.0)
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        self._values[key] = (counts, total + value)
+
+    def samples(self) -> List[str]:
+        lines = []
+        for key, (counts, total) in sorted(self._values.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                labels = _format_labels(self.labelnames, key,
+                                        f'le="{_format_value(bound)}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class MetricsRegistry:
+    """Jarayon metrikalari va ularning Prometheus matn formati"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+
+    def _register(self, metric: _Metric) -> _Metric:
+        if metric.name in self._metrics:
+            raise ValueError(f"{metric.name} metrikasi allaqachon mavjud")
+        self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str,
+                labelnames: Sequence[str] = ()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str,
+              labelnames: Sequence[str] = ()) -> Gauge:
+        return self._register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def render(self) -> str:
+        return '\n'.join(metric.render() for metric in self._metrics.values()) + '\n'
+
+
+# Global registry
+registry = MetricsRegistry()
+
+# Handlerlar (HandlerMetricsMiddleware)
+HANDLER_LATENCY = registry.histogram(
+    'bot_handler_duration_seconds', "Handler bajarilish vaqti", ('handler',)
+)
+HANDLER_ERRORS = registry.counter(
+    'bot_handler_errors_total', "Handlerda ko'tarilgan xatoliklar", ('handler', 'error')
+)
+HANDLER_IN_FLIGHT = registry.gauge(
+    'bot_handler_in_flight', "Hozir bajarilayotgan handlerlar", ('handler',)
+)
+
+# Ma'lumotlar bazasi (Database.acquire va PreparedConnection)
+DB_QUERY_LATENCY = registry.histogram(
+    'bot_db_query_duration_seconds', "So'rov bajarilish vaqti", ('query',)
+)
+DB_QUERY_ROWS = registry.counter(
+    'bot_db_query_rows_total', "So'rovlar qaytargan yoki o'zgartirgan qatorlar", ('query',)
+)
+DB_QUERY_ERRORS = registry.counter(
+    'bot_db_query_errors_total', "Xatolik bilan tugagan so'rovlar", ('query',)
+)
+DB_POOL_WAIT = registry.histogram(
+    'bot_db_pool_acquire_seconds', "Pooldan ulanish olishni kutish vaqti", ('query',),
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 5.0)
+)
+DB_POOL_IN_USE = registry.gauge(
+    'bot_db_pool_in_use', "Band qilingan pool ulanishlari"
+)
+
+
+class MetricsServer:
+    """Metrikalarni GET /metrics orqali Prometheus formatida berish"""
+
+    def __init__(self, metrics: MetricsRegistry):
+        self.registry = metrics
+        self._runner: Optional[web.AppRunner] = None
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        return web.Response(body=self.registry.render().encode('utf-8'),
+                            headers={'Content-Type': CONTENT_TYPE})
+
+    async def start(self, host: str = METRICS_HOST, port: int = METRICS_PORT):
+        """HTTP serverni ishga tushirish (port 0 - o'chirilgan)"""
+        if not port:
+            return
+
+        app = web.Application()
+        app.router.add_get('/metrics', self._handle)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, host=host, port=port).start()
+        logger.info("📈 Metrikalar http://%s:%d/metrics da", host, port)
+
+    async def stop(self):
+        """HTTP serverni to'xtatish"""
+        if self._runner is None:
+            return
+
+        await self._runner.cleanup()
+        self._runner = None
+
+
+# Global metrics server instance
+metrics_server = MetricsServer(registry)
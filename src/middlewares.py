@@ -0,0 +1,53 @@
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict
+
+from aiogram import BaseMiddleware
+from aiogram.types import TelegramObject
+
+from .metrics import HANDLER_ERRORS, HANDLER_IN_FLIGHT, HANDLER_LATENCY
+
+
+class ConcurrencyLimitMiddleware(BaseMiddleware):
+    """Bir vaqtda qayta ishlanayotgan updatelar sonini cheklash"""
+
+    def __init__(self, limit: int):
+        self._semaphore = asyncio.Semaphore(limit)
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any]
+    ) -> Any:
+        async with self._semaphore:
+            return await handler(event, data)
+
+
+class HandlerMetricsMiddleware(BaseMiddleware):
+    """Har bir handler uchun kechikish, xatoliklar va bajarilayotganlar soni.
+
+    Ichki (inner) middleware sifatida ulanadi - handler tanlangandan keyin
+    ishlaydi, shuning uchun data['handler'] orqali uning nomi ma'lum.
+    """
+
+    async def __call__(
+        self,
+        handler: Callable[[TelegramObject, Dict[str, Any]], Awaitable[Any]],
+        event: TelegramObject,
+        data: Dict[str, Any]
+    ) -> Any:
+        handler_object = data.get('handler')
+        name = getattr(getattr(handler_object, 'callback', None), '__name__',
+                       type(event).__name__)
+
+        HANDLER_IN_FLIGHT.inc(name)
+        started = time.perf_counter()
+        try:
+            return await handler(event, data)
+        except Exception as e:
+            HANDLER_ERRORS.inc(name, type(e).__name__)
+            raise
+        finally:
+            HANDLER_LATENCY.observe(time.perf_counter() - started, name)
+            HANDLER_IN_FLIGHT.dec(name)
@@ -0,0 +1,31 @@
+-- Radius qidiruvi uchun indekslar
+
+-- Faol va tasdiqlangan vakansiyalar bo'yicha lokatsiya oralig'ini skanerlash
+CREATE INDEX IF NOT EXISTS idx_vacancies_active_location
+    ON vacancies(is_active, is_approved, latitude, longitude);
+
+-- Faol obunalar markazlari bo'yicha
+CREATE INDEX IF NOT EXISTS idx_subscriptions_active_location
+    ON subscriptions(is_active, latitude, longitude);
+
+-- Yangi kompozit indekslar qoplaydigan eski indekslar
+DROP INDEX IF EXISTS idx_vacancies_location;
+DROP INDEX IF EXISTS idx_vacancies_active;
+DROP INDEX IF EXISTS idx_subscriptions_location;
+
+-- Masofani hisoblash funksiyasi: planner uchun IMMUTABLE SQL funksiya,
+-- bir xil nuqtalarda acos() chegaradan chiqmasligi uchun LEAST/GREATEST
+CREATE OR REPLACE FUNCTION calculate_distance(
+    lat1 DECIMAL, lon1 DECIMAL,
+    lat2 DECIMAL, lon2 DECIMAL
+) RETURNS DECIMAL AS $$
+    SELECT (
+        6371 * acos(LEAST(1.0, GREATEST(-1.0,
+            cos(radians(lat1)) *
+            cos(radians(lat2)) *
+            cos(radians(lon2) - radians(lon1)) +
+            sin(radians(lat1)) *
+            sin(radians(lat2))
+        )))
+    )::DECIMAL;
+$$ LANGUAGE sql IMMUTABLE;
@@ -0,0 +1,38 @@
+-- Obunachilarga xabar tarqatish navbati (outbox)
+
+-- Bitta tarqatish: matn bir marta saqlanadi
+CREATE TABLE IF NOT EXISTS broadcasts (
+    id SERIAL PRIMARY KEY,
+    vacancy_id INTEGER REFERENCES vacancies(id) ON DELETE CASCADE,
+    text TEXT NOT NULL,
+    requested_by BIGINT, -- natija yuboriladigan admin telegram_id
+    total INTEGER DEFAULT 0,
+    sent INTEGER DEFAULT 0,
+    failed INTEGER DEFAULT 0,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    finished_at TIMESTAMP
+);
+
+-- Har bir qabul qiluvchi uchun bitta qator
+CREATE TABLE IF NOT EXISTS notification_outbox (
+    id BIGSERIAL PRIMARY KEY,
+    broadcast_id INTEGER REFERENCES broadcasts(id) ON DELETE CASCADE,
+    chat_id BIGINT NOT NULL,
+    status VARCHAR(20) DEFAULT 'pending', -- pending, sending, sent, failed
+    attempts INTEGER DEFAULT 0,
+    next_attempt_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    last_error TEXT,
+    sent_at TIMESTAMP
+);
+
+-- Navbatdan olish: faqat yuborilmagan qatorlar
+CREATE INDEX IF NOT EXISTS idx_outbox_due
+    ON notification_outbox(next_attempt_at)
+    WHERE status IN ('pending', 'sending');
+
+CREATE INDEX IF NOT EXISTS idx_outbox_broadcast
+    ON notification_outbox(broadcast_id, status);
+
+CREATE INDEX IF NOT EXISTS idx_broadcasts_unfinished
+    ON broadcasts(id)
+    WHERE finished_at IS NULL;
@@ -0,0 +1,7 @@
+-- FSM (suhbat holati) ombori: bir nechta jarayon uchun umumiy
+CREATE TABLE IF NOT EXISTS fsm_storage (
+    key VARCHAR(255) PRIMARY KEY,
+    state VARCHAR(255),
+    data JSONB NOT NULL DEFAULT '{}'::jsonb,
+    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
@@ -0,0 +1,89 @@
+-- Statistika hisoblagichlari: triggerlar yozuv o'zgarganda yangilaydi,
+-- admin statistikasi COUNT(*) o'rniga bitta jadvalni o'qiydi
+CREATE TABLE IF NOT EXISTS stat_counters (
+    name VARCHAR(50) PRIMARY KEY,
+    value BIGINT NOT NULL DEFAULT 0
+);
+
+CREATE OR REPLACE FUNCTION bump_stat_counter(counter VARCHAR, delta BIGINT)
+RETURNS VOID AS $$
+    UPDATE stat_counters SET value = value + delta WHERE name = counter AND delta <> 0;
+$$ LANGUAGE sql;
+
+CREATE OR REPLACE FUNCTION users_stat_counters() RETURNS TRIGGER AS $$
+DECLARE
+    old_employer INT := 0;
+    new_employer INT := 0;
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') AND OLD.is_employer THEN
+        old_employer := 1;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') AND NEW.is_employer THEN
+        new_employer := 1;
+    END IF;
+
+    IF TG_OP = 'INSERT' THEN
+        PERFORM bump_stat_counter('total_users', 1);
+    ELSIF TG_OP = 'DELETE' THEN
+        PERFORM bump_stat_counter('total_users', -1);
+    END IF;
+    PERFORM bump_stat_counter('total_employers', new_employer - old_employer);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION vacancies_stat_counters() RETURNS TRIGGER AS $$
+DECLARE
+    old_active INT := 0;
+    new_active INT := 0;
+    old_pending INT := 0;
+    new_pending INT := 0;
+BEGIN
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        IF OLD.is_active AND OLD.is_approved THEN old_active := 1; END IF;
+        IF NOT OLD.is_approved THEN old_pending := 1; END IF;
+    END IF;
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        IF NEW.is_active AND NEW.is_approved THEN new_active := 1; END IF;
+        IF NOT NEW.is_approved THEN new_pending := 1; END IF;
+    END IF;
+
+    IF TG_OP = 'INSERT' THEN
+        PERFORM bump_stat_counter('total_vacancies', 1);
+    ELSIF TG_OP = 'DELETE' THEN
+        PERFORM bump_stat_counter('total_vacancies', -1);
+    END IF;
+    PERFORM bump_stat_counter('active_vacancies', new_active - old_active);
+    PERFORM bump_stat_counter('pending_vacancies', new_pending - old_pending);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_users_stat_counters ON users;
+CREATE TRIGGER trg_users_stat_counters
+    AFTER INSERT OR DELETE OR UPDATE OF is_employer ON users
+    FOR EACH ROW EXECUTE FUNCTION users_stat_counters();
+
+DROP TRIGGER IF EXISTS trg_vacancies_stat_counters ON vacancies;
+CREATE TRIGGER trg_vacancies_stat_counters
+    AFTER INSERT OR DELETE OR UPDATE OF is_active, is_approved ON vacancies
+    FOR EACH ROW EXECUTE FUNCTION vacancies_stat_counters();
+
+-- To'liq qayta hisoblash: migratsiyada va admin buyrug'i bilan (farq tuzatiladi)
+CREATE OR REPLACE FUNCTION recount_stat_counters() RETURNS VOID AS $$
+    LOCK TABLE users, vacancies IN SHARE MODE;
+    INSERT INTO stat_counters (name, value)
+    SELECT 'total_users', COUNT(*) FROM users
+    UNION ALL
+    SELECT 'total_employers', COUNT(*) FROM users WHERE is_employer = TRUE
+    UNION ALL
+    SELECT 'total_vacancies', COUNT(*) FROM vacancies
+    UNION ALL
+    SELECT 'active_vacancies', COUNT(*) FROM vacancies
+        WHERE is_active = TRUE AND is_approved = TRUE
+    UNION ALL
+    SELECT 'pending_vacancies', COUNT(*) FROM vacancies WHERE is_approved = FALSE
+    ON CONFLICT (name) DO UPDATE SET value = EXCLUDED.value;
+$$ LANGUAGE sql;
+
+SELECT recount_stat_counters();
@@ -0,0 +1,9 @@
+-- Ish beruvchi statistikasi uchun indekslar
+
+-- Ish beruvchining vakansiyalarini holat bo'yicha sanash
+CREATE INDEX IF NOT EXISTS idx_vacancies_employer_status
+    ON vacancies(employer_id, is_active, is_approved);
+
+-- Ish beruvchining yakunlangan to'lovlari yig'indisi
+CREATE INDEX IF NOT EXISTS idx_payments_user_completed
+    ON payments(user_id) WHERE status = 'completed';
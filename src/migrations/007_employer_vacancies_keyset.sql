@@ -0,0 +1,3 @@
+-- "Mening vakansiyalarim" sahifalash: (created_at, id) bo'yicha keyset
+CREATE INDEX IF NOT EXISTS idx_vacancies_employer_created
+    ON vacancies(employer_id, created_at DESC, id DESC);
@@ -0,0 +1,3 @@
+-- Muddati o'tgan reklamalarni topish: faqat reklama qilinganlar indekslanadi
+CREATE INDEX IF NOT EXISTS idx_vacancies_promotion_expires
+    ON vacancies(promotion_expires_at) WHERE is_promoted = TRUE;
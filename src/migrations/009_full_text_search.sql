@@ -0,0 +1,20 @@
+-- Vakansiyalar bo'yicha to'liq matnli qidiruv ('simple' - o'zbek/rus so'zlari o'zgarmaydi)
+
+-- Sarlavha va tavsif hujjati: indeks va so'rovlar bir xil ifodani ishlatadi
+CREATE OR REPLACE FUNCTION vacancy_document(title TEXT, description TEXT)
+RETURNS tsvector AS $$
+    SELECT setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+           setweight(to_tsvector('simple', coalesce(description, '')), 'B');
+$$ LANGUAGE sql IMMUTABLE;
+
+-- Faqat qidiruvda ko'rinadigan vakansiyalar indekslanadi
+CREATE INDEX IF NOT EXISTS idx_vacancies_document
+    ON vacancies USING GIN (vacancy_document(title, description))
+    WHERE is_active = TRUE AND is_approved = TRUE;
+
+-- Obuna kalit so'zlari: vakansiya so'zlari bilan kesishma (&&) orqali moslanadi
+ALTER TABLE subscriptions ADD COLUMN IF NOT EXISTS keyword_tokens TEXT[]
+    GENERATED ALWAYS AS (tsvector_to_array(to_tsvector('simple', coalesce(keywords, '')))) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_subscriptions_keyword_tokens
+    ON subscriptions USING GIN (keyword_tokens);
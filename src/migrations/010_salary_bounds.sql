@@ -0,0 +1,14 @@
+-- Maosh filtri uchun normallashtirilgan chegaralar (indekslanadigan, OR siz):
+-- salary_max - eng yuqori maosh (noma'lum bo'lsa 0),
+-- salary_min - eng past maosh (noma'lum bo'lsa INT maksimumi)
+ALTER TABLE vacancies ADD COLUMN IF NOT EXISTS salary_max INTEGER
+    GENERATED ALWAYS AS (COALESCE(GREATEST(salary_from, salary_to), 0)) STORED;
+
+ALTER TABLE vacancies ADD COLUMN IF NOT EXISTS salary_min INTEGER
+    GENERATED ALWAYS AS (COALESCE(LEAST(salary_from, salary_to), 2147483647)) STORED;
+
+CREATE INDEX IF NOT EXISTS idx_vacancies_salary_max
+    ON vacancies(salary_max) WHERE is_active = TRUE AND is_approved = TRUE;
+
+CREATE INDEX IF NOT EXISTS idx_vacancies_salary_min
+    ON vacancies(salary_min) WHERE is_active = TRUE AND is_approved = TRUE;
@@ -0,0 +1,16 @@
+-- Vakansiya matni o'zgarganda updated_at yangilanadi: tayyor kartochkalar
+-- keshi (id, updated_at) bo'yicha, shuning uchun eski matn qayta ishlatilmaydi.
+-- Holat ustunlari (is_approved, is_promoted, ...) kartochkaga kirmaydi.
+CREATE OR REPLACE FUNCTION touch_vacancy_updated_at() RETURNS TRIGGER AS $$
+BEGIN
+    NEW.updated_at := CURRENT_TIMESTAMP;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_vacancies_updated_at ON vacancies;
+CREATE TRIGGER trg_vacancies_updated_at
+    BEFORE UPDATE OF title, description, salary_from, salary_to, work_schedule,
+                     experience_required, address, contact_name
+    ON vacancies
+    FOR EACH ROW EXECUTE FUNCTION touch_vacancy_updated_at();
@@ -0,0 +1,113 @@
+-- Statistika hisoblagichlari har bir qator uchun emas, har bir so'rov uchun
+-- bir marta yangilanadi: o'zgargan qatorlar (transition table) yig'ilib,
+-- har bir hisoblagichga bitta delta qo'shiladi. COPY bilan minglab qator
+-- import qilinganda ham stat_counters qatorlari bir marta yangilanadi.
+--
+-- Transition table'li triggerda bitta hodisa va ustunlar ro'yxatisiz bo'lishi
+-- kerak - shuning uchun INSERT, UPDATE va DELETE uchun alohida triggerlar.
+DROP TRIGGER IF EXISTS trg_users_stat_counters ON users;
+DROP TRIGGER IF EXISTS trg_vacancies_stat_counters ON vacancies;
+
+CREATE OR REPLACE FUNCTION users_stat_counters() RETURNS TRIGGER AS $$
+DECLARE
+    total_delta BIGINT := 0;
+    employer_delta BIGINT := 0;
+    total_count BIGINT;
+    employer_count BIGINT;
+BEGIN
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        SELECT COUNT(*), COUNT(*) FILTER (WHERE is_employer)
+        INTO total_count, employer_count
+        FROM new_rows;
+        total_delta := total_delta + total_count;
+        employer_delta := employer_delta + employer_count;
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        SELECT COUNT(*), COUNT(*) FILTER (WHERE is_employer)
+        INTO total_count, employer_count
+        FROM old_rows;
+        total_delta := total_delta - total_count;
+        employer_delta := employer_delta - employer_count;
+    END IF;
+
+    PERFORM bump_stat_counter('total_users', total_delta);
+    PERFORM bump_stat_counter('total_employers', employer_delta);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION vacancies_stat_counters() RETURNS TRIGGER AS $$
+DECLARE
+    total_delta BIGINT := 0;
+    active_delta BIGINT := 0;
+    pending_delta BIGINT := 0;
+    total_count BIGINT;
+    active_count BIGINT;
+    pending_count BIGINT;
+BEGIN
+    IF TG_OP IN ('INSERT', 'UPDATE') THEN
+        SELECT COUNT(*),
+               COUNT(*) FILTER (WHERE is_active AND is_approved),
+               COUNT(*) FILTER (WHERE NOT is_approved)
+        INTO total_count, active_count, pending_count
+        FROM new_rows;
+        total_delta := total_delta + total_count;
+        active_delta := active_delta + active_count;
+        pending_delta := pending_delta + pending_count;
+    END IF;
+    IF TG_OP IN ('UPDATE', 'DELETE') THEN
+        SELECT COUNT(*),
+               COUNT(*) FILTER (WHERE is_active AND is_approved),
+               COUNT(*) FILTER (WHERE NOT is_approved)
+        INTO total_count, active_count, pending_count
+        FROM old_rows;
+        total_delta := total_delta - total_count;
+        active_delta := active_delta - active_count;
+        pending_delta := pending_delta - pending_count;
+    END IF;
+
+    -- UPDATE da total_delta doim 0, o'zgarmagan hisoblagichlar yangilanmaydi
+    PERFORM bump_stat_counter('total_vacancies', total_delta);
+    PERFORM bump_stat_counter('active_vacancies', active_delta);
+    PERFORM bump_stat_counter('pending_vacancies', pending_delta);
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trg_users_stat_counters_insert ON users;
+CREATE TRIGGER trg_users_stat_counters_insert
+    AFTER INSERT ON users
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION users_stat_counters();
+
+DROP TRIGGER IF EXISTS trg_users_stat_counters_update ON users;
+CREATE TRIGGER trg_users_stat_counters_update
+    AFTER UPDATE ON users
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION users_stat_counters();
+
+DROP TRIGGER IF EXISTS trg_users_stat_counters_delete ON users;
+CREATE TRIGGER trg_users_stat_counters_delete
+    AFTER DELETE ON users
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION users_stat_counters();
+
+DROP TRIGGER IF EXISTS trg_vacancies_stat_counters_insert ON vacancies;
+CREATE TRIGGER trg_vacancies_stat_counters_insert
+    AFTER INSERT ON vacancies
+    REFERENCING NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION vacancies_stat_counters();
+
+DROP TRIGGER IF EXISTS trg_vacancies_stat_counters_update ON vacancies;
+CREATE TRIGGER trg_vacancies_stat_counters_update
+    AFTER UPDATE ON vacancies
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION vacancies_stat_counters();
+
+DROP TRIGGER IF EXISTS trg_vacancies_stat_counters_delete ON vacancies;
+CREATE TRIGGER trg_vacancies_stat_counters_delete
+    AFTER DELETE ON vacancies
+    REFERENCING OLD TABLE AS old_rows
+    FOR EACH STATEMENT EXECUTE FUNCTION vacancies_stat_counters();
+
+SELECT recount_stat_counters();
@@ -0,0 +1,177 @@
+# Tez-tez bajariladigan so'rovlar reyestri.
+# Har bir ulanishda birinchi chaqiruvda tayyorlanadi va asyncpg statement
+# keshida saqlanadi, keyingi chaqiruvlarda parse/plan bosqichi o'tkazib
+# yuboriladi. Matnlar o'zgarmas (kesh kaliti - matn):
+# ixtiyoriy filtrlar NULL parametr orqali beriladi.
+
+# Radius qidiruvi: $1, $2 - markaz, $3 - radius, $4..$7 - to'rtburchak,
+# $8, $10 - maosh oralig'i (salary_max >= $8, salary_min <= $10),
+# $9 - kalit so'zlar (NULL - filtrsiz)
+_NEARBY_DISTANCE = """
+    CROSS JOIN LATERAL (
+        SELECT round(calculate_distance(v.latitude, v.longitude, $1, $2), 6) AS distance
+    ) d
+"""
+
+_NEARBY_CONDITIONS = """
+    WHERE v.is_active = TRUE AND v.is_approved = TRUE
+    AND v.latitude BETWEEN $4 AND $5
+    AND v.longitude BETWEEN $6 AND $7
+    AND d.distance <= $3
+    AND v.salary_max >= COALESCE($8::int, 0)
+    AND v.salary_min <= COALESCE($10::int, 2147483647)
+    AND ($9::text IS NULL
+         OR vacancy_document(v.title, v.description) @@ plainto_tsquery('simple', $9))
+"""
+
+_NEARBY_ROWS = """
+    SELECT v.*, u.first_name as employer_name, u.username as employer_username,
+           d.distance
+    FROM vacancies v
+    JOIN users u ON v.employer_id = u.id
+""" + _NEARBY_DISTANCE + _NEARBY_CONDITIONS
+
+# Vakansiyaga mos obunalar: joylashuv, radius va maosh sharti
+_SUBSCRIBERS_ROWS = """
+    SELECT s.*, u.telegram_id
+    FROM subscriptions s
+    JOIN users u ON s.user_id = u.id
+    WHERE s.is_active = TRUE
+    AND s.latitude BETWEEN $4 AND $5
+    AND s.longitude BETWEEN $6 AND $7
+    AND calculate_distance(s.latitude, s.longitude, $1, $2) <= s.radius_km
+    AND (s.salary_from IS NULL OR $3 >= s.salary_from)
+"""
+
+STATEMENTS = {
+    'get_user': """
+        SELECT * FROM users WHERE telegram_id = $1
+    """,
+
+    # Avval SELECT: mavjud foydalanuvchi uchun INSERT umuman bajarilmaydi va
+    # users.id ketma-ketligi (nextval) behuda sarflanmaydi. ON CONFLICT faqat
+    # parallel tranzaksiya shu paytda qo'shgan holat uchun (unda natija bo'sh)
+    'upsert_user': """
+        WITH existing AS (
+            SELECT * FROM users WHERE telegram_id = $1
+        ), inserted AS (
+            INSERT INTO users (telegram_id, username, first_name)
+            SELECT $1, $2, $3
+            WHERE NOT EXISTS (SELECT 1 FROM existing)
+            ON CONFLICT (telegram_id) DO NOTHING
+            RETURNING *
+        )
+        SELECT * FROM existing
+        UNION ALL
+        SELECT * FROM inserted
+        LIMIT 1
+    """,
+
+    'get_vacancy': """
+        SELECT v.*, u.first_name as employer_name, u.username as employer_username
+        FROM vacancies v
+        JOIN users u ON v.employer_id = u.id
+        WHERE v.id = $1
+    """,
+
+    'vacancies_by_ids': """
+        SELECT v.*, u.first_name as employer_name, u.username as employer_username
+        FROM vacancies v
+        JOIN users u ON v.employer_id = u.id
+        WHERE v.id = ANY($1::int[])
+        AND v.is_active = TRUE AND v.is_approved = TRUE
+    """,
+
+    # Keyset: $11..$13 - kursor (is_promoted, distance, id), NULL - birinchi sahifa
+    'nearby_after': _NEARBY_ROWS + """
+        AND ($11::boolean IS NULL
+             OR (NOT v.is_promoted, d.distance, v.id) > (NOT $11::boolean, $12::numeric, $13::int))
+        ORDER BY NOT v.is_promoted, d.distance, v.id
+        LIMIT $14
+    """,
+
+    'nearby_before': _NEARBY_ROWS + """
+        AND (NOT v.is_promoted, d.distance, v.id) < (NOT $11::boolean, $12::numeric, $13::int)
+        ORDER BY NOT v.is_promoted DESC, d.distance DESC, v.id DESC
+        LIMIT $14
+    """,
+
+    'nearby_snapshot': """
+        SELECT v.is_promoted, d.distance, v.id
+        FROM vacancies v
+    """ + _NEARBY_DISTANCE + _NEARBY_CONDITIONS + """
+        ORDER BY NOT v.is_promoted, d.distance, v.id
+        LIMIT $11
+    """,
+
+    'nearby_count': """
+        SELECT COUNT(*) FROM (
+            SELECT 1
+            FROM vacancies v
+    """ + _NEARBY_DISTANCE + _NEARBY_CONDITIONS + """
+            LIMIT $11
+        ) s
+    """,
+
+    # Grid indeks uchun: kalit so'zlarga mos faol vakansiyalar
+    'vacancy_ids_matching': """
+        SELECT id FROM vacancies
+        WHERE is_active = TRUE AND is_approved = TRUE
+        AND vacancy_document(title, description) @@ plainto_tsquery('simple', $1)
+    """,
+
+    # $1, $2 - vakansiya nuqtasi, $3 - eng yuqori maosh, $4..$7 - to'rtburchak,
+    # $8, $9 - vakansiya sarlavhasi va tavsifi (obuna kalit so'zlari uchun).
+    # Kalit so'zsiz va kalit so'zli obunalar alohida tarmoqlarda: ikkinchisi
+    # idx_subscriptions_keyword_tokens (GIN, &&) orqali tanlanadi.
+    # Obuna kalit so'zlari muqobil kasblar ("sotuvchi, kassir") - birortasi mos
+    # kelsa yetarli (&&). Qidiruvdagi kalit so'z esa natijani toraytiradi -
+    # barcha so'zlar kerak (plainto_tsquery)
+    'subscribers_for_vacancy': _SUBSCRIBERS_ROWS + """
+        AND cardinality(s.keyword_tokens) = 0
+        UNION ALL
+    """ + _SUBSCRIBERS_ROWS + """
+        AND s.keyword_tokens && (SELECT tsvector_to_array(vacancy_document($8, $9)))
+    """,
+
+    # Ish beruvchi statistikasi: bitta vakansiyalar skani + to'lovlar yig'indisi
+    'employer_stats': """
+        SELECT COUNT(*) AS total_vacancies,
+               COUNT(*) FILTER (WHERE is_active = TRUE AND is_approved = TRUE)
+                   AS active_vacancies,
+               COUNT(*) FILTER (WHERE is_approved = FALSE) AS pending_vacancies,
+               COUNT(*) FILTER (WHERE is_promoted = TRUE) AS promoted_vacancies,
+               (SELECT COALESCE(SUM(amount), 0) FROM payments
+                WHERE user_id = $1 AND status = 'completed') AS total_spent
+        FROM vacancies
+        WHERE employer_id = $1
+    """,
+
+    # Ish beruvchi vakansiyalari: (created_at, id) kursori, yangilari birinchi.
+    # $2, $3 - kursor (NULL - birinchi sahifa), $4 - limit
+    'employer_vacancies_after': """
+        SELECT id, title, created_at, is_active, is_approved, is_promoted, promotion_type
+        FROM vacancies
+        WHERE employer_id = $1
+        AND ($2::timestamp IS NULL OR (created_at, id) < ($2::timestamp, $3::int))
+        ORDER BY created_at DESC, id DESC
+        LIMIT $4
+    """,
+
+    'employer_vacancies_before': """
+        SELECT id, title, created_at, is_active, is_approved, is_promoted, promotion_type
+        FROM vacancies
+        WHERE employer_id = $1
+        AND (created_at, id) > ($2::timestamp, $3::int)
+        ORDER BY created_at, id
+        LIMIT $4
+    """,
+
+    'stat_counters': """
+        SELECT name, value FROM stat_counters
+    """,
+
+    'fsm_get': """
+        SELECT state, data FROM fsm_storage WHERE key = $1
+    """,
+}
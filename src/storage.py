@@ -0,0 +1,162 @@
+import asyncio
+import json
+import logging
+from typing import Any, Dict, Optional, Tuple
+
+from aiogram.fsm.state import State
+from aiogram.fsm.storage.base import BaseStorage, DefaultKeyBuilder, KeyBuilder, StateType, StorageKey
+
+from .config import FSM_FLUSH_INTERVAL
+from .db import Database
+
+logger = logging.getLogger(__name__)
+
+
+class PostgresStorage(BaseStorage):
+    """FSM holatlarini asyncpg pool orqali Postgresda saqlash.
+
+    Yozuvlar darhol bazaga yuborilmaydi: kalit bo'yicha buferda
+    birlashtiriladi va har FSM_FLUSH_INTERVAL soniyada bitta so'rov bilan
+    yoziladi. Shu oraliqda o'qishlar buferdan (yoki yozilayotgan partiyadan)
+    olinadi.
+
+    Bufer jarayon ichida: boshqa instansiyalar (webhook load balancer
+    ortida) holatni FSM_FLUSH_INTERVAL gacha kechikib ko'radi. Bitta
+    foydalanuvchi updatelari bitta instansiyaga yo'naltirilishi kerak
+    ('sharded' rejimi buni o'zi ta'minlaydi).
+    """
+
+    def __init__(self, database: Database, key_builder: KeyBuilder = None,
+                 flush_interval: float = FSM_FLUSH_INTERVAL):
+        self.db = database
+        self.key_builder = key_builder or DefaultKeyBuilder(with_destiny=True)
+        self.flush_interval = flush_interval
+        # key -> (state, data) - hali yozilmagan yozuvlar
+        self._dirty: Dict[str, Tuple[Optional[str], Dict[str, Any]]] = {}
+        # Hozir bazaga yozilayotgan partiya (tranzaksiya tugaguncha)
+        self._inflight: Dict[str, Tuple[Optional[str], Dict[str, Any]]] = {}
+        # Har bir tugagan flush'da oshadi - o'qish paytida yozuv bo'lganini bilish uchun
+        self._flushes = 0
+        self._flush_lock = asyncio.Lock()
+        self._flusher: Optional[asyncio.Task] = None
+        self._closed = False
+
+    def _buffered(self, key: str) -> Optional[Tuple[Optional[str], Dict[str, Any]]]:
+        record = self._dirty.get(key)
+        if record is None:
+            record = self._inflight.get(key)
+        return record
+
+    async def _load(self, key: str) -> Tuple[Optional[str], Dict[str, Any]]:
+        while True:
+            record = self._buffered(key)
+            if record is not None:
+                return record
+
+            flushes = self._flushes
+            async with self.db.acquire('fsm_get') as conn:
+                row = await conn.fetchrow_statement('fsm_get', key)
+
+            # Kutish paytida boshqa coroutine yozgan bo'lishi mumkin
+            record = self._buffered(key)
+            if record is not None:
+                return record
+            if flushes == self._flushes:
+                break
+            # Shu paytda flush tugadi - qator eskirgan bo'lishi mumkin, qayta o'qiymiz
+
+        if row is None:
+            return None, {}
+        return row['state'], json.loads(row['data'])
+
+    async def _write(self, key: str, state: Optional[str], data: Dict[str, Any]):
+        self._dirty[key] = (state, data)
+        self._schedule_flush()
+
+    def _schedule_flush(self):
+        """Buferda yozuv bo'lsa, FSM_FLUSH_INTERVAL dan keyin flush rejalashtirish"""
+        if self._closed or not self._dirty:
+            return
+        # Ishlayotgan flusher o'z partiyasini yozib bo'lgan - yangilarini olmaydi
+        if (self._flusher is None or self._flusher.done()
+                or self._flusher is asyncio.current_task()):
+            self._flusher = asyncio.create_task(self._flush_later())
+
+    async def _flush_later(self):
+        await asyncio.sleep(self.flush_interval)
+        try:
+            await self.flush()
+        except Exception:
+            logger.exception("❌ FSM holatlarini saqlashda xatolik")
+
+    async def flush(self):
+        """Buferdagi barcha yozuvlarni bazaga yozish.
+
+        Tugagach (xatolik bo'lsa ham) buferda qolgan yozuvlar uchun keyingi
+        flush rejalashtiriladi.
+        """
+        async with self._flush_lock:
+            if not self._dirty:
+                return
+
+            self._inflight, self._dirty = self._dirty, {}
+            try:
+                await self._write_batch(self._inflight)
+            except BaseException:
+                # Yozilmagan yozuvlarni qaytarish (yangilari ustun)
+                for key, record in self._inflight.items():
+                    self._dirty.setdefault(key, record)
+                raise
+            finally:
+                self._inflight = {}
+                self._flushes += 1
+                self._schedule_flush()
+
+    async def _write_batch(self, records: Dict[str, Tuple[Optional[str], Dict[str, Any]]]):
+        upserts = [(key, state, json.dumps(data, ensure_ascii=False))
+                   for key, (state, data) in records.items() if state is not None or data]
+        deletes = [key for key, (state, data) in records.items() if state is None and not data]
+
+        async with self.db.acquire('fsm_flush') as conn:
+            async with conn.transaction():
+                if upserts:
+                    keys, states, datas = zip(*upserts)
+                    await conn.execute(
+                        """INSERT INTO fsm_storage (key, state, data, updated_at)
+                           SELECT k, s, d, CURRENT_TIMESTAMP
+                           FROM unnest($1::varchar[], $2::varchar[], $3::jsonb[]) AS t(k, s, d)
+                           ON CONFLICT (key) DO UPDATE
+                           SET state = EXCLUDED.state, data = EXCLUDED.data,
+                               updated_at = CURRENT_TIMESTAMP""",
+                        list(keys), list(states), list(datas)
+                    )
+                if deletes:
+                    await conn.execute(
+                        "DELETE FROM fsm_storage WHERE key = ANY($1::varchar[])",
+                        deletes
+                    )
+
+    async def set_state(self, key: StorageKey, state: StateType = None) -> None:
+        storage_key = self.key_builder.build(key)
+        _, data = await self._load(storage_key)
+        await self._write(storage_key, state.state if isinstance(state, State) else state, data)
+
+    async def get_state(self, key: StorageKey) -> Optional[str]:
+        state, _ = await self._load(self.key_builder.build(key))
+        return state
+
+    async def set_data(self, key: StorageKey, data: Dict[str, Any]) -> None:
+        storage_key = self.key_builder.build(key)
+        state, _ = await self._load(storage_key)
+        await self._write(storage_key, state, data.copy())
+
+    async def get_data(self, key: StorageKey) -> Dict[str, Any]:
+        _, data = await self._load(self.key_builder.build(key))
+        return data.copy()
+
+    async def close(self) -> None:
+        self._closed = True
+        if self._flusher is not None and not self._flusher.done():
+            self._flusher.cancel()
+            await asyncio.gather(self._flusher, return_exceptions=True)
+        await self.flush()
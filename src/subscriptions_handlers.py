@@ -6,6 +6,7 @@ from aiogram.fsm.state import State, StatesGroup
 
 from src.db import db
 from src.keyboard import *
+from src.text_search import normalize_query
 
 subscription_router = Router()
 
@@ -14,6 +15,7 @@ class SubscriptionForm(StatesGroup):
     location = State()
     radius = State()
     salary_from = State()
+    keywords = State()
 
 
 @subscription_router.message(F.text == "📍 Mening obunalarim")
@@ -101,7 +103,27 @@ async def subscription_salary(message: Message, state: FSMContext):
         except ValueError:
             salary_from = None
 
+    await state.update_data(salary_from=salary_from)
+
+    await message.answer(
+        "🔍 Qaysi kasblar qiziqtiradi? Kalit so'zlarni yozing\n"
+        "(masalan: <i>sotuvchi, kassir</i> - birortasi bo'lsa xabar keladi).\n\n"
+        "Hamma vakansiyalar haqida xabar olish uchun 'yo'q' deb yozing:"
+    )
+    await state.set_state(SubscriptionForm.keywords)
+
+
+@subscription_router.message(SubscriptionForm.keywords, F.text)
+async def subscription_keywords(message: Message, state: FSMContext):
+    """Obuna kalit so'zlari"""
+    keywords_text = message.text.lower().strip()
+    keywords = None
+
+    if keywords_text not in ['yoq', "yo'q", 'kerak emas', 'muhim emas']:
+        keywords = normalize_query(message.text)
+
     data = await state.get_data()
+    salary_from = data.get('salary_from')
     user = await db.get_or_create_user(message.from_user.id)
 
     # Obuna yaratish
@@ -110,7 +132,8 @@ async def subscription_salary(message: Message, state: FSMContext):
         latitude=data['latitude'],
         longitude=data['longitude'],
         radius_km=data['radius_km'],
-        salary_from=salary_from
+        salary_from=salary_from,
+        keywords=keywords
     )
 
     await state.clear()
@@ -123,6 +146,9 @@ async def subscription_salary(message: Message, state: FSMContext):
     if salary_from:
         success_text += f"💰 Minimal maosh: {salary_from:,} so'm\n"
 
+    if keywords:
+        success_text += f"🔍 Kalit so'zlar: {keywords}\n"
+
     success_text += (
         "\n🔔 Endi yangi vakansiyalar haqida "
         "avtomatik xabar olasiz!"
@@ -159,11 +185,7 @@ async def delete_subscription_confirmed(callback: CallbackQuery):
     user = await db.get_or_create_user(callback.from_user.id)
 
     # Obunani o'chirish
-    async with db.pool.acquire() as conn:
-        await conn.execute(
-            "DELETE FROM subscriptions WHERE user_id = $1",
-            user['id']
-        )
+    await db.delete_subscription(user['id'])
 
     await callback.message.edit_text(
         "✅ Obuna muvaffaqiyatli o'chirildi!\n\n"
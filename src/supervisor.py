@@ -0,0 +1,195 @@
+import asyncio
+import logging
+import multiprocessing
+from functools import partial
+from typing import Dict, List, Optional
+
+from aiogram import Bot, Dispatcher
+from aiogram.types import Update
+
+from .app import create_bot, create_dispatcher
+from .broadcaster import broadcaster
+from .config import METRICS_PORT, WORKER_MAX_RESTARTS, WORKER_PROCESSES
+from .db import db
+from .metrics import metrics_server
+from .sweeper import promotion_sweeper
+
+logger = logging.getLogger(__name__)
+
+
+def routing_key(update: Update) -> int:
+    """Update kimga tegishli: foydalanuvchi id, bo'lmasa chat id"""
+    try:
+        event = update.event
+    except Exception:
+        event = None
+
+    user = getattr(event, 'from_user', None)
+    if user is not None:
+        return user.id
+
+    chat = getattr(event, 'chat', None)
+    if chat is not None:
+        return chat.id
+    return update.update_id
+
+
+# ISHCHI JARAYON
+
+async def _process_in_order(dp: Dispatcher, bot: Bot, update: Update,
+                            previous: Optional[asyncio.Task]):
+    """Shu foydalanuvchining oldingi update'i tugagach qayta ishlash"""
+    if previous is not None:
+        await asyncio.wait([previous])
+
+    try:
+        await dp.feed_update(bot, update)
+    except Exception:
+        logger.exception("❌ Update %d ni qayta ishlashda xatolik", update.update_id)
+
+
+def _release_tail(tails: Dict[int, asyncio.Task], key: int, task: asyncio.Task):
+    if tails.get(key) is task:
+        del tails[key]
+
+
+async def _run_worker(index: int, queue: multiprocessing.Queue):
+    """Ishchi: o'z Database pooli va Dispatcher bilan updatelarni qayta ishlash"""
+    bot = create_bot()
+    dp = create_dispatcher()
+    loop = asyncio.get_running_loop()
+    # Har bir foydalanuvchining oxirgi vazifasi - tartibni saqlash uchun
+    tails: Dict[int, asyncio.Task] = {}
+
+    try:
+        await db.create_pool()
+        # Har bir ishchi o'z metrikalarini alohida portda beradi
+        await metrics_server.start(port=METRICS_PORT + index if METRICS_PORT else 0)
+        if index == 0:
+            # Telegram limiti butun bot uchun - tarqatish (va reklama muddati
+            # nazorati) faqat bitta ishchida
+            await broadcaster.start(bot)
+            await promotion_sweeper.start()
+        await dp.emit_startup(bot=bot)
+        logger.info("✅ Ishchi #%d tayyor", index)
+
+        while True:
+            raw = await loop.run_in_executor(None, queue.get)
+            if raw is None:
+                break
+
+            update = Update.model_validate_json(raw, context={"bot": bot})
+            key = routing_key(update)
+            task = asyncio.create_task(_process_in_order(dp, bot, update, tails.get(key)))
+            tails[key] = task
+            task.add_done_callback(partial(_release_tail, tails, key))
+
+        if tails:
+            await asyncio.wait(list(tails.values()))
+
+    finally:
+        await dp.emit_shutdown(bot=bot)
+        await promotion_sweeper.stop()
+        await broadcaster.stop()
+        await metrics_server.stop()
+        # Buferdagi FSM yozuvlari pool yopilishidan oldin saqlanadi
+        await dp.storage.close()
+        await db.close()
+        await bot.session.close()
+        logger.info("🛑 Ishchi #%d to'xtatildi", index)
+
+
+def _worker_main(index: int, queue: multiprocessing.Queue):
+    try:
+        asyncio.run(_run_worker(index, queue))
+    except KeyboardInterrupt:
+        pass
+
+
+# SUPERVIZOR
+
+def _start_worker(ctx, index: int, queue: multiprocessing.Queue) -> multiprocessing.Process:
+    worker = ctx.Process(target=_worker_main, args=(index, queue), name=f"bot-worker-{index}")
+    worker.start()
+    return worker
+
+
+def _check_workers(ctx, queues: List[multiprocessing.Queue],
+                   workers: List[multiprocessing.Process], restarts: List[int]):
+    """O'lgan ishchini qayta ishga tushirish - aks holda uning navbatini hech kim o'qimaydi.
+
+    WORKER_MAX_RESTARTS dan ko'p qayta ishga tushirilgan ishchi bo'lsa
+    supervizor to'xtaydi (masalan, bazaga ulanib bo'lmasa).
+    """
+    for index, worker in enumerate(workers):
+        if worker.is_alive():
+            continue
+
+        if restarts[index] >= WORKER_MAX_RESTARTS:
+            raise RuntimeError(
+                f"Ishchi #{index} {restarts[index]} marta qayta ishga tushirildi "
+                f"va yana to'xtadi (exitcode={worker.exitcode})"
+            )
+
+        restarts[index] += 1
+        logger.error("❌ Ishchi #%d to'xtab qoldi (exitcode=%s), qayta ishga tushirilmoqda",
+                     index, worker.exitcode)
+        workers[index] = _start_worker(ctx, index, queues[index])
+
+
+async def _poll_updates(ctx, queues: List[multiprocessing.Queue],
+                        workers: List[multiprocessing.Process]):
+    """getUpdates orqali updatelarni olib, ishchilarga taqsimlash"""
+    bot = create_bot()
+    allowed_updates = create_dispatcher().resolve_used_update_types()
+    offset = None
+    restarts = [0] * len(workers)
+
+    try:
+        # Avval webhook rejimida ishlagan bo'lsa, getUpdates ishlashi uchun
+        await bot.delete_webhook()
+
+        while True:
+            try:
+                updates = await bot.get_updates(offset=offset, timeout=30,
+                                                allowed_updates=allowed_updates)
+            except Exception as e:
+                logger.error(f"❌ Updatelarni olishda xatolik: {e}")
+                await asyncio.sleep(5)
+                continue
+
+            # offset oshirilishidan oldin: updatelar tirik ishchi navbatiga tushsin
+            _check_workers(ctx, queues, workers, restarts)
+
+            for update in updates:
+                offset = update.update_id + 1
+                queue = queues[routing_key(update) % len(queues)]
+                queue.put(update.model_dump_json(by_alias=True, exclude_unset=True))
+    finally:
+        await bot.session.close()
+
+
+def run_supervisor(processes: int = WORKER_PROCESSES):
+    """N ta ishchi jarayonni ishga tushirish va updatelarni ular orasida taqsimlash.
+
+    Bitta foydalanuvchining barcha updatelari doim bitta ishchiga boradi va
+    o'sha ishchida kelgan tartibda qayta ishlanadi. To'xtab qolgan ishchi
+    o'sha navbat bilan qayta ishga tushiriladi.
+    """
+    ctx = multiprocessing.get_context('spawn')
+    queues = [ctx.Queue() for _ in range(processes)]
+    workers = [_start_worker(ctx, index, queue) for index, queue in enumerate(queues)]
+    logger.info("🚀 Supervizor: %d ta ishchi jarayon ishga tushdi", processes)
+
+    try:
+        asyncio.run(_poll_updates(ctx, queues, workers))
+    except KeyboardInterrupt:
+        logger.info("⏹️ Bot qo'lda to'xtatildi")
+    finally:
+        for queue in queues:
+            queue.put(None)
+        for worker in workers:
+            worker.join(timeout=30)
+            if worker.is_alive():
+                worker.terminate()
+        logger.info("🛑 Barcha ishchilar to'xtatildi")
@@ -0,0 +1,62 @@
+import asyncio
+import logging
+from typing import Optional
+
+from .config import PROMOTION_SWEEP_INTERVAL, PROMOTION_SWEEP_BATCH
+from .db import Database, db
+
+logger = logging.getLogger(__name__)
+
+
+class PromotionSweeper:
+    """Muddati o'tgan reklamalarni fon vazifasida partiyalab o'chirish.
+
+    Reklama qilinganlar soni faqat amaldagi reklamalar bilan cheklanadi,
+    shuning uchun qidiruv so'rovlari vaqtni tekshirmaydi.
+    """
+
+    def __init__(self, database: Database, interval: float = PROMOTION_SWEEP_INTERVAL,
+                 batch_size: int = PROMOTION_SWEEP_BATCH):
+        self.db = database
+        self.interval = interval
+        self.batch_size = batch_size
+        self._task: Optional[asyncio.Task] = None
+
+    async def start(self):
+        """Fon vazifasini ishga tushirish"""
+        self._task = asyncio.create_task(self._run())
+        logger.info("⏰ Reklama muddati nazorati ishga tushdi (%ss)", self.interval)
+
+    async def stop(self):
+        """Fon vazifasini to'xtatish"""
+        if self._task is None:
+            return
+
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._task = None
+
+    async def sweep(self) -> int:
+        """Barcha muddati o'tgan reklamalarni o'chirish"""
+        total = 0
+        while True:
+            expired = await self.db.expire_promotions(self.batch_size)
+            total += expired
+            if expired < self.batch_size:
+                return total
+
+    async def _run(self):
+        while True:
+            try:
+                expired = await self.sweep()
+                if expired:
+                    logger.info("⏰ %d ta reklama muddati tugadi", expired)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.exception("❌ Reklama muddatini tekshirishda xatolik")
+            await asyncio.sleep(self.interval)
+
+
+# Global sweeper instance
+promotion_sweeper = PromotionSweeper(db)
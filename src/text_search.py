@@ -0,0 +1,24 @@
+import re
+from typing import Optional, Set
+
+# Postgres 'simple' konfiguratsiyasiga yaqin: harf/raqam ketma-ketliklari,
+# kichik harflarda (apostrof va tire so'zni bo'ladi)
+_TOKEN_RE = re.compile(r"[^\W_]+")
+
+MAX_QUERY_LENGTH = 100
+
+
+def tokenize(text: Optional[str]) -> Set[str]:
+    """Matndagi so'zlar to'plami"""
+    if not text:
+        return set()
+    return {token.lower() for token in _TOKEN_RE.findall(text)}
+
+
+def normalize_query(text: Optional[str]) -> Optional[str]:
+    """Foydalanuvchi kiritgan qidiruv so'zlari (bo'sh bo'lsa None)"""
+    if not text:
+        return None
+
+    words = _TOKEN_RE.findall(text[:MAX_QUERY_LENGTH])
+    return " ".join(word.lower() for word in words) or None
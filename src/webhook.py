@@ -0,0 +1,50 @@
+import asyncio
+import logging
+
+from aiogram import Bot, Dispatcher
+from aiogram.webhook.aiohttp_server import SimpleRequestHandler, setup_application
+from aiohttp import web
+
+from .config import (
+    WEBHOOK_BASE_URL, WEBHOOK_PATH, WEBHOOK_SECRET, WEBAPP_HOST, WEBAPP_PORT,
+    MAX_CONCURRENT_UPDATES
+)
+
+logger = logging.getLogger(__name__)
+
+
+async def run_webhook(bot: Bot, dp: Dispatcher):
+    """Botni aiohttp webhook serveri orqali ishga tushirish"""
+    if not WEBHOOK_BASE_URL or not WEBHOOK_SECRET:
+        raise ValueError("Webhook rejimi uchun WEBHOOK_BASE_URL va WEBHOOK_SECRET kerak")
+
+    app = web.Application()
+
+    # Telegram X-Telegram-Bot-Api-Secret-Token sarlavhasini tekshiradi,
+    # updatelar fonda qayta ishlanadi - javob darhol qaytadi
+    SimpleRequestHandler(
+        dispatcher=dp,
+        bot=bot,
+        secret_token=WEBHOOK_SECRET,
+        handle_in_background=True
+    ).register(app, path=WEBHOOK_PATH)
+    setup_application(app, dp, bot=bot)
+
+    await bot.set_webhook(
+        f"{WEBHOOK_BASE_URL.rstrip('/')}{WEBHOOK_PATH}",
+        secret_token=WEBHOOK_SECRET,
+        allowed_updates=dp.resolve_used_update_types(),
+        max_connections=min(100, MAX_CONCURRENT_UPDATES)
+    )
+
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, host=WEBAPP_HOST, port=WEBAPP_PORT)
+    await site.start()
+    logger.info("🌐 Webhook server %s:%d%s da ishlamoqda", WEBAPP_HOST, WEBAPP_PORT, WEBHOOK_PATH)
+
+    try:
+        # Server to'xtatilguncha kutish
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
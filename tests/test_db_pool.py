@@ -0,0 +1,54 @@
+"""Reyestr so'rovlari qayta ishlatilgan pool ulanishida ishlashi.
+
+Haqiqiy Postgres kerak: DATABASE_URL berilmasa test o'tkazib yuboriladi.
+"""
+import asyncio
+import os
+
+import pytest
+
+pytest.importorskip('asyncpg')
+pytest.importorskip('dotenv')
+if not os.getenv('DATABASE_URL'):
+    pytest.skip("DATABASE_URL berilmagan", allow_module_level=True)
+os.environ.setdefault('ADMIN_IDS', '0')
+
+import asyncpg  # noqa: E402
+
+from src.config import DATABASE_URL, DB_STATEMENT_CACHE_SIZE  # noqa: E402
+from src.db import Database, PreparedConnection  # noqa: E402
+
+TELEGRAM_ID = 999_000_000_999
+
+
+async def _two_calls_through_one_connection():
+    db = Database()
+    await db.init_database()
+    db.pool = await asyncpg.create_pool(
+        DATABASE_URL, min_size=1, max_size=1,
+        statement_cache_size=DB_STATEMENT_CACHE_SIZE,
+        connection_class=PreparedConnection
+    )
+    try:
+        users = []
+        for _ in range(2):
+            # Keshsiz - har safar reyestr so'rovi shu bitta ulanishda bajariladi
+            db.user_cache.clear()
+            users.append(await db.get_or_create_user(TELEGRAM_ID))
+
+        rows = []
+        for _ in range(2):
+            async with db.acquire('test') as conn:
+                rows.append(await conn.fetchrow_statement('fsm_get', 'test:missing'))
+        return users, rows
+    finally:
+        await db.pool.execute("DELETE FROM users WHERE telegram_id = $1", TELEGRAM_ID)
+        await db.pool.close()
+
+
+def test_registry_statements_survive_connection_reuse():
+    users, rows = asyncio.run(_two_calls_through_one_connection())
+
+    assert users[0]['id'] == users[1]['id']
+    assert users[1]['telegram_id'] == TELEGRAM_ID
+    assert rows == [None, None]
@@ -0,0 +1,146 @@
+"""Grid indeks natijalari to'liq ko'rib chiqish (brute force) bilan bir xil.
+
+Bazasiz: tasodifiy (seed bilan) nuqtalar xotirada.
+"""
+import random
+
+from src.geo_index import (
+    SubscriptionGridIndex, VacancyGridIndex, haversine, salary_bounds
+)
+from src.text_search import tokenize
+
+CENTERS = [(41.2995, 69.2401), (39.6270, 66.9750), (40.7821, 72.3442)]
+SALARIES = [None, 1_500_000, 3_000_000, 5_000_000, 8_000_000]
+WORDS = ['sotuvchi', 'kassir', 'haydovchi', 'oshpaz', 'dasturchi', 'python']
+
+
+def random_point(rng: random.Random):
+    latitude, longitude = rng.choice(CENTERS)
+    return round(rng.gauss(latitude, 0.3), 6), round(rng.gauss(longitude, 0.3), 6)
+
+
+def make_vacancies(rng: random.Random, count: int):
+    vacancies = []
+    for vacancy_id in range(1, count + 1):
+        latitude, longitude = random_point(rng)
+        salary_from = rng.choice(SALARIES)
+        salary_to = rng.choice([None, salary_from and salary_from + 1_000_000])
+        vacancies.append({
+            'id': vacancy_id, 'latitude': latitude, 'longitude': longitude,
+            'is_promoted': rng.random() < 0.1,
+            'salary_from': salary_from, 'salary_to': salary_to,
+        })
+    return vacancies
+
+
+def make_subscriptions(rng: random.Random, count: int):
+    subscriptions = []
+    for subscription_id in range(1, count + 1):
+        latitude, longitude = random_point(rng)
+        keywords = ", ".join(rng.sample(WORDS, 2)) if rng.random() < 0.3 else None
+        subscriptions.append({
+            'id': subscription_id, 'user_id': subscription_id % 150,
+            'telegram_id': 1000 + subscription_id % 150,
+            'latitude': latitude, 'longitude': longitude,
+            'radius_km': rng.choice([3, 5, 10, 20, 50]),
+            'salary_from': rng.choice([None, 2_000_000, 4_000_000]),
+            'keywords': keywords,
+        })
+    return subscriptions
+
+
+def brute_nearby(vacancies, latitude, longitude, radius_km, salary_from=None,
+                 only=None, salary_to=None):
+    results = []
+    for vacancy in vacancies:
+        if only is not None and vacancy['id'] not in only:
+            continue
+        salary_min, salary_max = salary_bounds(vacancy['salary_from'], vacancy['salary_to'])
+        if salary_from and (salary_max or 0) < salary_from:
+            continue
+        if salary_to is not None and (salary_min is None or salary_min > salary_to):
+            continue
+        distance = round(haversine(latitude, longitude,
+                                   vacancy['latitude'], vacancy['longitude']), 6)
+        if distance <= radius_km:
+            results.append((vacancy['is_promoted'], distance, vacancy['id']))
+    return sorted(results, key=lambda r: (not r[0], r[1], r[2]))
+
+
+def brute_match(subscriptions, latitude, longitude, salary, tokens):
+    return {
+        s['id'] for s in subscriptions
+        if not (s['salary_from'] and salary < s['salary_from'])
+        and not (tokenize(s['keywords']) and tokenize(s['keywords']).isdisjoint(tokens))
+        and haversine(latitude, longitude, s['latitude'], s['longitude']) <= s['radius_km']
+    }
+
+
+def test_vacancy_grid_matches_brute_force():
+    rng = random.Random(1)
+    vacancies = make_vacancies(rng, 2000)
+    index = VacancyGridIndex(0.1)
+    index.load(vacancies)
+
+    for _ in range(100):
+        latitude, longitude = random_point(rng)
+        radius_km = rng.choice([1, 5, 20, 50])
+        salary_from = rng.choice([None, 2_000_000, 6_000_000])
+        salary_to = rng.choice([None, 4_000_000])
+        only = set(rng.sample(range(1, 2001), 500)) if rng.random() < 0.3 else None
+
+        assert index.nearby(latitude, longitude, radius_km, salary_from, only, salary_to) == \
+            brute_nearby(vacancies, latitude, longitude, radius_km, salary_from, only,
+                         salary_to)
+
+
+def test_vacancy_grid_updates():
+    rng = random.Random(2)
+    vacancies = make_vacancies(rng, 500)
+    index = VacancyGridIndex(0.1)
+    index.load(vacancies)
+
+    removed = vacancies.pop()
+    index.remove(removed['id'])
+    moved = vacancies[0]
+    moved['latitude'], moved['longitude'] = random_point(rng)
+    index.add(moved['id'], moved['latitude'], moved['longitude'], moved['is_promoted'],
+              moved['salary_from'], moved['salary_to'])
+    vacancies[1]['is_promoted'] = True
+    index.set_promoted(vacancies[1]['id'], True)
+
+    assert removed['id'] not in index
+    assert len(index) == len(vacancies)
+    for latitude, longitude in CENTERS:
+        assert index.nearby(latitude, longitude, 50) == \
+            brute_nearby(vacancies, latitude, longitude, 50)
+
+
+def test_subscription_grid_matches_brute_force():
+    rng = random.Random(3)
+    subscriptions = make_subscriptions(rng, 1500)
+    index = SubscriptionGridIndex(0.1)
+    index.load(subscriptions)
+
+    for _ in range(100):
+        latitude, longitude = random_point(rng)
+        salary = rng.choice([0, 3_000_000, 5_000_000])
+        tokens = set(rng.sample(WORDS, 2))
+
+        matched = {item['id'] for item in index.match(latitude, longitude, salary, tokens)}
+        assert matched == brute_match(subscriptions, latitude, longitude, salary, tokens)
+
+
+def test_subscription_grid_remove_user():
+    rng = random.Random(4)
+    subscriptions = make_subscriptions(rng, 300)
+    index = SubscriptionGridIndex(0.1)
+    index.load(subscriptions)
+
+    index.remove_user(7)
+    remaining = [s for s in subscriptions if s['user_id'] != 7]
+
+    assert len(index) == len(remaining)
+    for latitude, longitude in CENTERS:
+        matched = {item['id'] for item in index.match(latitude, longitude)}
+        assert matched == brute_match(remaining, latitude, longitude, 0, set())
@@ -0,0 +1,86 @@
+"""NumPy va grid dvigatellari bir xil nuqtalarda bir xil natija beradi.
+
+Bazasiz; numpy o'rnatilmagan bo'lsa o'tkazib yuboriladi.
+"""
+import random
+
+import pytest
+
+pytest.importorskip('numpy')
+
+from src.geo_index import SubscriptionGridIndex, VacancyGridIndex  # noqa: E402
+from src.geo_numpy import NumpySubscriptionIndex, NumpyVacancyIndex  # noqa: E402
+
+from .test_geo_index import (  # noqa: E402
+    CENTERS, WORDS, make_subscriptions, make_vacancies, random_point
+)
+
+PAGE = 5
+
+
+def pages(results, limit: int = PAGE):
+    return [results[i:i + limit] for i in range(0, len(results), limit)]
+
+
+def load_vacancies(vacancies):
+    grid, vectorized = VacancyGridIndex(0.1), NumpyVacancyIndex()
+    grid.load(vacancies)
+    vectorized.load(vacancies)
+    return grid, vectorized
+
+
+def test_nearby_pages_match_grid():
+    rng = random.Random(11)
+    grid, vectorized = load_vacancies(make_vacancies(rng, 3000))
+
+    for _ in range(100):
+        latitude, longitude = random_point(rng)
+        args = (latitude, longitude, rng.choice([1, 5, 20, 50]),
+                rng.choice([None, 2_000_000, 6_000_000]),
+                set(rng.sample(range(1, 3001), 800)) if rng.random() < 0.3 else None,
+                rng.choice([None, 4_000_000]))
+
+        assert pages(vectorized.nearby(*args)) == pages(grid.nearby(*args))
+
+
+def test_nearby_after_updates_matches_grid():
+    rng = random.Random(12)
+    vacancies = make_vacancies(rng, 1000)
+    grid, vectorized = load_vacancies(vacancies)
+
+    for vacancy in rng.sample(vacancies, 100):
+        grid.remove(vacancy['id'])
+        vectorized.remove(vacancy['id'])
+    for vacancy in rng.sample(vacancies, 100):
+        latitude, longitude = random_point(rng)
+        for index in (grid, vectorized):
+            index.add(vacancy['id'], latitude, longitude, vacancy['is_promoted'],
+                      vacancy['salary_from'], vacancy['salary_to'])
+    for vacancy in rng.sample(vacancies, 50):
+        grid.set_promoted(vacancy['id'], True)
+        vectorized.set_promoted(vacancy['id'], True)
+
+    assert len(vectorized) == len(grid)
+    for latitude, longitude in CENTERS:
+        assert vectorized.nearby(latitude, longitude, 50) == grid.nearby(latitude, longitude, 50)
+
+
+def test_subscribers_match_grid():
+    rng = random.Random(13)
+    subscriptions = make_subscriptions(rng, 2000)
+    grid, vectorized = SubscriptionGridIndex(0.1), NumpySubscriptionIndex()
+    grid.load(subscriptions)
+    vectorized.load(subscriptions)
+
+    for user_id in (3, 8):
+        grid.remove_user(user_id)
+        vectorized.remove_user(user_id)
+
+    for _ in range(100):
+        latitude, longitude = random_point(rng)
+        salary = rng.choice([0, 3_000_000, 5_000_000])
+        tokens = set(rng.sample(WORDS, 2))
+
+        expected = {item['id'] for item in grid.match(latitude, longitude, salary, tokens)}
+        actual = {item['id'] for item in vectorized.match(latitude, longitude, salary, tokens)}
+        assert actual == expected
@@ -0,0 +1,111 @@
+"""Qidiruv snapshotlari: TTLCache va kursor bo'yicha sahifa chegaralari.
+
+Bazasiz - faqat xotiradagi tuzilmalar.
+"""
+import os
+import random
+
+import pytest
+
+from src import cache
+from src.cache import TTLCache
+
+pytest.importorskip('asyncpg')
+pytest.importorskip('dotenv')
+os.environ.setdefault('ADMIN_IDS', '0')
+
+from src.db import _cursor_key, _cursor_slice  # noqa: E402
+
+
+class FakeTime:
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeTime()
+    monkeypatch.setattr(cache, 'time', fake)
+    return fake
+
+
+def test_ttl_cache_expires(clock):
+    evicted = []
+    lru = TTLCache(maxsize=10, ttl=60, on_evict=lambda key, value: evicted.append(key))
+    lru.set('a', 1)
+    lru.set('b', 2, ttl=5)
+
+    clock.now += 10
+    assert lru.get('a') == 1
+    assert lru.get('b') is None
+    assert 'b' not in lru
+    assert evicted == ['b']
+
+    clock.now += 60
+    assert lru.get('a', 'missing') == 'missing'
+    assert len(lru) == 0
+
+
+def test_ttl_cache_evicts_least_recently_used(clock):
+    evicted = []
+    lru = TTLCache(maxsize=2, ttl=60, on_evict=lambda key, value: evicted.append((key, value)))
+    lru.set('a', 1)
+    lru.set('b', 2)
+    lru.get('a')
+    lru.set('c', 3)
+
+    assert evicted == [('b', 2)]
+    assert lru.get('a') == 1 and lru.get('c') == 3
+
+    # Almashtirish va pop ham on_evict chaqiradi
+    lru.set('a', 10)
+    assert lru.pop('c') == 3
+    assert lru.pop('c', 'missing') == 'missing'
+    assert evicted == [('b', 2), ('a', 1), ('c', 3)]
+
+    lru.clear()
+    assert len(lru) == 0
+    assert evicted[-1] == ('a', 10)
+
+
+def make_snapshot(count: int):
+    rng = random.Random(count)
+    entries = [(rng.random() < 0.1, round(rng.uniform(0, 50), 6), vacancy_id)
+               for vacancy_id in range(1, count + 1)]
+    return sorted(entries, key=_cursor_key)
+
+
+@pytest.mark.parametrize('count', [0, 1, 5, 23, 100])
+def test_cursor_slice_pages_forward_and_back(count):
+    entries = make_snapshot(count)
+    limit = 5
+
+    pages = []
+    start, end = _cursor_slice(entries, None, None, limit)
+    while True:
+        page = entries[start:end]
+        pages.append(page)
+        if end >= len(entries):
+            break
+        start, end = _cursor_slice(entries, page[-1], None, limit)
+
+    assert pages == [entries[i:i + limit] for i in range(0, max(count, 1), limit)]
+
+    # Orqaga: har bir sahifaning birinchi elementidan oldingi sahifa
+    for previous, page in zip(pages, pages[1:]):
+        start, end = _cursor_slice(entries, None, page[0], limit)
+        assert entries[start:end] == previous
+
+
+def test_cursor_slice_with_missing_cursor():
+    entries = make_snapshot(20)
+    # Kursordagi vakansiya snapshotda yo'q (masalan, o'chirilgan) - tartib bo'yicha davom etadi
+    removed = entries.pop(7)
+
+    start, end = _cursor_slice(entries, removed, None, 5)
+    assert entries[start:end] == entries[7:12]
+    start, end = _cursor_slice(entries, None, removed, 5)
+    assert entries[start:end] == entries[2:7]
@@ -0,0 +1,133 @@
+"""PostgresStorage buferi: flush paytidagi o'qish va yozishlar.
+
+Soxta pool ishlatiladi - haqiqiy Postgres kerak emas.
+"""
+import asyncio
+import json
+import os
+from contextlib import asynccontextmanager
+
+import pytest
+
+pytest.importorskip('aiogram')
+pytest.importorskip('asyncpg')
+pytest.importorskip('dotenv')
+os.environ.setdefault('ADMIN_IDS', '0')
+
+from aiogram.fsm.storage.base import StorageKey  # noqa: E402
+
+from src.storage import PostgresStorage  # noqa: E402
+
+KEY = StorageKey(bot_id=1, chat_id=10, user_id=10)
+OTHER_KEY = StorageKey(bot_id=1, chat_id=20, user_id=20)
+
+
+class FakeConnection:
+    """fsm_storage jadvalini lug'atda saqlaydigan ulanish"""
+
+    def __init__(self, database: 'FakeDatabase'):
+        self.db = database
+
+    async def fetchrow_statement(self, name, key):
+        return self.db.rows.get(key)
+
+    @asynccontextmanager
+    async def transaction(self):
+        yield
+
+    async def execute(self, query, *args):
+        self.db.writing.set()
+        await self.db.release.wait()
+        if self.db.failures:
+            self.db.failures -= 1
+            raise ConnectionError("soxta xatolik")
+
+        if query.lstrip().startswith('INSERT'):
+            for key, state, data in zip(*args):
+                self.db.rows[key] = {'state': state, 'data': data}
+        else:
+            for key in args[0]:
+                self.db.rows.pop(key, None)
+
+
+class FakeDatabase:
+    def __init__(self, failures: int = 0):
+        self.rows = {}
+        self.failures = failures
+        self.writing = asyncio.Event()
+        self.release = asyncio.Event()
+        self.release.set()
+
+    @asynccontextmanager
+    async def acquire(self, name):
+        yield FakeConnection(self)
+
+
+def _stored(db: FakeDatabase, storage: PostgresStorage, key: StorageKey):
+    row = db.rows.get(storage.key_builder.build(key))
+    return row and json.loads(row['data'])
+
+
+async def _read_during_flush():
+    db = FakeDatabase()
+    storage = PostgresStorage(db, flush_interval=60)
+    await storage.set_data(KEY, {'a': 1})
+
+    db.release.clear()
+    flush = asyncio.create_task(storage.flush())
+    await db.writing.wait()
+
+    # Partiya hali yozilmagan - o'qish eski (bo'sh) qatorni qaytarmasligi kerak
+    during = await storage.get_data(KEY)
+    await storage.update_data(KEY, {'b': 2})
+
+    db.release.set()
+    await flush
+    await storage.close()
+    return during, _stored(db, storage, KEY)
+
+
+async def _write_during_flush():
+    db = FakeDatabase()
+    storage = PostgresStorage(db, flush_interval=0.01)
+    await storage.set_data(KEY, {'a': 1})
+
+    db.release.clear()
+    await db.writing.wait()
+    # Flusher band - shu yozuv uchun keyingi flush rejalashtirilishi kerak
+    await storage.set_data(OTHER_KEY, {'b': 2})
+    db.release.set()
+
+    await asyncio.sleep(0.2)
+    return _stored(db, storage, KEY), _stored(db, storage, OTHER_KEY), storage._dirty
+
+
+async def _retry_after_failure():
+    db = FakeDatabase(failures=1)
+    storage = PostgresStorage(db, flush_interval=0.01)
+    await storage.set_data(KEY, {'a': 1})
+
+    await asyncio.sleep(0.2)
+    return _stored(db, storage, KEY), storage._dirty
+
+
+def test_read_during_flush_sees_inflight_batch():
+    during, stored = asyncio.run(_read_during_flush())
+
+    assert during == {'a': 1}
+    assert stored == {'a': 1, 'b': 2}
+
+
+def test_write_during_flush_is_flushed():
+    first, second, dirty = asyncio.run(_write_during_flush())
+
+    assert first == {'a': 1}
+    assert second == {'b': 2}
+    assert dirty == {}
+
+
+def test_failed_flush_is_retried():
+    stored, dirty = asyncio.run(_retry_after_failure())
+
+    assert stored == {'a': 1}
+    assert dirty == {}